@@ -2,20 +2,47 @@
 Główna aplikacja Streamlit - Dashboard Macierzy Eisenhowera dla TickTick
 """
 
+import logging
+import time
 import streamlit as st
-from datetime import datetime
-from typing import Dict, List, Optional
-from ticktick_api import TickTickAPI, move_task_to_quadrant
+from streamlit.runtime.scriptrunner import RerunData, get_script_run_ctx
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from ticktick_api import TickTickAPI, BulkMoveResult
 from eisenhower_matrix import (
-    filter_tasks_by_context,
+    bucket_tasks_by_context,
     categorize_tasks_to_quadrants,
+    get_context_counts,
     get_quadrant_stats,
-    sort_tasks_by_deadline
+    sort_tasks_by_deadline,
+    update_task_in_buckets
+)
+from config import (
+    CONTEXTS,
+    QUADRANTS,
+    COLUMNAR_MIN_TASKS,
+    CUSTOM_RANGE_DEFAULT_DAYS,
+    QUADRANT_PAGE_SIZE,
+    PROGRESSIVE_RENDER_INTERVAL,
+    WRITE_STATUS_POLL_INTERVAL,
+    LOG_LEVEL,
+    get_context_description,
+    get_task_date,
+    get_today
 )
-from config import CONTEXTS, QUADRANTS, get_context_description, POLAND_TZ
 from auth import TickTickAuth, init_auth_from_env, handle_oauth_callback
+from snapshot_store import account_check_for_sync, get_snapshot_store, resolve_account_key, revalidate_in_background
+from task_store import TaskStore
+from token_manager import TokenManager
+from task_cache import CachedTasks, get_task_cache
+from task_columns import TaskColumns
+from write_queue import WriteBehindQueue, TaskWrite, date_write, tags_write
+from diagnostics import PhaseTimer, get_request_metrics
 import os
 
+logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
+
 # Konfiguracja strony
 st.set_page_config(
     page_title="TickTick Eisenhower Matrix",
@@ -83,10 +110,32 @@ def init_session_state():
     # API i dane
     if "api" not in st.session_state:
         st.session_state.api = None
+    if "account_key" not in st.session_state:
+        st.session_state.account_key = None  # (token konta, klucz konta) - patrz get_account_key
     if "last_refresh" not in st.session_state:
         st.session_state.last_refresh = None
     if "tasks_cache" not in st.session_state:
-        st.session_state.tasks_cache = []
+        st.session_state.tasks_cache = TaskStore()
+    if "revalidation_future" not in st.session_state:
+        st.session_state.revalidation_future = None
+    if "sync_state" not in st.session_state:
+        st.session_state.sync_state = {}
+    if "sync_failed_projects" not in st.session_state:
+        st.session_state.sync_failed_projects = []
+    if "bulk_move_report" not in st.session_state:
+        st.session_state.bulk_move_report = None
+    if "write_queue" not in st.session_state:
+        st.session_state.write_queue = None
+    if "write_errors" not in st.session_state:
+        st.session_state.write_errors = []
+    if "quadrant_pages" not in st.session_state:
+        st.session_state.quadrant_pages = {}
+    if "sorted_quadrants" not in st.session_state:
+        st.session_state.sorted_quadrants = {}
+    if "matrix_view" not in st.session_state:
+        st.session_state.matrix_view = ("Jutrzejsze", None)  # (kontekst, własny zakres dat)
+    if "fragment_ids" not in st.session_state:
+        st.session_state.fragment_ids = {}  # {nazwa fragmentu: ID fragmentu Streamlit}
 
 
 def render_login_page():
@@ -170,11 +219,16 @@ def handle_authentication():
             st.session_state.refresh_token = token_data.get("refresh_token")
             st.session_state.authenticated = True
             
-            # Inicjalizuj API z tokenem
-            st.session_state.api = TickTickAPI(st.session_state.access_token)
+            # Inicjalizuj API z tokenem (odświeżanym w tle przed wygaśnięciem)
+            st.session_state.api = TickTickAPI(token_manager=TokenManager(
+                st.session_state.access_token,
+                st.session_state.refresh_token,
+                token_data.get("expires_in"),
+                st.session_state.auth_client.refresh_access_token
+            ))
             
-            # Wyczyść parametry URL (dla Streamlit 1.29.0)
-            st.experimental_set_query_params()
+            # Wyczyść parametry URL
+            st.query_params.clear()
             
             st.success("✅ Zalogowano pomyślnie!")
             st.rerun()
@@ -187,8 +241,13 @@ def handle_authentication():
     return st.session_state.authenticated
 
 
-def render_sidebar():
-    """Renderuje panel boczny z kontrolkami"""
+def render_sidebar() -> Tuple[str, Optional[Tuple[date, date]]]:
+    """
+    Renderuje panel boczny z kontrolkami
+    
+    Returns:
+        Krotka (wybrany kontekst, własny zakres dat lub None)
+    """
     with st.sidebar:
         st.title("🎯 TickTick Matrix")
         st.markdown("---")
@@ -198,12 +257,23 @@ def render_sidebar():
             st.success("✅ Zalogowano")
             if st.button("🚪 Wyloguj się", use_container_width=True):
                 # Wyczyść dane sesji
+                if st.session_state.api is not None:
+                    st.session_state.api.tokens.close()
                 st.session_state.access_token = None
                 st.session_state.refresh_token = None
                 st.session_state.authenticated = False
                 st.session_state.api = None
-                st.session_state.tasks_cache = []
+                st.session_state.account_key = None
+                st.session_state.tasks_cache = TaskStore()
                 st.session_state.last_refresh = None
+                st.session_state.revalidation_future = None
+                st.session_state.sync_state = {}
+                st.session_state.sync_failed_projects = []
+                st.session_state.bulk_move_report = None
+                if st.session_state.write_queue is not None:
+                    st.session_state.write_queue.close()
+                st.session_state.write_queue = None
+                st.session_state.write_errors = []
                 st.rerun()
             st.markdown("---")
         
@@ -212,11 +282,17 @@ def render_sidebar():
             st.error("⚠️ API nie jest skonfigurowane!")
             st.stop()
         
-        # Przycisk odświeżania
+        # Przycisk odświeżania (przyrostowo - tylko zmienione projekty)
         if st.button("🔄 Odśwież dane", use_container_width=True):
             with st.spinner("Pobieranie zadań..."):
-                st.session_state.tasks_cache = st.session_state.api.get_tasks()
-                st.session_state.last_refresh = datetime.now()
+                refresh_tasks()
+                st.success("Dane odświeżone!")
+                st.rerun()
+        
+        if st.button("♻️ Pełne odświeżenie", use_container_width=True,
+                     help="Pobiera ponownie zadania ze wszystkich projektów"):
+            with st.spinner("Pobieranie wszystkich zadań..."):
+                refresh_tasks(full=True)
                 st.success("Dane odświeżone!")
                 st.rerun()
         
@@ -236,54 +312,614 @@ def render_sidebar():
             key="context_selector"
         )
         
+        # Własny zakres dat zastępuje kontekst w widoku macierzy
+        custom_range = render_custom_range_picker()
+        
         # Opis kontekstu
-        if selected_context in CONTEXTS:
+        if custom_range is not None:
+            st.info(f"Zadania z datą od {custom_range[0].strftime('%d.%m.%Y')} "
+                    f"do {custom_range[1].strftime('%d.%m.%Y')}")
+        elif selected_context in CONTEXTS:
             st.info(get_context_description(selected_context))
         
+        # Liczby zadań we wszystkich kontekstach
+        render_context_counts()
+        
         st.markdown("---")
         
         # Informacje o ostatnim odświeżeniu
         if st.session_state.last_refresh:
             st.caption(f"Ostatnie odświeżenie: {st.session_state.last_refresh.strftime('%H:%M:%S')}")
+        if st.session_state.sync_failed_projects:
+            st.warning(f"⚠️ Nie udało się pobrać projektów: {len(st.session_state.sync_failed_projects)} "
+                       "(pokazano poprzednie dane)")
         
         st.markdown("---")
         st.markdown("### ℹ️ Info")
         st.caption("Dashboard Macierzy Eisenhowera")
         st.caption("Wersja: 1.0.0")
+        st.checkbox("🩺 Diagnostyka", key="show_diagnostics",
+                    help="Czasy żądań do TickTick API i etapów odświeżania strony")
         
-        return selected_context
+        return selected_context, custom_range
 
 
-def render_task_card(task: Dict, quadrant_key: str):
+def render_custom_range_picker() -> Optional[Tuple[date, date]]:
     """
-    Renderuje kartę zadania
+    Renderuje wybór własnego zakresu dat
+    
+    Returns:
+        Para (pierwsza, ostatnia data) włącznie lub None, gdy zakres jest wyłączony
+    """
+    if not st.checkbox("📅 Własny zakres dat", key="custom_range_enabled"):
+        return None
+    today = get_today()
+    selected = st.date_input(
+        "Zakres dat",
+        value=(today, today + timedelta(days=CUSTOM_RANGE_DEFAULT_DAYS - 1)),
+        key="custom_range"
+    )
+    if not selected:
+        return None
+    # W trakcie wybierania zakresu widżet zwraca tylko pierwszą datę
+    return selected[0], selected[-1]
+
+
+def get_account_key() -> str:
+    """
+    Zwraca klucz konta zalogowanego użytkownika (dla snapshotu i wspólnego cache zadań)
+    
+    Klucz wybierany jest raz na token (snapshot_store.resolve_account_key - przy
+    TICKTICK_SNAPSHOT_ACCOUNT kosztuje to jedno żądanie /project).
+    
+    Returns:
+        Klucz konta
+    """
+    account_token = st.session_state.api.tokens.account_token
+    resolved = st.session_state.account_key
+    if resolved is None or resolved[0] != account_token:
+        resolved = (account_token, resolve_account_key(st.session_state.api))
+        st.session_state.account_key = resolved
+    return resolved[1]
+
+
+def use_cached_tasks(entry: CachedTasks):
+    """
+    Przełącza sesję na zadania ze wspólnego cache (bez kopiowania)
+    
+    Args:
+        entry: Wpis cache konta
+    """
+    st.session_state.tasks_cache = entry.tasks
+    st.session_state.sync_state = entry.sync_state
+    st.session_state.sync_failed_projects = entry.failed_project_ids
+    st.session_state.last_refresh = datetime.fromtimestamp(entry.refreshed_at)
+
+
+def adopt_shared_tasks():
+    """
+    Przełącza sesję na nowszy wpis wspólnego cache (np. odświeżony w innej karcie)
+    
+    Sesja z niewysłanymi zmianami zostaje przy swoim magazynie - tylko on
+    zawiera ich optymistyczny stan.
+    """
+    entry = get_task_cache().peek(get_account_key())
+    if entry is None or entry.tasks is st.session_state.tasks_cache:
+        return
+    write_queue = st.session_state.write_queue
+    if write_queue is not None and write_queue.pending_count():
+        return
+    use_cached_tasks(entry)
+
+
+def load_initial_tasks():
+    """
+    Ładuje zadania przy pierwszym wyświetleniu dashboardu
+    
+    Jeśli inna sesja tego konta pobrała zadania w ciągu TASK_CACHE_TTL, używana
+    jest ta sama kopia ze wspólnego cache. W przeciwnym razie macierz pokazywana
+    jest od razu z ostatnich znanych danych (przeterminowany wpis cache albo
+    lokalny snapshot), a świeże zadania pobierane są w tle. Bez nich zadania
+    pobierane są z TickTick tak jak dotychczas.
+    
+    Snapshot młodszy niż TASK_CACHE_TTL (np. przygotowany przez prewarm.py tuż
+    po wybudzeniu wdrożenia) trafia do wspólnego cache jak świeżo pobrane dane -
+    pierwsze wyświetlenie tylko go odczytuje, bez żądań do TickTick.
+    """
+    cache = get_task_cache()
+    account_key = get_account_key()
+    cached = cache.get(account_key)
+    if cached is not None:
+        use_cached_tasks(cached)
+        return
+    
+    stale = cache.peek(account_key)
+    if stale is not None and stale.tasks:
+        use_cached_tasks(stale)
+        st.session_state.revalidation_future = revalidate_in_background(st.session_state.api, account_key)
+        return
+    
+    snapshot = get_snapshot_store().load(account_key)
+    
+    if snapshot and snapshot.tasks and time.time() - snapshot.saved_at <= cache.ttl:
+        use_cached_tasks(cache.put(account_key, CachedTasks(
+            TaskStore(snapshot.tasks),
+            {},
+            refreshed_at=snapshot.saved_at
+        )))
+        return
+    
+    if snapshot and snapshot.tasks:
+        st.session_state.tasks_cache = TaskStore(snapshot.tasks)
+        st.session_state.last_refresh = datetime.fromtimestamp(snapshot.saved_at)
+        st.session_state.revalidation_future = revalidate_in_background(
+            st.session_state.api,
+            account_key
+        )
+        return
+    
+    load_tasks_progressively()
+
+
+def load_tasks_progressively():
+    """
+    Pobiera wszystkie zadania, wypełniając podgląd macierzy w miarę nadchodzenia projektów
+    
+    Statystyki i ćwiartki rysowane są w miejscach zarezerwowanych przez st.empty
+    po każdym pobranym projekcie (nie częściej niż co PROGRESSIVE_RENDER_INTERVAL),
+    więc pierwsze zadania widać po jednym pobraniu, a nie po najwolniejszym
+    projekcie. Podgląd nie zawiera widżetów - rysowany jest wielokrotnie w tym
+    samym przebiegu - i znika po pobraniu, gdy rysowana jest pełna macierz.
+    """
+    preview = st.empty()
+    with preview.container():
+        status = st.empty()
+        status.caption("⏳ Pobieranie zadań z TickTick...")
+        stats_slot = st.empty()
+        row1_col1, row1_col2 = st.columns(2)
+        row2_col1, row2_col2 = st.columns(2)
+        quadrant_slots = {
+            "Q1": row1_col1.empty(),
+            "Q2": row1_col2.empty(),
+            "Q3": row2_col1.empty(),
+            "Q4": row2_col2.empty()
+        }
+    
+    partial = TaskStore()
+    shown_counts: Dict[str, int] = {}
+    progress = {"projects": 0, "rendered_at": 0.0}
+    
+    def _on_project(project: Dict, tasks: List[Dict]):
+        for task in tasks:
+            partial.upsert(task)
+        progress["projects"] += 1
+        if time.monotonic() - progress["rendered_at"] < PROGRESSIVE_RENDER_INTERVAL:
+            return
+        progress["rendered_at"] = time.monotonic()
+        status.caption(f"⏳ Pobieranie zadań z TickTick... projekty: {progress['projects']}, "
+                       f"zadania: {len(partial)}")
+        render_loading_preview(partial, stats_slot, quadrant_slots, shown_counts)
+    
+    refresh_tasks(full=True, on_project=_on_project)
+    preview.empty()
+
+
+def render_loading_preview(store: TaskStore, stats_slot, quadrant_slots: Dict, shown_counts: Dict[str, int]):
+    """
+    Rysuje podgląd macierzy z częściowo pobranych zadań (bez widżetów)
+    
+    Ćwiartka jest rysowana ponownie tylko wtedy, gdy zmieniła się liczba jej zadań.
+    
+    Args:
+        store: Zadania pobrane do tej pory
+        stats_slot: Miejsce (st.empty) na pasek statystyk
+        quadrant_slots: Miejsca (st.empty) na ćwiartki {Q1..Q4: slot}
+        shown_counts: Liczby zadań narysowane poprzednio {Q1..Q4: liczba} (aktualizowane)
+    """
+    default_context = "Jutrzejsze" if "Jutrzejsze" in CONTEXTS else next(iter(CONTEXTS))
+    context_key = st.session_state.get("context_selector", default_context)
+    quadrants = bucket_tasks_by_context(store)[context_key]
+    stats = get_quadrant_stats(quadrants)
+    
+    with stats_slot.container():
+        render_stats(stats, sum(stats.values()))
+    
+    for quadrant_key, slot in quadrant_slots.items():
+        if shown_counts.get(quadrant_key) == stats[quadrant_key]:
+            continue
+        shown_counts[quadrant_key] = stats[quadrant_key]
+        with slot.container():
+            render_quadrant_header(quadrant_key, stats[quadrant_key])
+            for task in sort_tasks_by_deadline(quadrants[quadrant_key])[:QUADRANT_PAGE_SIZE]:
+                st.markdown(format_task_card(task), unsafe_allow_html=True)
+
+
+def refresh_tasks(full: bool = False, on_project: Optional[Callable[[Dict, List[Dict]], None]] = None):
+    """
+    Odświeża cache zadań
+    
+    Odświeżenie przechodzi przez wspólny cache - jeśli inna sesja tego konta
+    właśnie pobiera zadania, sesja czeka na jej wynik zamiast pobierać je drugi raz.
+    
+    Args:
+        full: True = pobierz wszystkie projekty, False = tylko projekty zmienione
+            od ostatniej synchronizacji (scalane z istniejącym cache)
+        on_project: Funkcja wywoływana z zadaniami każdego pobranego projektu
+            (patrz TickTickAPI.sync_tasks)
+    """
+    api = st.session_state.api
+    account_key = get_account_key()
+    session_store = st.session_state.tasks_cache
+    session_state = st.session_state.sync_state
+    
+    def _sync(current: Optional[CachedTasks]):
+        if full:
+            result = api.sync_tasks(TaskStore(), {}, on_project=on_project)
+        elif current is not None:
+            # Magazyn z cache czytają inne sesje - synchronizacja działa na kopii
+            result = api.sync_tasks(TaskStore(current.tasks), current.sync_state, on_project=on_project)
+        else:
+            result = api.sync_tasks(TaskStore(session_store), session_state, on_project=on_project)
+        if result.tasks:
+            get_snapshot_store().save(account_key, result.tasks.to_list(), account_check_for_sync(result))
+        return result
+    
+    use_cached_tasks(get_task_cache().load(account_key, _sync, newer_than=time.time()))
+
+
+def apply_background_revalidation(wait: bool = False) -> bool:
+    """
+    Podmienia cache na dane pobrane w tle, jeśli są już gotowe
+    
+    Args:
+        wait: Czy czekać na zakończenie pobierania
+        
+    Returns:
+        True jeśli cache został podmieniony
+    """
+    future = st.session_state.revalidation_future
+    if future is None or (not wait and not future.done()):
+        return False
+    
+    st.session_state.revalidation_future = None
+    try:
+        result = future.result()
+    except Exception as e:
+        logger.error("Błąd odświeżania zadań w tle: %s", e)
+        return False
+    
+    if not result.tasks:
+        return False
+    
+    use_cached_tasks(result)
+    return True
+
+
+def get_task_columns() -> TaskColumns:
+    """Zwraca kolumnową reprezentację cache zadań (budowaną ponownie po zmianie lub zmianie dnia)"""
+    store = st.session_state.tasks_cache
+    # Ćwiartka może zależeć od terminu względem dzisiaj (reguły z due_days)
+    cache_key = (id(store), store.version, get_today())
+    cached = st.session_state.get("task_columns")
+    if cached is None or cached[0] != cache_key:
+        cached = (cache_key, TaskColumns(store))
+        st.session_state.task_columns = cached
+    return cached[1]
+
+
+def get_context_buckets() -> Dict[str, Dict[str, List[Dict]]]:
+    """
+    Zwraca zadania z cache podzielone na ćwiartki dla wszystkich kontekstów
+    
+    Wynik liczony jest jednym przejściem po zadaniach i zapamiętywany do czasu
+    zmiany cache (lub zmiany dnia), więc przełączanie kontekstów to tylko odczyt.
+    Przy dużej liczbie zadań (COLUMNAR_MIN_TASKS) używany jest silnik kolumnowy.
+    
+    Returns:
+        Słownik {kontekst: {Q1..Q4: lista zadań}}
+    """
+    store = st.session_state.tasks_cache
+    cache_key = (id(store), store.version, get_today())
+    cached = st.session_state.get("context_buckets")
+    if cached is None or cached[0] != cache_key:
+        if len(store) >= COLUMNAR_MIN_TASKS:
+            buckets = get_task_columns().bucket_by_context()
+        else:
+            buckets = bucket_tasks_by_context(store)
+        cached = (cache_key, buckets)
+        st.session_state.context_buckets = cached
+    return cached[1]
+
+
+def get_range_quadrants(first: date, last: date) -> Dict[str, List[Dict]]:
+    """
+    Zwraca zadania z terminem w zakresie dat podzielone na ćwiartki
+    
+    Zadania z zakresu to zapytanie do indeksu terminów (TaskStore.due_index),
+    więc koszt zależy od liczby zadań w zakresie, a nie w całym cache. Wynik
+    zapamiętywany jest do zmiany cache, zakresu lub dnia.
+    
+    Args:
+        first: Pierwsza data zakresu
+        last: Ostatnia data zakresu (włącznie)
+    
+    Returns:
+        Słownik z kluczami Q1, Q2, Q3, Q4 zawierającymi listy zadań
+    """
+    store = st.session_state.tasks_cache
+    cache_key = (id(store), store.version, get_today(), first, last)
+    cached = st.session_state.get("range_quadrants")
+    if cached is None or cached[0] != cache_key:
+        cached = (cache_key, categorize_tasks_to_quadrants(store.due_index.between_dates(first, last)))
+        st.session_state.range_quadrants = cached
+    return cached[1]
+
+
+def get_view_quadrants() -> Dict[str, List[Dict]]:
+    """Zwraca ćwiartki bieżącego widoku - wybranego kontekstu albo własnego zakresu dat"""
+    selected_context, custom_range = st.session_state.matrix_view
+    if custom_range is not None:
+        return get_range_quadrants(*custom_range)
+    return get_context_buckets()[selected_context]
+
+
+def remember_fragment(name: str):
+    """Zapamiętuje ID bieżącego fragmentu, żeby zmiana zadania mogła go odświeżyć (rerun_fragments)"""
+    ctx = get_script_run_ctx()
+    if ctx is not None and ctx.current_fragment_id:
+        st.session_state.fragment_ids[name] = ctx.current_fragment_id
+
+
+def rerun_fragments(names: List[str]):
+    """
+    Uruchamia ponownie tylko wskazane fragmenty strony
+    
+    st.rerun(scope="fragment") odświeża wyłącznie fragment, z którego go wywołano,
+    a przeniesienie zadania zmienia dwie ćwiartki i liczniki. Kolejka fragmentów
+    przekazywana jest więc harmonogramowi skryptu wprost - tak samo robi to st.rerun.
+    Podczas pełnego przebiegu skryptu (albo gdy fragment nie był jeszcze
+    wyświetlony) odświeżana jest cała strona.
+    
+    Args:
+        names: Nazwy fragmentów z remember_fragment (np. klucze ćwiartek, "stats")
+    """
+    ctx = get_script_run_ctx()
+    fragment_ids = [st.session_state.fragment_ids.get(name) for name in names]
+    if ctx is None or ctx.script_requests is None or not ctx.fragment_ids_this_run or None in fragment_ids:
+        st.rerun()
+    ctx.script_requests.request_rerun(RerunData(
+        query_string=ctx.query_string,
+        page_script_hash=ctx.page_script_hash,
+        fragment_id_queue=fragment_ids,
+        is_fragment_scoped_rerun=True
+    ))
+    # Punkt przerwania - Streamlit kończy tu bieżący przebieg i wykonuje kolejkę fragmentów
+    st.empty()
+
+
+def rerun_after_task_change(before: Dict[str, List[Dict]]):
+    """
+    Odświeża liczniki, status zapisów i ćwiartki, których zawartość zmieniła zmiana zadania
+    
+    Listy ćwiartek, których zmiana nie dotyczy, są tymi samymi obiektami
+    (update_task_in_buckets), więc zwykle odświeżane są tylko ćwiartka źródłowa
+    i docelowa.
+    
+    Args:
+        before: Ćwiartki widoku sprzed zmiany (get_view_quadrants)
+    """
+    after = get_view_quadrants()
+    changed = [q for q in QUADRANTS if after[q] is not before[q] and after[q] != before[q]]
+    rerun_fragments(["context_counts", "stats", "write_status"] + changed)
+
+
+def upsert_cached_task(task: Dict):
+    """
+    Zapisuje zmienione zadanie w cache (patrz upsert_cached_tasks)
+    
+    Args:
+        task: Zadanie po zmianie
+    """
+    upsert_cached_tasks([task])
+
+
+def upsert_cached_tasks(tasks: List[Dict]):
+    """
+    Zapisuje zmienione zadania w cache, aktualizując zapamiętany podział na ćwiartki
+    
+    Podział nie jest liczony od nowa - zmieniają się tylko listy ćwiartek, w których
+    zadania były lub do których trafiają (update_task_in_buckets), więc pozostałe
+    ćwiartki korzystają dalej z zapamiętanego sortowania. Zmiany trafiają do
+    wspólnego cache (SharedTaskCache.upsert_tasks), więc widzą je inne sesje konta.
+    Cache zwraca nowy magazyn (jedną kopię ze wszystkimi zmianami), który
+    zastępuje magazyn sesji.
+    
+    Args:
+        tasks: Zadania po zmianie
+    """
+    store = st.session_state.tasks_cache
+    cached = st.session_state.get("context_buckets")
+    previous = [store.get(task.get("id")) for task in tasks]
+    up_to_date = cached is not None and cached[0] == (id(store), store.version, get_today())
+    
+    store, stored = get_task_cache().upsert_tasks(get_account_key(), store, tasks)
+    st.session_state.tasks_cache = store
+    
+    if up_to_date:
+        buckets = cached[1]
+        for previous_task, stored_task in zip(previous, stored):
+            buckets = update_task_in_buckets(buckets, previous_task, stored_task)
+        st.session_state.context_buckets = ((id(store), store.version, get_today()), buckets)
+
+
+def get_write_queue() -> WriteBehindQueue:
+    """Zwraca kolejkę zapisów w tle dla bieżącego klienta API (tworzoną przy pierwszym użyciu)"""
+    write_queue = st.session_state.write_queue
+    if write_queue is None or write_queue.api is not st.session_state.api:
+        if write_queue is not None:
+            write_queue.close()
+        write_queue = WriteBehindQueue(st.session_state.api)
+        st.session_state.write_queue = write_queue
+    return write_queue
+
+
+def submit_task_write(write: TaskWrite):
+    """
+    Stosuje zmianę zadania w cache od razu i dodaje ją do kolejki zapisów w tle
+    
+    Args:
+        write: Zmiana zadania (np. z tags_write / date_write)
+    """
+    submit_task_writes([write])
+
+
+def submit_task_writes(writes: List[TaskWrite]):
+    """
+    Stosuje zmiany zadań w cache od razu (jedna kopia magazynu) i dodaje je do kolejki zapisów w tle
+    
+    Kolejka wysyła zmiany różnych zadań równolegle i ponawia je po błędach
+    przejściowych; wyniki uzgadnia render_write_status.
+    
+    Args:
+        writes: Zmiany zadań (np. z tags_write / date_write)
+    """
+    upsert_cached_tasks([write.optimistic_task() for write in writes])
+    write_queue = get_write_queue()
+    for write in writes:
+        write_queue.submit(write)
+
+
+def apply_write_outcomes() -> bool:
+    """
+    Uzgadnia cache z wynikami zapisów wysłanych w tle
+    
+    Zaakceptowana zmiana podmienia zadanie na odpowiedź serwera, odrzucona -
+    przywraca stan sprzed zmiany. Jeśli zadanie ma kolejne niewysłane zmiany,
+    cache zostaje bez zmian (pokazuje już stan po nich).
+    
+    Returns:
+        True jeśli pojawiły się nowe wyniki zapisów
+    """
+    write_queue = st.session_state.write_queue
+    if write_queue is None:
+        return False
+    
+    outcomes = write_queue.drain_outcomes()
+    for outcome in outcomes:
+        write = outcome.write
+        if not outcome.ok:
+            title = write.original_task.get("title", "Bez tytułu")
+            st.session_state.write_errors.append(f"{write.description} - {title}: {outcome.error}")
+        if write_queue.has_pending(write.task_id):
+            continue
+        upsert_cached_task(outcome.server_task if outcome.ok else write.original_task)
+        if outcome.ok:
+            st.session_state.last_refresh = datetime.now()
+    return bool(outcomes)
+
+
+@st.fragment(run_every=WRITE_STATUS_POLL_INTERVAL)
+def render_write_status():
+    """
+    Pokazuje liczbę niewysłanych zmian i uzgadnia widok z wynikami zapisów w tle (fragment)
+    
+    Fragment sprawdza kolejkę co WRITE_STATUS_POLL_INTERVAL sekund, więc przebieg
+    skryptu nie czeka na zapis w TickTick. Wyniki zapisów odświeżają tylko
+    fragmenty, których dotyczą; odrzucony zapis odświeża całą stronę, żeby
+    pokazać błąd (render_write_errors).
+    """
+    remember_fragment("write_status")
+    write_queue = st.session_state.write_queue
+    if write_queue is None:
+        return
+    
+    before = get_view_quadrants()
+    error_count = len(st.session_state.write_errors)
+    if apply_write_outcomes():
+        if len(st.session_state.write_errors) > error_count:
+            st.rerun()
+        rerun_after_task_change(before)
+    
+    pending = write_queue.pending_count()
+    if pending:
+        st.caption(f"⏳ Zapisywanie zmian w TickTick: {pending}")
+
+
+def render_write_errors():
+    """Pokazuje (jednorazowo) zmiany, których nie udało się zapisać w TickTick"""
+    if not st.session_state.write_errors:
+        return
+    errors, st.session_state.write_errors = st.session_state.write_errors, []
+    st.error("❌ Nie udało się zapisać zmian (przywrócono poprzedni stan):\n"
+             + "\n".join(f"- {error}" for error in errors))
+
+
+@st.fragment
+def render_context_counts():
+    """Renderuje w panelu bocznym liczby zadań w każdym kontekście i ćwiartce (fragment)"""
+    remember_fragment("context_counts")
+    counts = get_context_counts(get_context_buckets())
+    rows = [
+        "| Kontekst | Σ | Q1 | Q2 | Q3 | Q4 |",
+        "|---|---|---|---|---|---|"
+    ]
+    for context_key, quadrant_counts in counts.items():
+        rows.append(
+            f"| {CONTEXTS[context_key]['name']} | **{sum(quadrant_counts.values())}** | "
+            + " | ".join(str(quadrant_counts[q]) for q in ["Q1", "Q2", "Q3", "Q4"])
+            + " |"
+        )
+    st.markdown("\n".join(rows))
+
+
+def format_task_card(task: Dict) -> str:
+    """
+    Zwraca HTML karty zadania (tytuł, data, tagi) - bez przycisków
     
     Args:
         task: Słownik z danymi zadania
-        quadrant_key: Klucz ćwiartki (Q1, Q2, Q3, Q4)
+        
+    Returns:
+        Kod HTML karty
     """
     title = task.get("title", "Bez tytułu")
-    content = task.get("content", "")
     due_date = task.get("dueDate", "")
     tags = task.get("tags", [])
-    task_id = task.get("id", "")
     
-    # Formatowanie daty
+    # Formatowanie daty (data w polskiej strefie wyliczona przy wczytaniu zadania)
     due_str = ""
-    current_date_obj = None
-    if due_date:
-        try:
-            # TickTick zwraca datę w UTC, konwertujemy na polską strefę czasową
-            dt_utc = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-            dt_poland = dt_utc.astimezone(POLAND_TZ)
-            current_date_obj = dt_poland.date()
-            due_str = f"📅 {dt_poland.strftime('%d.%m.%Y')}"
-        except:
-            due_str = f"📅 {due_date}"
+    current_date_obj = get_task_date(task)
+    if current_date_obj:
+        due_str = f"📅 {current_date_obj.strftime('%d.%m.%Y')}"
+    elif due_date:
+        due_str = f"📅 {due_date}"
     
     # Tagi
     tags_str = " ".join([f"`#{tag}`" for tag in tags]) if tags else ""
     
+    return f"""
+        <div class="task-card">
+            <div class="task-title">{title}</div>
+            <div class="task-meta">
+                {due_str} {tags_str}
+            </div>
+        </div>
+        """
+
+
+def render_task_card(task: Dict, quadrant_key: str):
+    """
+    Renderuje kartę zadania
+    
+    Args:
+        task: Słownik z danymi zadania
+        quadrant_key: Klucz ćwiartki (Q1, Q2, Q3, Q4)
+    """
+    content = task.get("content", "")
+    due_date = task.get("dueDate", "")
+    task_id = task.get("id", "")
+    current_date_obj = get_task_date(task)
+    
     # Przyciski do przenoszenia
     quadrant_icons = {"Q1": "🏎️", "Q2": "❗", "Q3": "🧠", "Q4": "🧩"}
     available_quadrants = [q for q in ["Q1", "Q2", "Q3", "Q4"] if q != quadrant_key]
@@ -293,14 +929,7 @@ def render_task_card(task: Dict, quadrant_key: str):
     col_task, *col_buttons = st.columns([4] + [0.3] * num_buttons)
     
     with col_task:
-        st.markdown(f"""
-        <div class="task-card">
-            <div class="task-title">{title}</div>
-            <div class="task-meta">
-                {due_str} {tags_str}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(format_task_card(task), unsafe_allow_html=True)
     
     # Kompaktowe przyciski obok zadania
     for idx, target_q in enumerate(available_quadrants):
@@ -311,20 +940,14 @@ def render_task_card(task: Dict, quadrant_key: str):
                 help=f"{QUADRANTS[target_q]['name']}",
                 use_container_width=True
             ):
-                # Przenieś zadanie
-                with st.spinner("⏳"):
-                    updated_task = move_task_to_quadrant(st.session_state.api, task, target_q)
-                    if updated_task:
-                        # Zaktualizuj zadanie w cache lokalnie
-                        for i, cached_task in enumerate(st.session_state.tasks_cache):
-                            if cached_task.get("id") == task_id:
-                                st.session_state.tasks_cache[i] = updated_task
-                                break
-                        
-                        st.session_state.last_refresh = datetime.now()
-                        st.rerun()
-                    else:
-                        st.error("Błąd")
+                # Przenieś zadanie od razu w cache, zapis do TickTick w tle
+                write = tags_write(task, target_q)
+                if write:
+                    before = get_view_quadrants()
+                    submit_task_write(write)
+                    rerun_after_task_change(before)
+                else:
+                    st.error("Błąd")
     
     # Przycisk kalendarza do zmiany daty
     with col_buttons[len(available_quadrants)]:
@@ -371,30 +994,17 @@ def render_task_card(task: Dict, quadrant_key: str):
                 dt_utc_new = dt_poland.astimezone(ZoneInfo("UTC"))
                 new_date_str = dt_utc_new.strftime("%Y-%m-%dT%H:%M:%S.000+0000")
                 
-                # Aktualizuj datę w TickTick
-                with st.spinner("⏳ Aktualizuję datę..."):
-                    project_id = task.get("projectId")
-                    updated_task = st.session_state.api.update_task_date(
-                        task_id, 
-                        project_id, 
-                        new_date_str, 
-                        original_task=task
-                    )
+                # Zmień datę od razu w cache, zapis do TickTick w tle
+                write = date_write(task, new_date_str)
+                if write:
+                    before = get_view_quadrants()
+                    submit_task_write(write)
                     
-                    if updated_task:
-                        # Zaktualizuj zadanie w cache lokalnie
-                        for i, cached_task in enumerate(st.session_state.tasks_cache):
-                            if cached_task.get("id") == task_id:
-                                st.session_state.tasks_cache[i] = updated_task
-                                break
-                        
-                        # Zamknij date picker
-                        st.session_state[date_key] = False
-                        st.session_state.last_refresh = datetime.now()
-                        st.success("✅ Data zaktualizowana!")
-                        st.rerun()
-                    else:
-                        st.error("❌ Błąd aktualizacji daty")
+                    # Zamknij date picker
+                    st.session_state[date_key] = False
+                    rerun_after_task_change(before)
+                else:
+                    st.error("❌ Błąd aktualizacji daty")
     
     # Przycisk opisu (jeśli zadanie ma opis)
     if content:
@@ -429,13 +1039,55 @@ def render_task_card(task: Dict, quadrant_key: str):
             """, unsafe_allow_html=True)
 
 
-def render_quadrant(quadrant_key: str, tasks: List[Dict]):
+def get_sorted_quadrant_tasks(quadrant_key: str, tasks: List[Dict]) -> List[Dict]:
     """
-    Renderuje pojedynczą ćwiartkę
+    Zwraca zadania ćwiartki posortowane po deadline (sortowanie zapamiętywane)
+    
+    Wynik jest ważny, dopóki lista ćwiartki jest tym samym obiektem - zmiana
+    zadania podmienia tylko listy ćwiartek, których dotyczy (upsert_cached_task).
     
     Args:
         quadrant_key: Klucz ćwiartki (Q1, Q2, Q3, Q4)
         tasks: Lista zadań w tej ćwiartce
+        
+    Returns:
+        Posortowana lista zadań
+    """
+    cached = st.session_state.sorted_quadrants.get(quadrant_key)
+    if cached is None or cached[0] is not tasks:
+        cached = (tasks, sort_tasks_by_deadline(tasks))
+        st.session_state.sorted_quadrants[quadrant_key] = cached
+    return cached[1]
+
+
+@st.fragment
+def render_quadrant_fragment(quadrant_key: str):
+    """
+    Renderuje ćwiartkę bieżącego widoku jako fragment - przełączanie stron, opisów
+    i wyboru daty odświeża tylko tę ćwiartkę
+    
+    Args:
+        quadrant_key: Klucz ćwiartki (Q1, Q2, Q3, Q4)
+    """
+    remember_fragment(quadrant_key)
+    render_quadrant(quadrant_key, get_view_quadrants()[quadrant_key])
+
+
+@st.fragment
+def render_stats_fragment():
+    """Renderuje pasek statystyk bieżącego widoku jako fragment"""
+    remember_fragment("stats")
+    stats = get_quadrant_stats(get_view_quadrants())
+    render_stats(stats, sum(stats.values()))
+
+
+def render_quadrant_header(quadrant_key: str, task_count: int):
+    """
+    Renderuje nagłówek ćwiartki z liczbą zadań
+    
+    Args:
+        quadrant_key: Klucz ćwiartki (Q1, Q2, Q3, Q4)
+        task_count: Liczba zadań w ćwiartce
     """
     quadrant_info = QUADRANTS[quadrant_key]
     
@@ -447,18 +1099,174 @@ def render_quadrant(quadrant_key: str, tasks: List[Dict]):
     </div>
     """, unsafe_allow_html=True)
     
-    st.caption(f"Zadań: **{len(tasks)}**")
+    st.caption(f"Zadań: **{task_count}**")
+
+
+def render_quadrant(quadrant_key: str, tasks: List[Dict]):
+    """
+    Renderuje pojedynczą ćwiartkę
+    
+    Args:
+        quadrant_key: Klucz ćwiartki (Q1, Q2, Q3, Q4)
+        tasks: Lista zadań w tej ćwiartce
+    """
+    render_quadrant_header(quadrant_key, len(tasks))
+    render_bulk_move_report(quadrant_key)
     
     if not tasks:
         st.info("Brak zadań w tej ćwiartce")
         return
     
     # Sortuj zadania po deadline
-    sorted_tasks = sort_tasks_by_deadline(tasks)
+    sorted_tasks = get_sorted_quadrant_tasks(quadrant_key, tasks)
     
-    # Renderuj zadania
-    for task in sorted_tasks:
+    # Tryb zaznaczania wielu zadań naraz
+    if st.checkbox("☑️ Zaznacz wiele", key=f"bulk_mode_{quadrant_key}"):
+        render_bulk_move(quadrant_key, sorted_tasks)
+    
+    # Renderuj tylko bieżącą stronę zadań - koszt nie rośnie z rozmiarem ćwiartki
+    page, page_count = get_quadrant_page(quadrant_key, len(sorted_tasks))
+    start = page * QUADRANT_PAGE_SIZE
+    for task in sorted_tasks[start:start + QUADRANT_PAGE_SIZE]:
         render_task_card(task, quadrant_key)
+    
+    if page_count > 1:
+        render_quadrant_pagination(quadrant_key, page, page_count, len(sorted_tasks))
+
+
+def get_quadrant_page(quadrant_key: str, task_count: int) -> Tuple[int, int]:
+    """
+    Zwraca bieżącą stronę ćwiartki (dopasowaną do aktualnej liczby zadań)
+    
+    Args:
+        quadrant_key: Klucz ćwiartki (Q1, Q2, Q3, Q4)
+        task_count: Liczba zadań w ćwiartce
+        
+    Returns:
+        Krotka (numer strony od 0, liczba stron)
+    """
+    page_count = max(1, -(-task_count // QUADRANT_PAGE_SIZE))
+    page = min(st.session_state.quadrant_pages.get(quadrant_key, 0), page_count - 1)
+    st.session_state.quadrant_pages[quadrant_key] = page
+    return page, page_count
+
+
+def set_quadrant_page(quadrant_key: str, page: int):
+    """Ustawia stronę ćwiartki (wywoływane przez przyciski przed przebiegiem skryptu)"""
+    st.session_state.quadrant_pages[quadrant_key] = max(0, page)
+
+
+def render_quadrant_pagination(quadrant_key: str, page: int, page_count: int, task_count: int):
+    """
+    Renderuje przyciski stron pod listą zadań ćwiartki
+    
+    Args:
+        quadrant_key: Klucz ćwiartki (Q1, Q2, Q3, Q4)
+        page: Bieżąca strona (od 0)
+        page_count: Liczba stron
+        task_count: Liczba zadań w ćwiartce
+    """
+    first = page * QUADRANT_PAGE_SIZE + 1
+    last = min(task_count, (page + 1) * QUADRANT_PAGE_SIZE)
+    col_prev, col_info, col_next = st.columns([1, 3, 1])
+    
+    with col_prev:
+        st.button(
+            "◀",
+            key=f"page_prev_{quadrant_key}",
+            disabled=page == 0,
+            on_click=set_quadrant_page,
+            args=(quadrant_key, page - 1),
+            use_container_width=True
+        )
+    with col_info:
+        st.caption(f"Strona {page + 1} / {page_count} (zadania {first}–{last} z {task_count})")
+    with col_next:
+        st.button(
+            "▶",
+            key=f"page_next_{quadrant_key}",
+            disabled=page >= page_count - 1,
+            on_click=set_quadrant_page,
+            args=(quadrant_key, page + 1),
+            use_container_width=True
+        )
+
+
+def render_bulk_move(quadrant_key: str, tasks: List[Dict]):
+    """
+    Renderuje formularz przenoszenia wielu zadań z ćwiartki naraz
+    
+    Zaznaczone zadania przenoszone są od razu w cache, a zmiany trafiają do
+    kolejki zapisów w tle (submit_task_writes) - jak przy przenoszeniu
+    pojedynczego zadania. Odrzucone zapisy pokazuje render_write_errors.
+    
+    Args:
+        quadrant_key: Klucz ćwiartki (Q1, Q2, Q3, Q4)
+        tasks: Lista zadań w tej ćwiartce
+    """
+    tasks_by_id = {task["id"]: task for task in tasks if task.get("id")}
+    
+    def task_label(task_id: str) -> str:
+        task = tasks_by_id[task_id]
+        task_date = get_task_date(task)
+        date_str = f" ({task_date.strftime('%d.%m')})" if task_date else ""
+        return f"{task.get('title', 'Bez tytułu')}{date_str}"
+    
+    with st.form(f"bulk_move_form_{quadrant_key}"):
+        selected_ids = st.multiselect(
+            "Zadania",
+            options=list(tasks_by_id),
+            format_func=task_label,
+            key=f"bulk_selected_{quadrant_key}"
+        )
+        target_q = st.selectbox(
+            "Przenieś do",
+            options=[q for q in ["Q1", "Q2", "Q3", "Q4"] if q != quadrant_key],
+            format_func=lambda q: QUADRANTS[q]["name"],
+            key=f"bulk_target_{quadrant_key}"
+        )
+        submitted = st.form_submit_button("📦 Przenieś zaznaczone", use_container_width=True)
+    
+    if submitted and selected_ids:
+        writes = []
+        failed = []
+        for task_id in selected_ids:
+            task = tasks_by_id[task_id]
+            write = tags_write(task, target_q)
+            if write:
+                writes.append(write)
+            else:
+                failed.append((task, "Brak ID zadania lub projektu"))
+        
+        # Przenieś zadania od razu w cache, zapisy do TickTick w tle
+        before = get_view_quadrants()
+        submit_task_writes(writes)
+        moved = [write.optimistic_task() for write in writes]
+        st.session_state.bulk_move_report = (quadrant_key, BulkMoveResult(target_q, moved, failed))
+        rerun_after_task_change(before)
+
+
+def render_bulk_move_report(quadrant_key: str):
+    """
+    Pokazuje (jednorazowo) wynik ostatniego przenoszenia wielu zadań z ćwiartki
+    
+    Args:
+        quadrant_key: Klucz ćwiartki, z której przenoszono zadania
+    """
+    report: Optional[Tuple[str, BulkMoveResult]] = st.session_state.bulk_move_report
+    if report is None or report[0] != quadrant_key:
+        return
+    st.session_state.bulk_move_report = None
+    
+    result = report[1]
+    target_name = QUADRANTS[result.target_quadrant]["name"]
+    if result.moved:
+        st.success(f"✅ Przeniesiono do {target_name}: {len(result.moved)} (zapis do TickTick w tle)")
+    if result.failed:
+        failed_list = "\n".join(
+            f"- {task.get('title', 'Bez tytułu')}: {error}" for task, error in result.failed
+        )
+        st.error(f"❌ Nie udało się przenieść zadań: {len(result.failed)}\n{failed_list}")
 
 
 def render_stats(stats: Dict[str, int], total_tasks: int):
@@ -512,8 +1320,52 @@ def render_stats(stats: Dict[str, int], total_tasks: int):
         """, unsafe_allow_html=True)
 
 
+def render_diagnostics(timer: PhaseTimer):
+    """
+    Renderuje w panelu bocznym diagnostykę wydajności
+    
+    Pokazuje czasy etapów bieżącego przebiegu skryptu, łączny czas żądań do API
+    zakończonych w tym czasie oraz percentyle opóźnień dla każdego endpointu.
+    
+    Args:
+        timer: Pomiar etapów bieżącego przebiegu
+    """
+    metrics = get_request_metrics()
+    api_records = metrics.records_since(timer.started_wall)
+    
+    with st.sidebar:
+        st.markdown("### 🩺 Diagnostyka")
+        
+        rows = ["| Etap | ms |", "|---|---|"]
+        rows += [f"| {name} | {seconds * 1000:.1f} |" for name, seconds in timer.phases]
+        rows.append(f"| **Razem** | **{timer.total() * 1000:.1f}** |")
+        st.markdown("\n".join(rows))
+        st.caption(
+            f"Żądania API zakończone w tym przebiegu: {len(api_records)} "
+            f"({sum(record.latency_s for record in api_records) * 1000:.1f} ms łącznie, cały proces)"
+        )
+        
+        stats = metrics.endpoint_stats()
+        if not stats:
+            st.caption("Brak zarejestrowanych żądań do API")
+            return
+        rows = [
+            "| Endpoint | n | błędy | ponowienia | p50 | p90 | p99 | śr. KB |",
+            "|---|---|---|---|---|---|---|---|"
+        ]
+        for endpoint, values in stats.items():
+            rows.append(
+                f"| `{endpoint}` | {values['count']} | {values['errors']} | {values['retries']} | "
+                f"{values['p50_ms']:.0f} | {values['p90_ms']:.0f} | {values['p99_ms']:.0f} | "
+                f"{values['avg_bytes'] / 1024:.1f} |"
+            )
+        st.markdown("\n".join(rows))
+        st.caption(f"Opóźnienia w ms, ostatnie {sum(v['count'] for v in stats.values())} żądań")
+
+
 def main():
     """Główna funkcja aplikacji"""
+    timer = PhaseTimer()
     init_session_state()
     
     # Obsługa autoryzacji OAuth2
@@ -524,32 +1376,40 @@ def main():
             render_login_page()
             return
     
+    # Token mógł zostać odświeżony w tle (TokenManager)
+    if st.session_state.api:
+        st.session_state.access_token = st.session_state.api.access_token
+        st.session_state.refresh_token = st.session_state.api.tokens.refresh_token
+    
+    # Automatyczne pobieranie danych przy pierwszym uruchomieniu
+    # (najpierw z lokalnego snapshotu, świeże dane dociągane są w tle).
+    # Dane ładowane są przed panelem bocznym, który pokazuje liczby zadań.
+    if st.session_state.api and st.session_state.api.is_configured():
+        with timer.phase("Dane (cache, zapisy w tle)"):
+            apply_background_revalidation()
+            adopt_shared_tasks()
+            if not st.session_state.tasks_cache:
+                load_initial_tasks()
+            apply_write_outcomes()
+    
     # Jeśli zalogowany, pokaż dashboard
     # Sidebar z kontrolkami
-    selected_context = render_sidebar()
+    with timer.phase("Panel boczny"):
+        selected_context, custom_range = render_sidebar()
     
     # Nagłówek
     st.title("🎯 Macierz Eisenhowera - TickTick Dashboard")
     
-    # Automatyczne pobieranie danych przy pierwszym uruchomieniu
-    if not st.session_state.tasks_cache:
-        with st.spinner("Pobieranie zadań z TickTick..."):
-            st.session_state.tasks_cache = st.session_state.api.get_tasks()
-            st.session_state.last_refresh = datetime.now()
+    # Odrzucone zapisy w tle i liczba zmian czekających na zapis
+    render_write_errors()
+    render_write_status()
     
-    # Filtrowanie zadań według kontekstu
-    filtered_tasks = filter_tasks_by_context(
-        st.session_state.tasks_cache,
-        selected_context
-    )
-    
-    # Kategoryzacja do ćwiartek
-    quadrants = categorize_tasks_to_quadrants(filtered_tasks)
-    stats = get_quadrant_stats(quadrants)
-    total_tasks = sum(stats.values())
-    
-    # Wyświetl statystyki
-    render_stats(stats, total_tasks)
+    # Statystyki i ćwiartki są fragmentami czytającymi zadania z zapamiętanego
+    # podziału (kontekst) albo z indeksu terminów (własny zakres dat) - zmiana
+    # zadania odświeża tylko liczniki oraz ćwiartkę źródłową i docelową
+    st.session_state.matrix_view = (selected_context, custom_range)
+    with timer.phase("Statystyki"):
+        render_stats_fragment()
     
     st.markdown("---")
     
@@ -557,17 +1417,26 @@ def main():
     row1_col1, row1_col2 = st.columns(2)
     row2_col1, row2_col2 = st.columns(2)
     
-    with row1_col1:
-        render_quadrant("Q1", quadrants["Q1"])
-    
-    with row1_col2:
-        render_quadrant("Q2", quadrants["Q2"])
+    with timer.phase("Ćwiartki"):
+        with row1_col1:
+            render_quadrant_fragment("Q1")
+        
+        with row1_col2:
+            render_quadrant_fragment("Q2")
+        
+        with row2_col1:
+            render_quadrant_fragment("Q3")
+        
+        with row2_col2:
+            render_quadrant_fragment("Q4")
     
-    with row2_col1:
-        render_quadrant("Q3", quadrants["Q3"])
+    if st.session_state.get("show_diagnostics"):
+        render_diagnostics(timer)
     
-    with row2_col2:
-        render_quadrant("Q4", quadrants["Q4"])
+    # Macierz ze snapshotu jest już wyświetlona - poczekaj na świeże dane i odśwież widok
+    if st.session_state.revalidation_future is not None:
+        if apply_background_revalidation(wait=True):
+            st.rerun()
 
 
 if __name__ == "__main__":
@@ -4,9 +4,9 @@ Moduł autoryzacji OAuth2 dla TickTick - zintegrowany ze Streamlit
 
 import requests
 import base64
+import sys
 from urllib.parse import urlencode, parse_qs, urlparse
 from typing import Optional, Dict
-import streamlit as st
 
 
 class TickTickAuth:
@@ -133,14 +133,17 @@ def init_auth_from_env() -> Optional[TickTickAuth]:
     import os
     from dotenv import load_dotenv
     
-    # Próbuj najpierw Streamlit secrets (dla Streamlit Cloud)
+    # Próbuj najpierw Streamlit secrets (dla Streamlit Cloud) - tylko w aplikacji
+    # Streamlit; skrypty bez interfejsu (np. prewarm.py) nie importują streamlit
+    st = sys.modules.get("streamlit")
     try:
-        client_id = st.secrets.get("TICKTICK_CLIENT_ID")
-        client_secret = st.secrets.get("TICKTICK_CLIENT_SECRET")
-        redirect_uri = st.secrets.get("TICKTICK_REDIRECT_URI", "http://localhost:8501")
-        
-        if client_id and client_secret:
-            return TickTickAuth(client_id, client_secret, redirect_uri)
+        if st is not None:
+            client_id = st.secrets.get("TICKTICK_CLIENT_ID")
+            client_secret = st.secrets.get("TICKTICK_CLIENT_SECRET")
+            redirect_uri = st.secrets.get("TICKTICK_REDIRECT_URI", "http://localhost:8501")
+            
+            if client_id and client_secret:
+                return TickTickAuth(client_id, client_secret, redirect_uri)
     except Exception:
         pass
     
@@ -180,14 +183,11 @@ def handle_oauth_callback() -> Optional[str]:
     Returns:
         Kod autoryzacyjny lub None
     """
+    import streamlit as st
+    
     try:
-        # Dla Streamlit 1.29.0 i starszych
-        query_params = st.experimental_get_query_params()
-        code = query_params.get("code")
+        code = st.query_params.get("code")
         if code:
-            # Query params zwracają zawsze listę
-            if isinstance(code, list) and len(code) > 0:
-                return code[0]
             return code
     except Exception as e:
         # Ciche niepowodzenie - nie ma query params
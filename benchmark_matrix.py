@@ -0,0 +1,187 @@
+"""
+Benchmark ścieżki krytycznej Macierzy Eisenhowera na syntetycznych zadaniach
+
+Użycie:
+    python benchmark_matrix.py                                # 1k, 10k, 100k, 1M zadań
+    python benchmark_matrix.py --sizes 1000 10000 --output bench.json
+    python benchmark_matrix.py --sizes 10000 --compare bench.json
+
+Wyniki zapisywane są jako JSON (--output), a --compare porównuje bieżący pomiar
+z wcześniejszym plikiem i kończy się kodem 1, jeśli któraś funkcja zwolniła
+bardziej niż pozwala --max-regression.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from config import CONTEXTS, normalize_task
+from due_index import DueDateIndex
+from eisenhower_matrix import (
+    filter_tasks_by_context,
+    categorize_tasks_to_quadrants,
+    sort_tasks_by_deadline,
+    get_quadrant_stats,
+    bucket_tasks_by_context
+)
+from synthetic_tasks import generate_tasks
+from task_columns import TaskColumns
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def time_call(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Mierzy czas wykonania funkcji
+    
+    Args:
+        func: Funkcja bez argumentów
+        repeat: Liczba powtórzeń
+    
+    Returns:
+        Słownik z czasami min/median/mean w sekundach
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.mean(samples)
+    }
+
+
+def benchmark_size(size: int, seed: int, repeat: int) -> List[Dict]:
+    """
+    Uruchamia wszystkie pomiary dla jednego rozmiaru zbioru zadań
+    
+    Args:
+        size: Liczba zadań
+        seed: Ziarno generatora zadań
+        repeat: Liczba powtórzeń każdego pomiaru
+    
+    Returns:
+        Lista wyników (jeden słownik na mierzoną funkcję)
+    """
+    tasks = generate_tasks(size, seed=seed)
+    results = []
+    
+    def record(name: str, func: Callable[[], object], times: int = repeat):
+        timing = time_call(func, times)
+        results.append({"size": size, "name": name, "repeat": times, **timing})
+        print(f"{size:>9}  {name:<45} {timing['median_s'] * 1000:>10.2f} ms", file=sys.stderr)
+    
+    # Normalizacja wykonywana jest raz, przy wczytaniu zadań (TaskStore.upsert)
+    record("normalize_task", lambda: [normalize_task(task) for task in tasks], 1)
+    
+    for context_key in CONTEXTS:
+        record(f"filter_tasks_by_context[{context_key}]",
+               lambda: filter_tasks_by_context(tasks, context_key))
+    
+    record("DueDateIndex.__init__", lambda: DueDateIndex(tasks), 1)
+    due_index = DueDateIndex(tasks)
+    for context_key in CONTEXTS:
+        record(f"DueDateIndex.context[{context_key}]", lambda: due_index.context(context_key))
+    
+    record("categorize_tasks_to_quadrants", lambda: categorize_tasks_to_quadrants(tasks))
+    quadrants = categorize_tasks_to_quadrants(tasks)
+    record("get_quadrant_stats", lambda: get_quadrant_stats(quadrants))
+    record("sort_tasks_by_deadline", lambda: sort_tasks_by_deadline(tasks))
+    record("bucket_tasks_by_context", lambda: bucket_tasks_by_context(tasks))
+    
+    record("TaskColumns.__init__", lambda: TaskColumns(tasks), 1)
+    columns = TaskColumns(tasks)
+    record("TaskColumns.bucket_by_context", columns.bucket_by_context)
+    
+    return results
+
+
+def git_revision() -> str:
+    """Zwraca skrót bieżącego commita (lub pusty string poza repozytorium git)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare_results(current: List[Dict], baseline_path: str, max_regression: float) -> bool:
+    """
+    Porównuje wyniki z wcześniejszym plikiem JSON
+    
+    Args:
+        current: Bieżące wyniki
+        baseline_path: Ścieżka do pliku z poprzednim pomiarem
+        max_regression: Dopuszczalny stosunek czasu bieżącego do poprzedniego
+    
+    Returns:
+        True jeśli żaden pomiar nie przekroczył progu
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    
+    previous = {(row["size"], row["name"]): row for row in baseline["results"]}
+    ok = True
+    print(f"\nPorównanie z {baseline_path} (rewizja {baseline['meta'].get('revision') or '?'}):")
+    for row in current:
+        old = previous.get((row["size"], row["name"]))
+        if not old or not old["median_s"]:
+            continue
+        ratio = row["median_s"] / old["median_s"]
+        marker = "  ⚠️ REGRESJA" if ratio > max_regression else ""
+        print(f"{row['size']:>9}  {row['name']:<45} x{ratio:>6.2f}{marker}")
+        if ratio > max_regression:
+            ok = False
+    return ok
+
+
+def main():
+    """Punkt wejścia benchmarku"""
+    parser = argparse.ArgumentParser(description="Benchmark Macierzy Eisenhowera")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Liczby zadań do zmierzenia")
+    parser.add_argument("--seed", type=int, default=0, help="Ziarno generatora zadań")
+    parser.add_argument("--repeat", type=int, default=5, help="Liczba powtórzeń pomiaru")
+    parser.add_argument("--output", help="Plik JSON, do którego zapisać wyniki")
+    parser.add_argument("--compare", help="Plik JSON z poprzednim pomiarem do porównania")
+    parser.add_argument("--max-regression", type=float, default=1.2,
+                        help="Dopuszczalne spowolnienie przy --compare (np. 1.2 = +20%%)")
+    args = parser.parse_args()
+    
+    results = []
+    for size in args.sizes:
+        results.extend(benchmark_size(size, args.seed, args.repeat))
+    
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat
+        },
+        "results": results
+    }
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Wyniki zapisane do {args.output}", file=sys.stderr)
+    
+    if args.compare and not compare_results(results, args.compare, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """
 Konfiguracja kontekstów i reguł dla Macierzy Eisenhowera
 """
+import os
 from datetime import datetime, timedelta, date, timezone
 from zoneinfo import ZoneInfo
 
@@ -19,57 +20,113 @@ def get_tomorrow():
     """Zwraca jutrzejszą datę jako string YYYY-MM-DD"""
     return (datetime.now() + timedelta(days=1)).date()
 
-def get_task_date(task):
+def parse_due_date(due_date_str):
     """
-    Pobiera datę zadania z pola dueDate i zwraca jako date object.
-    Zwraca None jeśli zadanie nie ma daty.
-    Konwertuje z UTC na polską strefę czasową.
+    Parsuje datę TickTick (ISO, UTC) do obiektu datetime ze strefą czasową.
+    Zwraca None jeśli data jest pusta lub niepoprawna.
     """
-    due_date_str = task.get("dueDate", "")
     if not due_date_str:
         return None
     
     try:
         # TickTick używa ISO format UTC, np. "2026-01-05T23:00:00.000+0000"
-        # Parsujemy jako UTC datetime
-        dt_utc = datetime.fromisoformat(due_date_str.replace('Z', '+00:00'))
-        # Konwertujemy na polską strefę czasową (jawnie)
-        dt_poland = dt_utc.astimezone(POLAND_TZ)
-        # Zwracamy tylko datę (bez czasu)
-        return dt_poland.date()
-    except:
+        return datetime.fromisoformat(due_date_str.replace('Z', '+00:00'))
+    except (TypeError, ValueError):
         return None
 
+def parse_due_values(due_date_str):
+    """
+    Parsuje dueDate do pary (chwila terminu w UTC jako sekundy od epoki,
+    dzień terminu w polskiej strefie jako date.toordinal()).
+    Zwraca (None, None) jeśli data jest pusta lub niepoprawna.
+    """
+    dt_utc = parse_due_date(due_date_str)
+    if dt_utc is None:
+        return None, None
+    return dt_utc.timestamp(), dt_utc.astimezone(POLAND_TZ).date().toordinal()
+
+def normalize_task(task):
+    """
+    Jednorazowo parsuje dueDate zadania przy jego wczytaniu i dołącza wynik:
+    - "_due_ts": chwila terminu w UTC (sekundy od epoki) lub None,
+    - "_due_day": dzień terminu w polskiej strefie czasowej (date.toordinal()) lub None.
+    Wywoływana przez TaskStore przy dodawaniu zadania - pozostałe funkcje nie zmieniają
+    przekazanych zadań (get_task_day, get_task_due_ts liczą wartości na miejscu).
+    Filtry, sortowanie i renderowanie korzystają z nich zamiast parsować datę ponownie.
+    """
+    task["_due_ts"], task["_due_day"] = parse_due_values(task.get("dueDate", ""))
+    return task
+
+def get_task_due_ts(task):
+    """
+    Zwraca chwilę terminu zadania (sekundy od epoki, UTC) lub None jeśli zadanie nie ma daty.
+    Zadanie znormalizowane (normalize_task) nie jest parsowane ponownie, a pozostałe nie są zmieniane.
+    """
+    if "_due_ts" in task:
+        return task["_due_ts"]
+    return parse_due_values(task.get("dueDate", ""))[0]
+
+def get_task_day(task):
+    """
+    Zwraca dzień terminu zadania (w polskiej strefie) jako liczbę date.toordinal().
+    Zwraca None jeśli zadanie nie ma daty. Zadanie nie jest zmieniane.
+    """
+    if "_due_day" in task:
+        return task["_due_day"]
+    return parse_due_values(task.get("dueDate", ""))[1]
+
+def get_task_date(task):
+    """
+    Pobiera datę zadania z pola dueDate i zwraca jako date object.
+    Zwraca None jeśli zadanie nie ma daty.
+    Konwertuje z UTC na polską strefę czasową.
+    """
+    day = get_task_day(task)
+    return date.fromordinal(day) if day is not None else None
+
+def context_day_range(context_key, today=None):
+    """
+    Zwraca zakres dni kontekstu jako parę (pierwszy, ostatni) liczb date.toordinal(), włącznie.
+    Granica None oznacza brak ograniczenia z tej strony; zadania bez daty do zakresu nie pasują.
+    Zwraca None dla kontekstów bez filtrowania ("Wszystkie" i nieznane) - pasują wszystkie zadania.
+    """
+    if today is None:
+        today = get_today().toordinal()
+    week_start = today - date.fromordinal(today).weekday()
+    
+    ranges = {
+        "Dzisiejsze": (today, today),
+        "Wczorajsze": (today - 1, today - 1),
+        "Jutrzejsze": (today + 1, today + 1),
+        # Zadanie bez daty traktowane jest jak dzisiejsze, więc nie jest ani zaległe, ani przyszłe
+        "Zaległe": (None, today - 1),
+        "Przyszłe": (today + 1, None),
+        # Od poniedziałku do niedzieli bieżącego tygodnia
+        "Ten tydzień": (week_start, week_start + 6),
+        "Najbliższe 7 dni": (today, today + 6)
+    }
+    return ranges.get(context_key)
+
 def date_filter_function(context_key):
     """
     Zwraca funkcję filtrującą zadania według daty dla danego kontekstu.
     Funkcja przyjmuje zadanie i zwraca True jeśli zadanie pasuje do kontekstu.
     """
-    today = get_today()
+    day_range = context_day_range(context_key)
     
-    if context_key == "Wszystkie":
+    if day_range is None:
+        # "Wszystkie" i nieznane konteksty - bez filtrowania
         return lambda task: True
     
-    elif context_key == "Dzisiejsze":
-        return lambda task: get_task_date(task) == today
+    first_day, last_day = day_range
     
-    elif context_key == "Wczorajsze":
-        yesterday = get_yesterday()
-        return lambda task: get_task_date(task) == yesterday
+    def matches(task):
+        day = get_task_day(task)
+        if day is None:
+            return False
+        return (first_day is None or day >= first_day) and (last_day is None or day <= last_day)
     
-    elif context_key == "Jutrzejsze":
-        tomorrow = get_tomorrow()
-        return lambda task: get_task_date(task) == tomorrow
-    
-    elif context_key == "Zaległe":
-        return lambda task: get_task_date(task) is not None and get_task_date(task) < today
-    
-    elif context_key == "Przyszłe":
-        return lambda task: get_task_date(task) is not None and get_task_date(task) > today
-    
-    else:
-        # Domyślnie zwróć wszystkie
-        return lambda task: True
+    return matches
 
 def get_context_description(context_key):
     """
@@ -78,6 +135,8 @@ def get_context_description(context_key):
     today = get_today()
     yesterday = get_yesterday()
     tomorrow = get_tomorrow()
+    week_start = today - timedelta(days=today.weekday())
+    week_end = week_start + timedelta(days=6)
     
     descriptions = {
         "Wszystkie": "Wyświetla wszystkie zadania bez filtrowania",
@@ -85,7 +144,9 @@ def get_context_description(context_key):
         "Wczorajsze": f"Zadania z datą wczorajszą ({yesterday.strftime('%d.%m.%Y')})",
         "Jutrzejsze": f"Zadania z datą jutrzejszą ({tomorrow.strftime('%d.%m.%Y')})",
         "Zaległe": "Zadania z datami wcześniejszymi niż dzisiaj",
-        "Przyszłe": "Zadania z datami późniejszymi niż dzisiaj"
+        "Przyszłe": "Zadania z datami późniejszymi niż dzisiaj",
+        "Ten tydzień": f"Zadania z datą w bieżącym tygodniu ({week_start.strftime('%d.%m')}–{week_end.strftime('%d.%m.%Y')})",
+        "Najbliższe 7 dni": f"Zadania z datą od dzisiaj do {(today + timedelta(days=6)).strftime('%d.%m.%Y')}"
     }
     
     return descriptions.get(context_key, "")
@@ -121,6 +182,16 @@ CONTEXTS = {
         "name": "🔮 Przyszłe zadania",
         "tags": [],
         "description": "Zadania z datami późniejszymi niż dzisiaj"
+    },
+    "Ten tydzień": {
+        "name": "🗓️ Ten tydzień",
+        "tags": [],
+        "description": "Zadania z datą od poniedziałku do niedzieli bieżącego tygodnia"
+    },
+    "Najbliższe 7 dni": {
+        "name": "📆 Najbliższe 7 dni",
+        "tags": [],
+        "description": "Zadania z datą od dzisiaj do 6 dni naprzód"
     }
 }
 
@@ -131,6 +202,21 @@ TAG_MAPPING = {
     "think": "Q3",      # Tag #think → Q3 (Myślenie)
 }
 # Zadania bez tych tagów trafiają do Q4 (Zarządzanie)
+# Przeniesienie do ćwiartki ustawia jej tag z TAG_MAPPING (Q4 - bez tagu)
+
+# Reguły przypisania zadań do ćwiartek (quadrant_rules.py) - sprawdzane po kolei,
+# wygrywa pierwsza pasująca, a zadanie niepasujące do żadnej trafia do QUADRANT_DEFAULT.
+# Warunki reguły (muszą być spełnione wszystkie, pominięty = dowolna wartość):
+#   "tags": tagi (bez #), które zadanie musi mieć
+#   "priority": dopuszczalne priorytety TickTick (0, 1, 3, 5)
+#   "projects": ID projektów
+#   "due_days": [od, do] - termin w dniach względem dzisiaj, włącznie (None = bez
+#               ograniczenia, np. [None, 0] = dzisiejsze i zaległe); zadania bez terminu nie pasują
+# Przykład reguły dodanej przed regułami tagów: {"quadrant": "Q1", "priority": [5], "due_days": [None, 1]}
+QUADRANT_RULES = [
+    {"quadrant": quadrant, "tags": [tag]} for tag, quadrant in TAG_MAPPING.items()
+]
+QUADRANT_DEFAULT = "Q4"
 
 # Konfiguracja ćwiartek
 QUADRANTS = {
@@ -160,5 +246,92 @@ QUADRANTS = {
     }
 }
 
+# Od tej liczby zadań filtrowanie i kategoryzacja korzystają z kolumnowego
+# silnika NumPy (task_columns.py) zamiast pętli po słownikach
+COLUMNAR_MIN_TASKS = 2000
+
+# Liczba kart zadań wyświetlanych na jednej stronie ćwiartki
+QUADRANT_PAGE_SIZE = 25
+
+# Co tyle sekund fragment statusu zapisów sprawdza wyniki zapisów w tle (app.py)
+WRITE_STATUS_POLL_INTERVAL = 1.0
+
+# Domyślna długość własnego zakresu dat w panelu bocznym (w dniach, od dzisiaj)
+CUSTOM_RANGE_DEFAULT_DAYS = 7
+
+# Przy pierwszym pobieraniu podgląd macierzy odświeżany jest co najwyżej co tyle sekund
+PROGRESSIVE_RENDER_INTERVAL = 0.25
+
 # TickTick API Configuration
-TICKTICK_API_BASE_URL = "https://api.ticktick.com/open/v1"
+# Adres można nadpisać zmienną środowiskową, np. żeby wskazać lokalny fake_ticktick_server.py
+TICKTICK_API_BASE_URL = os.getenv("TICKTICK_API_BASE_URL", "https://api.ticktick.com/open/v1")
+
+# Poziom logowania modułów aplikacji (DEBUG pokazuje każde żądanie do API)
+LOG_LEVEL = os.getenv("TICKTICK_LOG_LEVEL", "WARNING")
+
+# Liczba ostatnich żądań do API przechowywanych dla panelu diagnostyki
+DIAGNOSTICS_HISTORY_SIZE = 2000
+
+# Liczba równoległych wątków przy pobieraniu zadań z projektów (1 = sekwencyjnie)
+TICKTICK_FETCH_WORKERS = 8
+
+# Pula połączeń HTTP (keep-alive) współdzielona przez wszystkie sesje Streamlit
+TICKTICK_POOL_CONNECTIONS = 4   # liczba pul (hostów) trzymanych w pamięci
+TICKTICK_POOL_SIZE = 16         # maksymalna liczba otwartych połączeń do jednego hosta
+
+# Token dostępu odświeżany jest w tle tyle sekund przed wygaśnięciem (token_manager.py)
+TICKTICK_TOKEN_REFRESH_MARGIN = 5 * 60
+# Po nieudanym odświeżeniu kolejna próba najwcześniej po tylu sekundach
+TICKTICK_TOKEN_REFRESH_RETRY = 60
+
+# Harmonogram żądań (rate_limiter.py) wspólny dla wszystkich sesji w procesie:
+# średnia liczba żądań na sekundę i liczba żądań, które mogą zostać wysłane od razu
+TICKTICK_RATE_LIMIT = float(os.getenv("TICKTICK_RATE_LIMIT", "10"))
+TICKTICK_RATE_LIMIT_BURST = int(os.getenv("TICKTICK_RATE_LIMIT_BURST", "20"))
+
+# Ponowienia po 429 / 5xx / błędzie sieci: limit prób i opóźnienie wykładnicze (s)
+TICKTICK_MAX_RETRIES = 4
+TICKTICK_BACKOFF_BASE = 0.5
+TICKTICK_BACKOFF_MAX = 30.0
+# Dłuższy Retry-After (s) nie jest przeczekiwany - żądanie kończy się odpowiedzią 429
+TICKTICK_RETRY_AFTER_MAX = 120.0
+
+# Liczba równoległych żądań przy przenoszeniu wielu zadań naraz
+# (move_tasks_to_quadrant i kolejka zapisów w tle - zmiany różnych zadań)
+TICKTICK_WRITE_WORKERS = 4
+
+# Kolejka zapisów w tle (przeniesienia i zmiany dat): liczba ponowień błędów
+# przejściowych (sieć, 5xx) i opóźnienie pierwszego ponowienia w sekundach
+# (podwajane przy każdej kolejnej próbie). Odpowiedzi 429 ponawia harmonogram żądań.
+TICKTICK_WRITE_MAX_RETRIES = 3
+TICKTICK_WRITE_RETRY_BACKOFF = 0.5
+# Zmiany tego samego zadania dodane w tym czasie (s) wysyłane są jednym żądaniem
+TICKTICK_WRITE_COALESCE_WINDOW = 0.3
+# Wątek wysyłający kończy się po tylu sekundach bez zmian (nie trzyma klienta API porzuconej sesji)
+TICKTICK_WRITE_WORKER_IDLE = 60
+
+# Synchronizacja przyrostowa: projekt bez zmian w liście /project jest i tak
+# pobierany ponownie, gdy jego dane są starsze niż podana liczba sekund
+TICKTICK_SYNC_MAX_AGE = 15 * 60
+
+# Klient asynchroniczny (HTTP/2 multipleksuje żądania na kilku połączeniach)
+TICKTICK_ASYNC_MAX_CONCURRENCY = 32  # maksymalna liczba jednoczesnych żądań
+TICKTICK_ASYNC_MAX_CONNECTIONS = 4   # maksymalna liczba połączeń TCP
+
+# Lokalny snapshot zadań (SQLite) - pozwala pokazać macierz od razu po starcie
+TASK_SNAPSHOT_PATH = os.getenv("TICKTICK_SNAPSHOT_PATH", os.path.join(".cache", "tasks_snapshot.sqlite3"))
+
+# Stała nazwa konta dla snapshotu i wspólnego cache zamiast skrótu tokena - pozwala
+# aplikacji wczytać snapshot przygotowany przez prewarm.py (token z OAuth2 jest inny
+# niż token zadania). Ustawiaj tylko, gdy z wdrożenia korzysta jedno konto TickTick.
+# Klucz dostaje tylko token z tą samą listą projektów (snapshot_store.resolve_account_key).
+TASK_SNAPSHOT_ACCOUNT = os.getenv("TICKTICK_SNAPSHOT_ACCOUNT", "")
+
+# Wspólny cache zadań w pamięci procesu (task_cache.py) - sesje tego samego konta
+# (np. kilka kart przeglądarki) korzystają z jednej kopii danych i jednego odświeżenia
+TASK_CACHE_TTL = int(os.getenv("TICKTICK_TASK_CACHE_TTL", str(5 * 60)))  # sekundy
+TASK_CACHE_MAX_BYTES = int(os.getenv("TICKTICK_TASK_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Zwarty model zadania (task_model.py): pola, których dashboard nie czyta (np. items,
+# reminders), trzymane są jako JSON i kompresowane, gdy zajmują co najmniej tyle bajtów
+TASK_RAW_COMPRESS_MIN_BYTES = 256
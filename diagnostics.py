@@ -0,0 +1,148 @@
+"""
+Diagnostyka wydajności - metryki żądań do TickTick API i czasy etapów przebiegu skryptu
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from config import DIAGNOSTICS_HISTORY_SIZE
+
+
+@dataclass
+class RequestRecord:
+    """Pomiar pojedynczego żądania HTTP"""
+    method: str
+    endpoint: str            # szablon ścieżki, np. "/project/{project_id}/data"
+    status: Optional[int]    # None = brak odpowiedzi (błąd sieci, przekroczony czas)
+    latency_s: float
+    size_bytes: int
+    retries: int = 0
+    finished_at: float = 0.0
+    
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and self.status < 400
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    # Percentyl metodą najbliższej rangi (wartości muszą być posortowane)
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class RequestMetrics:
+    """
+    Bufor ostatnich pomiarów żądań, współdzielony przez wszystkie sesje procesu
+    
+    Przechowywanych jest co najwyżej max_records ostatnich żądań, więc pamięć
+    nie rośnie z czasem działania aplikacji.
+    """
+    
+    def __init__(self, max_records: int = DIAGNOSTICS_HISTORY_SIZE):
+        self._records: Deque[RequestRecord] = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+    
+    def record(self, record: RequestRecord) -> None:
+        """
+        Zapisuje pomiar żądania
+        
+        Args:
+            record: Pomiar żądania
+        """
+        record.finished_at = record.finished_at or time.time()
+        with self._lock:
+            self._records.append(record)
+    
+    def records(self) -> List[RequestRecord]:
+        """Zwraca kopię zapisanych pomiarów (od najstarszego)"""
+        with self._lock:
+            return list(self._records)
+    
+    def records_since(self, timestamp: float) -> List[RequestRecord]:
+        """
+        Zwraca pomiary żądań zakończonych od podanej chwili
+        
+        Args:
+            timestamp: Czas w sekundach od epoki (time.time())
+        
+        Returns:
+            Lista pomiarów
+        """
+        return [record for record in self.records() if record.finished_at >= timestamp]
+    
+    def clear(self) -> None:
+        """Usuwa wszystkie pomiary"""
+        with self._lock:
+            self._records.clear()
+    
+    def endpoint_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Liczy statystyki opóźnień dla każdego endpointu
+        
+        Returns:
+            Słownik {"METODA szablon": {count, errors, retries, p50_ms, p90_ms, p99_ms, avg_bytes}}
+        """
+        grouped: Dict[str, List[RequestRecord]] = {}
+        for record in self.records():
+            grouped.setdefault(f"{record.method} {record.endpoint}", []).append(record)
+        
+        stats = {}
+        for key, records in sorted(grouped.items()):
+            latencies = sorted(record.latency_s * 1000 for record in records)
+            stats[key] = {
+                "count": len(records),
+                "errors": sum(not record.ok for record in records),
+                "retries": sum(record.retries for record in records),
+                "p50_ms": _percentile(latencies, 0.50),
+                "p90_ms": _percentile(latencies, 0.90),
+                "p99_ms": _percentile(latencies, 0.99),
+                "avg_bytes": sum(record.size_bytes for record in records) / len(records)
+            }
+        return stats
+
+
+_request_metrics = RequestMetrics()
+
+
+def get_request_metrics() -> RequestMetrics:
+    """Zwraca bufor metryk żądań współdzielony w całym procesie"""
+    return _request_metrics
+
+
+class PhaseTimer:
+    """
+    Mierzy czas kolejnych etapów jednego przebiegu skryptu
+    
+    Przykład:
+        timer = PhaseTimer()
+        with timer.phase("Ładowanie danych"):
+            ...
+        timer.phases  # [("Ładowanie danych", 0.012)]
+    """
+    
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.started_wall = time.time()
+        self.phases: List[Tuple[str, float]] = []
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Mierzy czas bloku kodu jako etap o podanej nazwie
+        
+        Args:
+            name: Nazwa etapu
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+    
+    def total(self) -> float:
+        """Zwraca czas od utworzenia licznika w sekundach"""
+        return time.perf_counter() - self.started_at
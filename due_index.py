@@ -0,0 +1,175 @@
+"""
+Indeks zadań posortowanych po terminie - konteksty dat i dowolne okna jako zapytania bisect
+"""
+
+from bisect import bisect_left, insort
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from config import POLAND_TZ, context_day_range, get_task_due_ts
+
+# Granice zapytania bez ograniczenia z danej strony
+_NO_LOWER_BOUND = float("-inf")
+_NO_UPPER_BOUND = float("inf")
+
+
+@lru_cache(maxsize=1024)
+def day_start_ts(day: int) -> float:
+    """
+    Zwraca początek dnia w polskiej strefie czasowej jako chwilę UTC (sekundy od epoki)
+    
+    Args:
+        day: Dzień jako date.toordinal()
+    
+    Returns:
+        Znacznik czasu północy danego dnia w strefie Europe/Warsaw
+    """
+    return datetime.combine(date.fromordinal(day), time.min, tzinfo=POLAND_TZ).timestamp()
+
+
+class DueDateIndex:
+    """
+    Zadania uporządkowane według chwili terminu (_due_ts z config.normalize_task)
+    
+    Zadanie ma termin w dniu d (w polskiej strefie), gdy jego chwila leży między
+    północą dnia d a północą dnia d + 1 - te granice liczone są raz (day_start_ts),
+    więc każdy kontekst daty i każde okno dni to dwa wyszukiwania binarne
+    w posortowanej liście zamiast przejścia po wszystkich zadaniach. Zadania bez
+    terminu trzymane są osobno (pasują tylko do kontekstów bez filtrowania).
+    
+    Indeks aktualizowany jest przyrostowo (add / remove), np. przez TaskStore
+    po zmianie daty zadania. Wyniki zapytań są w kolejności terminu.
+    """
+    
+    def __init__(self, tasks: Iterable[Mapping] = ()):
+        """
+        Buduje indeks (jedno sortowanie)
+        
+        Args:
+            tasks: Zadania (lista lub TaskStore)
+        """
+        self._keys: List[Tuple[float, str]] = []      # (chwila terminu, ID zadania) - posortowane
+        self._tasks: Dict[str, Mapping] = {}
+        self._due_ts: Dict[str, float] = {}           # klucz zadania w _keys (do usuwania)
+        self._undated: Dict[str, Mapping] = {}        # zadania bez terminu (kolejność dodania)
+        for task in tasks:
+            if task.get("id"):
+                self._store(task)
+        self._keys = sorted((due_ts, task_id) for task_id, due_ts in self._due_ts.items())
+    
+    def __len__(self) -> int:
+        return len(self._tasks)
+    
+    def copy(self) -> "DueDateIndex":
+        """Zwraca kopię indeksu (bez ponownego sortowania) - zmiany kopii nie dotyczą oryginału"""
+        index = DueDateIndex()
+        index._keys = list(self._keys)
+        index._tasks = dict(self._tasks)
+        index._due_ts = dict(self._due_ts)
+        index._undated = dict(self._undated)
+        return index
+    
+    def add(self, task: Mapping) -> None:
+        """
+        Dodaje zadanie lub aktualizuje jego pozycję (np. po zmianie dueDate)
+        
+        Args:
+            task: Znormalizowane zadanie (musi mieć pole "id")
+        """
+        task_id = task.get("id")
+        if not task_id:
+            return
+        self.remove(task_id)
+        due_ts = self._store(task)
+        if due_ts is not None:
+            insort(self._keys, (due_ts, task_id))
+    
+    def remove(self, task_id: str) -> None:
+        """
+        Usuwa zadanie z indeksu
+        
+        Args:
+            task_id: ID zadania
+        """
+        if self._tasks.pop(task_id, None) is None:
+            return
+        if self._undated.pop(task_id, None) is not None:
+            return
+        key = (self._due_ts.pop(task_id), task_id)
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+    
+    def between_ts(self, start_ts: float, end_ts: float) -> List[Mapping]:
+        """
+        Zwraca zadania z terminem w przedziale [start_ts, end_ts)
+        
+        Args:
+            start_ts: Początek przedziału (sekundy od epoki, UTC)
+            end_ts: Koniec przedziału, wyłącznie
+        
+        Returns:
+            Lista zadań w kolejności terminu
+        """
+        low = bisect_left(self._keys, (start_ts, ""))
+        high = bisect_left(self._keys, (end_ts, ""))
+        return [self._tasks[task_id] for _, task_id in self._keys[low:high]]
+    
+    def between_days(self, first_day: Optional[int], last_day: Optional[int]) -> List[Mapping]:
+        """
+        Zwraca zadania z terminem od pierwszego do ostatniego dnia włącznie (polska strefa)
+        
+        Args:
+            first_day: Pierwszy dzień (date.toordinal()) lub None - bez ograniczenia
+            last_day: Ostatni dzień (date.toordinal()) lub None - bez ograniczenia
+        
+        Returns:
+            Lista zadań w kolejności terminu
+        """
+        start_ts = _NO_LOWER_BOUND if first_day is None else day_start_ts(first_day)
+        end_ts = _NO_UPPER_BOUND if last_day is None else day_start_ts(last_day + 1)
+        return self.between_ts(start_ts, end_ts)
+    
+    def between_dates(self, first: Optional[date], last: Optional[date]) -> List[Mapping]:
+        """
+        Zwraca zadania z terminem w zakresie dat (np. zakres wybrany przez użytkownika)
+        
+        Args:
+            first: Pierwsza data lub None - bez ograniczenia
+            last: Ostatnia data (włącznie) lub None - bez ograniczenia
+        
+        Returns:
+            Lista zadań w kolejności terminu
+        """
+        return self.between_days(
+            first.toordinal() if first is not None else None,
+            last.toordinal() if last is not None else None
+        )
+    
+    def context(self, context_key: str, today: Optional[int] = None) -> List[Mapping]:
+        """
+        Zwraca zadania pasujące do kontekstu (odpowiednik filter_tasks_by_context)
+        
+        Args:
+            context_key: Klucz kontekstu z config.CONTEXTS
+            today: Dzisiejszy dzień (date.toordinal()); None = get_today()
+        
+        Returns:
+            Lista zadań w kolejności terminu (bez filtrowania: zadania bez terminu na końcu)
+        """
+        day_range = context_day_range(context_key, today)
+        if day_range is None:
+            return self.between_ts(_NO_LOWER_BOUND, _NO_UPPER_BOUND) + list(self._undated.values())
+        return self.between_days(*day_range)
+    
+    def _store(self, task: Mapping) -> Optional[float]:
+        # Zapamiętuje zadanie w słownikach (bez listy _keys) i zwraca chwilę terminu
+        task_id = task["id"]
+        due_ts = get_task_due_ts(task)
+        self._tasks[task_id] = task
+        if due_ts is None:
+            self._undated[task_id] = task
+        else:
+            self._due_ts[task_id] = due_ts
+        return due_ts
@@ -2,24 +2,32 @@
 Logika Macierzy Eisenhowera
 """
 
-from typing import List, Dict
-from config import TAG_MAPPING, CONTEXTS, date_filter_function
-from ticktick_api import parse_task_tags, is_task_completed
+from typing import Iterable, List, Dict, Optional
+from config import CONTEXTS, date_filter_function, get_task_day, get_task_due_ts, get_today
+from quadrant_rules import get_quadrant_classifier
+from task_store import TaskStore
+from ticktick_api import is_task_completed
 
 
-def filter_tasks_by_context(tasks: List[Dict], context_key: str) -> List[Dict]:
+def filter_tasks_by_context(tasks: Iterable[Dict], context_key: str) -> List[Dict]:
     """
     Filtruje zadania według wybranego kontekstu (na podstawie daty)
     
+    Dla TaskStore kontekst to zapytanie do indeksu terminów (TaskStore.context) -
+    bez przechodzenia po wszystkich zadaniach, w tej samej kolejności co dla listy.
+    
     Args:
-        tasks: Lista wszystkich zadań
+        tasks: Wszystkie zadania (lista lub TaskStore)
         context_key: Klucz kontekstu z config.CONTEXTS
         
     Returns:
         Przefiltrowana lista zadań
     """
     if context_key not in CONTEXTS:
-        return tasks
+        return list(tasks)
+    
+    if isinstance(tasks, TaskStore):
+        return tasks.context(context_key)
     
     # Pobierz funkcję filtrującą dla tego kontekstu
     filter_func = date_filter_function(context_key)
@@ -32,7 +40,7 @@ def filter_tasks_by_context(tasks: List[Dict], context_key: str) -> List[Dict]:
 
 def categorize_tasks_to_quadrants(tasks: List[Dict]) -> Dict[str, List[Dict]]:
     """
-    Segreguje zadania do odpowiednich ćwiartek Macierzy Eisenhowera na podstawie tagów
+    Segreguje zadania do odpowiednich ćwiartek Macierzy Eisenhowera (reguły z config.QUADRANT_RULES)
     
     Args:
         tasks: Lista zadań do kategoryzacji
@@ -46,29 +54,141 @@ def categorize_tasks_to_quadrants(tasks: List[Dict]) -> Dict[str, List[Dict]]:
         "Q3": [],
         "Q4": []
     }
+    classifier = get_quadrant_classifier()
+    today = get_today().toordinal()
     
     for task in tasks:
         # Pomiń zadania już wykonane
         if is_task_completed(task):
             continue
         
-        # Pobierz tagi zadania
-        task_tags = parse_task_tags(task)
-        
-        # Kategoryzuj na podstawie tagów (priorytet: fast > important > think > bez tagów)
-        if "#fast" in task_tags:
-            quadrants["Q1"].append(task)
-        elif "#important" in task_tags:
-            quadrants["Q2"].append(task)
-        elif "#think" in task_tags:
-            quadrants["Q3"].append(task)
-        else:
-            # Zadania bez tagów lub z innymi tagami
-            quadrants["Q4"].append(task)
+        quadrants[classifier.classify(task, today)].append(task)
     
     return quadrants
 
 
+def get_task_quadrant(task: Dict) -> str:
+    """
+    Wyznacza ćwiartkę zadania według reguł z config.QUADRANT_RULES
+    
+    Domyślnie na podstawie tagów (priorytet: fast > important > think > bez tagów).
+    
+    Args:
+        task: Słownik z danymi zadania
+        
+    Returns:
+        Klucz ćwiartki (Q1, Q2, Q3, Q4)
+    """
+    return get_quadrant_classifier().classify(task)
+
+
+def bucket_tasks_by_context(tasks: Iterable[Dict]) -> Dict[str, Dict[str, List[Dict]]]:
+    """
+    Przypisuje zadania jednocześnie do wszystkich pasujących kontekstów i ćwiartek
+    
+    Jedno przejście po zadaniach daje ten sam wynik co wywołanie
+    categorize_tasks_to_quadrants(filter_tasks_by_context(tasks, kontekst))
+    dla każdego kontekstu z config.CONTEXTS. Konteksty filtrują wyłącznie po dniu
+    terminu, więc zestaw pasujących kontekstów liczony jest raz na dzień.
+    
+    Args:
+        tasks: Wszystkie zadania (lista lub TaskStore)
+        
+    Returns:
+        Słownik {kontekst: {Q1..Q4: lista zadań}}
+    """
+    filters = {context_key: date_filter_function(context_key) for context_key in CONTEXTS}
+    classifier = get_quadrant_classifier()
+    today = get_today().toordinal()
+    buckets = {
+        context_key: {"Q1": [], "Q2": [], "Q3": [], "Q4": []}
+        for context_key in CONTEXTS
+    }
+    contexts_by_day = {}
+    
+    for task in tasks:
+        # Pomiń zadania już wykonane
+        if is_task_completed(task):
+            continue
+        
+        day = get_task_day(task)
+        matching = contexts_by_day.get(day)
+        if matching is None:
+            matching = [key for key, filter_func in filters.items() if filter_func(task)]
+            contexts_by_day[day] = matching
+        
+        quadrant = classifier.classify(task, today)
+        for context_key in matching:
+            buckets[context_key][quadrant].append(task)
+    
+    return buckets
+
+
+def update_task_in_buckets(buckets: Dict[str, Dict[str, List[Dict]]], old_task: Optional[Dict],
+                           new_task: Optional[Dict]) -> Dict[str, Dict[str, List[Dict]]]:
+    """
+    Aktualizuje podział z bucket_tasks_by_context po zmianie jednego zadania
+    
+    Zamiast dzielić wszystkie zadania od nowa, przelicza tylko konteksty
+    i ćwiartki, w których zadanie było lub do których trafia. Zwracany jest
+    nowy słownik - listy ćwiartek, których zmiana nie dotyczy, są tymi samymi
+    obiektami co w buckets (można na nich opierać zapamiętane wyniki, np. sortowanie).
+    
+    Args:
+        buckets: Dotychczasowy podział (nie jest modyfikowany)
+        old_task: Zadanie sprzed zmiany - ten sam obiekt co w buckets (None = nowe zadanie)
+        new_task: Zadanie po zmianie (None = zadanie usunięte)
+        
+    Returns:
+        Słownik {kontekst: {Q1..Q4: lista zadań}}
+    """
+    filters = {context_key: date_filter_function(context_key) for context_key in CONTEXTS}
+    classifier = get_quadrant_classifier()
+    today = get_today().toordinal()
+    
+    def placement(task: Optional[Dict]) -> Dict[str, str]:
+        # {kontekst: ćwiartka} dla zadania (pusty dla zadań wykonanych)
+        if task is None or is_task_completed(task):
+            return {}
+        quadrant = classifier.classify(task, today)
+        return {context_key: quadrant for context_key, filter_func in filters.items() if filter_func(task)}
+    
+    old_placement = placement(old_task)
+    new_placement = placement(new_task)
+    updated = {context_key: dict(quadrants) for context_key, quadrants in buckets.items()}
+    
+    for context_key in set(old_placement) | set(new_placement):
+        old_quadrant = old_placement.get(context_key)
+        new_quadrant = new_placement.get(context_key)
+        if old_quadrant is not None:
+            tasks = buckets[context_key][old_quadrant]
+            if old_quadrant == new_quadrant:
+                # Ta sama ćwiartka - podmień zadanie w miejscu, zachowując kolejność
+                updated[context_key][old_quadrant] = [new_task if task is old_task else task for task in tasks]
+                continue
+            updated[context_key][old_quadrant] = [task for task in tasks if task is not old_task]
+        if new_quadrant is not None:
+            updated[context_key][new_quadrant] = buckets[context_key][new_quadrant] + [new_task]
+    
+    return updated
+
+
+def get_context_counts(buckets: Dict[str, Dict[str, List[Dict]]]) -> Dict[str, Dict[str, int]]:
+    """
+    Liczy zadania w macierzy kontekst × ćwiartka
+    
+    Args:
+        buckets: Wynik bucket_tasks_by_context
+        
+    Returns:
+        Słownik {kontekst: {Q1..Q4: liczba zadań}}
+    """
+    return {
+        context_key: get_quadrant_stats(quadrants)
+        for context_key, quadrants in buckets.items()
+    }
+
+
 def get_quadrant_stats(quadrants: Dict[str, List[Dict]]) -> Dict[str, int]:
     """
     Oblicza statystyki dla ćwiartek
@@ -99,7 +219,13 @@ def sort_tasks_by_deadline(tasks: List[Dict]) -> List[Dict]:
     with_deadline = [t for t in tasks if t.get("dueDate")]
     without_deadline = [t for t in tasks if not t.get("dueDate")]
     
-    # Sortuj zadania z deadline
-    with_deadline.sort(key=lambda x: x.get("dueDate", ""))
+    # Sortuj zadania z deadline (po dacie sparsowanej przy wczytaniu zadania,
+    # niepoprawne daty na końcu w kolejności tekstowej)
+    with_deadline.sort(key=_deadline_sort_key)
     
     return with_deadline + without_deadline
+
+
+def _deadline_sort_key(task: Dict):
+    due_ts = get_task_due_ts(task)
+    return (due_ts is None, due_ts or 0, task.get("dueDate", ""))
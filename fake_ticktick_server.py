@@ -0,0 +1,333 @@
+"""
+Lokalny serwer udający TickTick Open API - testy obciążeniowe bez prawdziwego konta
+
+Użycie:
+    python fake_ticktick_server.py --port 8765 --projects 60 --tasks 5000 \\
+        --latency-ms 80 --jitter-ms 40 --rate-429 0.02 --rate-5xx 0.01
+
+    # w drugim terminalu
+    TICKTICK_API_BASE_URL=http://127.0.0.1:8765/open/v1 streamlit run app.py
+
+Obsługiwane endpointy (prefiks /open/v1):
+    GET  /project                                 -> lista projektów
+    GET  /project/{id}/data                       -> projekt z zadaniami
+    GET  /project/{id}                            -> sam projekt
+    POST /task/{id}                               -> aktualizacja zadania
+    POST /project/{pid}/task/{tid}/complete       -> oznaczenie jako wykonane
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from synthetic_tasks import generate_projects, generate_tasks
+
+API_PREFIX = "/open/v1"
+
+# Nazwy endpointów używane w profilach opóźnień i błędów
+ENDPOINTS = ["projects", "project_data", "project", "task_update", "task_complete"]
+
+_ROUTES = [
+    ("GET", re.compile(r"^/project$"), "projects"),
+    ("GET", re.compile(r"^/project/(?P<project_id>[^/]+)/data$"), "project_data"),
+    ("GET", re.compile(r"^/project/(?P<project_id>[^/]+)$"), "project"),
+    ("POST", re.compile(r"^/task/(?P<task_id>[^/]+)$"), "task_update"),
+    ("POST", re.compile(r"^/project/(?P<project_id>[^/]+)/task/(?P<task_id>[^/]+)/complete$"), "task_complete"),
+]
+
+
+@dataclass
+class EndpointProfile:
+    """Zachowanie pojedynczego endpointu: opóźnienie, rozrzut i odsetek błędów"""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    retry_after_s: float = 1.0
+    pad_bytes: int = 0  # dodatkowe bajty w każdym zwracanym zadaniu (symulacja dużych payloadów)
+
+
+@dataclass
+class FakeServerConfig:
+    """Konfiguracja serwera testowego"""
+    projects: int = 20
+    tasks: int = 2000
+    seed: int = 0
+    require_token: Optional[str] = None
+    profiles: Dict[str, EndpointProfile] = field(default_factory=dict)
+    
+    def profile(self, endpoint: str) -> EndpointProfile:
+        return self.profiles.get(endpoint) or self.profiles.get("*") or EndpointProfile()
+
+
+class FakeTickTickDataset:
+    """Zbiór projektów i zadań trzymany w pamięci (bezpieczny wątkowo)"""
+    
+    def __init__(self, config: FakeServerConfig):
+        self.lock = threading.Lock()
+        self.projects = generate_projects(config.projects, seed=config.seed)
+        self.tasks: Dict[str, Dict] = {}
+        self.tasks_by_project: Dict[str, List[str]] = {project["id"]: [] for project in self.projects}
+        for task in generate_tasks(config.tasks, seed=config.seed, projects=self.projects):
+            self.tasks[task["id"]] = task
+            self.tasks_by_project[task["projectId"]].append(task["id"])
+    
+    def project(self, project_id: str) -> Optional[Dict]:
+        return next((project for project in self.projects if project["id"] == project_id), None)
+    
+    def project_tasks(self, project_id: str) -> List[Dict]:
+        # Kopie - odpowiedź serializowana jest poza blokadą, a update_task zmienia zadania w miejscu
+        with self.lock:
+            return [dict(self.tasks[task_id]) for task_id in self.tasks_by_project.get(project_id, [])]
+    
+    def update_task(self, task_id: str, data: Dict) -> Optional[Dict]:
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if task is None:
+                return None
+            task.update({key: value for key, value in data.items() if key != "id"})
+            return dict(task)
+    
+    def complete_task(self, project_id: str, task_id: str) -> bool:
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if task is None or task.get("projectId") != project_id:
+                return False
+            task["status"] = 2
+            return True
+
+
+class FakeTickTickHandler(BaseHTTPRequestHandler):
+    """Obsługa żądań HTTP serwera testowego"""
+    
+    protocol_version = "HTTP/1.1"  # keep-alive, tak jak prawdziwe API
+    server: "FakeTickTickHTTPServer"
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+    
+    def do_GET(self):
+        self._dispatch("GET")
+    
+    def do_POST(self):
+        self._dispatch("POST")
+    
+    def _dispatch(self, method: str):
+        body = self._read_body()
+        endpoint, params = self._match(method)
+        if endpoint is None:
+            return self._send_json(404, {"errorMessage": "not found"})
+        
+        config = self.server.config
+        if config.require_token and self.headers.get("Authorization") != f"Bearer {config.require_token}":
+            return self._send_json(401, {"errorMessage": "unauthorized"})
+        
+        profile = config.profile(endpoint)
+        delay = profile.latency_ms + random.uniform(-profile.jitter_ms, profile.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+        
+        roll = random.random()
+        if roll < profile.rate_429:
+            return self._send_json(429, {"errorMessage": "rate limit"},
+                                   {"Retry-After": f"{profile.retry_after_s:g}"})
+        if roll < profile.rate_429 + profile.rate_5xx:
+            return self._send_json(random.choice([500, 502, 503]), {"errorMessage": "server error"})
+        
+        dataset = self.server.dataset
+        if endpoint == "projects":
+            return self._send_json(200, dataset.projects)
+        
+        if endpoint in ("project_data", "project"):
+            project = dataset.project(params["project_id"])
+            if project is None:
+                return self._send_json(404, {"errorMessage": "project not found"})
+            if endpoint == "project":
+                return self._send_json(200, project)
+            return self._send_json(200, {
+                "project": project,
+                "tasks": [_padded(task, profile) for task in dataset.project_tasks(project["id"])],
+                "columns": []
+            })
+        
+        if endpoint == "task_update":
+            try:
+                data = json.loads(body or b"{}")
+            except ValueError:
+                return self._send_json(400, {"errorMessage": "invalid json"})
+            task = dataset.update_task(params["task_id"], data)
+            if task is None:
+                return self._send_json(404, {"errorMessage": "task not found"})
+            return self._send_json(200, _padded(task, profile))
+        
+        if endpoint == "task_complete":
+            if not dataset.complete_task(params["project_id"], params["task_id"]):
+                return self._send_json(404, {"errorMessage": "task not found"})
+            return self._send_json(200, None)
+    
+    def _match(self, method: str) -> Tuple[Optional[str], Dict[str, str]]:
+        path = self.path.split("?", 1)[0]
+        if not path.startswith(API_PREFIX):
+            return None, {}
+        path = path[len(API_PREFIX):]
+        for route_method, pattern, endpoint in _ROUTES:
+            match = pattern.match(path)
+            if route_method == method and match:
+                return endpoint, match.groupdict()
+        return None, {}
+    
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+    
+    def _send_json(self, status: int, payload, extra_headers: Optional[Dict[str, str]] = None):
+        data = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _padded(task: Dict, profile: EndpointProfile) -> Dict:
+    # Dokleja do kopii zadania pole o rozmiarze z profilu endpointu
+    if profile.pad_bytes > 0:
+        task["padding"] = "x" * int(profile.pad_bytes)
+    return task
+
+
+class FakeTickTickHTTPServer(ThreadingHTTPServer):
+    """Wielowątkowy serwer HTTP z danymi i konfiguracją dostępnymi dla handlera"""
+    
+    daemon_threads = True
+    
+    def __init__(self, address, config: FakeServerConfig, verbose: bool = False):
+        super().__init__(address, FakeTickTickHandler)
+        self.config = config
+        self.dataset = FakeTickTickDataset(config)
+        self.verbose = verbose
+
+
+class FakeTickTickServer:
+    """
+    Serwer testowy uruchamiany w wątku tła
+    
+    Przykład:
+        with FakeTickTickServer(FakeServerConfig(tasks=10000)) as server:
+            api = TickTickAPI("token")
+            api.base_url = server.base_url
+    """
+    
+    def __init__(self, config: Optional[FakeServerConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.httpd = FakeTickTickHTTPServer((host, port), config or FakeServerConfig())
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def base_url(self) -> str:
+        """Adres do ustawienia jako TICKTICK_API_BASE_URL"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+    
+    @property
+    def dataset(self) -> FakeTickTickDataset:
+        return self.httpd.dataset
+    
+    def start(self) -> "FakeTickTickServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    
+    def __enter__(self) -> "FakeTickTickServer":
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+def parse_endpoint_overrides(values: List[str], base: EndpointProfile) -> Dict[str, EndpointProfile]:
+    """
+    Parsuje nadpisania profili w formacie endpoint:pole=wartość (np. project_data:latency_ms=250)
+    
+    Args:
+        values: Lista nadpisań z linii poleceń
+        base: Profil domyślny, na którym bazują nadpisania
+    
+    Returns:
+        Słownik {endpoint: EndpointProfile} (klucz "*" = profil domyślny)
+    """
+    profiles = {"*": base}
+    for value in values:
+        endpoint, _, assignment = value.partition(":")
+        name, _, number = assignment.partition("=")
+        if endpoint not in ENDPOINTS or not hasattr(base, name):
+            raise ValueError(f"Niepoprawne nadpisanie profilu: {value}")
+        profile = profiles.get(endpoint) or EndpointProfile(**vars(base))
+        setattr(profile, name, float(number))
+        profiles[endpoint] = profile
+    return profiles
+
+
+def main():
+    """Uruchamia serwer testowy z linii poleceń"""
+    parser = argparse.ArgumentParser(description="Lokalny serwer udający TickTick Open API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--projects", type=int, default=20, help="Liczba projektów")
+    parser.add_argument("--tasks", type=int, default=2000, help="Liczba zadań")
+    parser.add_argument("--seed", type=int, default=0, help="Ziarno generatora danych")
+    parser.add_argument("--pad-bytes", type=int, default=0, help="Dodatkowe bajty w każdym zwracanym zadaniu")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Opóźnienie odpowiedzi")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Losowy rozrzut opóźnienia (±)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Odsetek odpowiedzi 429")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="Odsetek odpowiedzi 5xx")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Wartość nagłówka Retry-After (s)")
+    parser.add_argument("--endpoint", action="append", default=[], metavar="NAZWA:POLE=WARTOŚĆ",
+                        help=f"Nadpisanie profilu endpointu ({', '.join(ENDPOINTS)}), "
+                             "np. project_data:latency_ms=250")
+    parser.add_argument("--require-token", help="Wymagany token Bearer (domyślnie dowolny)")
+    parser.add_argument("--verbose", action="store_true", help="Loguj każde żądanie")
+    args = parser.parse_args()
+    
+    base_profile = EndpointProfile(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        retry_after_s=args.retry_after,
+        pad_bytes=args.pad_bytes
+    )
+    config = FakeServerConfig(
+        projects=args.projects,
+        tasks=args.tasks,
+        seed=args.seed,
+        require_token=args.require_token,
+        profiles=parse_endpoint_overrides(args.endpoint, base_profile)
+    )
+    
+    httpd = FakeTickTickHTTPServer((args.host, args.port), config, verbose=args.verbose)
+    host, port = httpd.server_address[:2]
+    print(f"🧪 Serwer testowy TickTick: http://{host}:{port}{API_PREFIX}")
+    print(f"   TICKTICK_API_BASE_URL=http://{host}:{port}{API_PREFIX}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
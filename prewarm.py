@@ -0,0 +1,174 @@
+"""
+Przygotowanie snapshotu zadań bez Streamlit - do uruchamiania z crona lub przy starcie kontenera
+
+Użycie:
+    TICKTICK_SNAPSHOT_ACCOUNT=moje-konto python prewarm.py
+    python prewarm.py --snapshot-path /data/tasks_snapshot.sqlite3 --workers 16
+    python prewarm.py --refresh-token-file /data/ticktick_refresh_token
+
+Token pobierany jest ze zmiennych środowiskowych (lub .env): TICKTICK_ACCESS_TOKEN,
+a jeśli ustawiono TICKTICK_REFRESH_TOKEN oraz TICKTICK_CLIENT_ID / TICKTICK_CLIENT_SECRET
+(jak w init_auth_from_env) - token jest odświeżany przed pobraniem. Serwer może przy
+odświeżeniu wydać nowy refresh token (stary przestaje działać) - z --refresh-token-file
+refresh token czytany jest z pliku i nowy zapisywany jest w tym samym pliku, bez niego
+zadanie tylko ostrzega, że TICKTICK_REFRESH_TOKEN trzeba zaktualizować.
+
+Zadania ze wszystkich projektów zapisywane są jako snapshot, który app.py wczytuje przy
+pierwszym wyświetleniu. Aplikacja korzysta z innego tokena (OAuth2), dlatego wspólny klucz
+snapshotu ustala TICKTICK_SNAPSHOT_ACCOUNT - ta sama wartość musi być ustawiona w aplikacji.
+Snapshot zawiera odcisk listy projektów konta, a aplikacja udostępnia go tylko tokenom
+z tą samą listą projektów (snapshot_store.resolve_account_key).
+
+Kod wyjścia: 0 - snapshot zapisany, 1 - nie udało się pobrać części projektów
+(snapshot zapisany z pozostałych), 2 - brak tokena lub żadnych zadań.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from auth import init_auth_from_env
+from config import LOG_LEVEL, TASK_SNAPSHOT_ACCOUNT, TASK_SNAPSHOT_PATH
+from snapshot_store import TaskSnapshotStore, account_check_for_sync, account_key_for_token, shared_account_key
+from task_store import TaskStore
+from ticktick_api import TickTickAPI
+from token_manager import TokenManager
+
+
+def tokens_from_env(refresh_token_file: Optional[str] = None) -> Optional[TokenManager]:
+    """
+    Tworzy menedżer tokenu ze zmiennych środowiskowych
+    
+    Args:
+        refresh_token_file: Plik z refresh tokenem (jeśli istnieje, ma pierwszeństwo
+            przed TICKTICK_REFRESH_TOKEN)
+    
+    Returns:
+        TokenManager z ważnym tokenem lub None, jeśli nie da się go uzyskać
+    """
+    load_dotenv()
+    access_token = os.getenv("TICKTICK_ACCESS_TOKEN")
+    refresh_token = read_refresh_token(refresh_token_file) or os.getenv("TICKTICK_REFRESH_TOKEN")
+    auth = init_auth_from_env()
+    
+    if refresh_token and auth:
+        tokens = TokenManager(access_token, refresh_token, refresh=auth.refresh_access_token)
+        # Zadanie uruchamiane jest rzadko - zapisany token mógł już wygasnąć
+        if not tokens.refresh() and not access_token:
+            return None
+        return tokens
+    
+    if not access_token:
+        return None
+    return TokenManager(access_token)
+
+
+def read_refresh_token(path: Optional[str]) -> Optional[str]:
+    """
+    Czyta refresh token z pliku
+    
+    Args:
+        path: Ścieżka do pliku (None = brak pliku)
+    
+    Returns:
+        Refresh token lub None, jeśli pliku nie ma albo jest pusty
+    """
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return f.read().strip() or None
+
+
+def store_rotated_refresh_token(tokens: TokenManager, used_refresh_token: Optional[str],
+                                path: Optional[str]) -> None:
+    """
+    Zapisuje nowy refresh token, jeśli serwer wydał go przy odświeżeniu
+    
+    Args:
+        tokens: Menedżer tokenu po pobraniu zadań
+        used_refresh_token: Refresh token, z którym zadanie wystartowało
+        path: Plik na refresh token (None = tylko ostrzeżenie)
+    """
+    if not tokens.refresh_token or tokens.refresh_token == used_refresh_token:
+        return
+    if not path:
+        print("⚠️ TickTick wydał nowy refresh token - TICKTICK_REFRESH_TOKEN może już nie działać. "
+              "Użyj --refresh-token-file, żeby zadanie zapisywało aktualny token", file=sys.stderr)
+        return
+    # Plik tylko dla właściciela - zawiera poświadczenia konta
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(tokens.refresh_token + "\n")
+    os.chmod(path, 0o600)
+    print(f"🔑 Zapisano nowy refresh token -> {path}")
+
+
+def prewarm(snapshot_path: str = TASK_SNAPSHOT_PATH, max_workers: Optional[int] = None,
+            refresh_token_file: Optional[str] = None) -> int:
+    """
+    Pobiera zadania ze wszystkich projektów i zapisuje je jako snapshot
+    
+    Args:
+        snapshot_path: Ścieżka do bazy snapshotów
+        max_workers: Liczba równoległych wątków (None = TICKTICK_FETCH_WORKERS)
+        refresh_token_file: Plik z refresh tokenem (czytany i nadpisywany po rotacji)
+    
+    Returns:
+        Kod wyjścia (patrz opis modułu)
+    """
+    tokens = tokens_from_env(refresh_token_file)
+    if tokens is None:
+        print("❌ Brak tokena: ustaw TICKTICK_ACCESS_TOKEN albo TICKTICK_REFRESH_TOKEN "
+              "z TICKTICK_CLIENT_ID / TICKTICK_CLIENT_SECRET", file=sys.stderr)
+        return 2
+    if not TASK_SNAPSHOT_ACCOUNT:
+        print("⚠️ TICKTICK_SNAPSHOT_ACCOUNT nie jest ustawione - snapshot wczyta tylko sesja "
+              "zalogowana tym samym tokenem", file=sys.stderr)
+    
+    # Refresh token sprzed odświeżenia w tokens_from_env (plik i zmienna nie zostały jeszcze zmienione)
+    used_refresh_token = read_refresh_token(refresh_token_file) or os.getenv("TICKTICK_REFRESH_TOKEN")
+    
+    api = TickTickAPI(token_manager=tokens)
+    start = time.perf_counter()
+    result = api.sync_tasks(TaskStore(), {}, max_workers)
+    elapsed = time.perf_counter() - start
+    tokens.close()
+    store_rotated_refresh_token(tokens, used_refresh_token, refresh_token_file)
+    
+    if not result.tasks:
+        print("❌ Nie pobrano żadnych zadań - poprzedni snapshot pozostaje bez zmian", file=sys.stderr)
+        return 2
+    
+    store = TaskSnapshotStore(snapshot_path)
+    account_key = shared_account_key() or account_key_for_token(tokens.account_token)
+    if not store.save(account_key, result.tasks.to_list(), account_check_for_sync(result)):
+        return 2
+    
+    print(f"✅ Snapshot: {len(result.tasks)} zadań z {len(result.changed_project_ids)} projektów "
+          f"({elapsed:.1f} s) -> {snapshot_path}")
+    if result.failed_project_ids:
+        print(f"⚠️ Nie udało się pobrać projektów: {len(result.failed_project_ids)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main():
+    """Punkt wejścia zadania prewarm"""
+    parser = argparse.ArgumentParser(description="Przygotowanie snapshotu zadań TickTick (bez Streamlit)")
+    parser.add_argument("--snapshot-path", default=TASK_SNAPSHOT_PATH, help="Plik bazy snapshotów SQLite")
+    parser.add_argument("--workers", type=int, help="Liczba równoległych pobrań projektów")
+    parser.add_argument("--refresh-token-file",
+                        help="Plik z refresh tokenem - nowy token po rotacji zapisywany jest w tym pliku")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    sys.exit(prewarm(args.snapshot_path, args.workers, args.refresh_token_file))
+
+
+if __name__ == "__main__":
+    main()
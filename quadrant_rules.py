@@ -0,0 +1,220 @@
+"""
+Reguły przypisania zadań do ćwiartek - deklaratywna konfiguracja kompilowana do szybkiego klasyfikatora
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+from config import QUADRANT_DEFAULT, QUADRANT_RULES, QUADRANTS, TAG_MAPPING, get_task_day, get_today
+
+# Warunki, które może zawierać reguła (poza kluczem "quadrant")
+RULE_CONDITIONS = {"tags", "priority", "projects", "due_days"}
+
+_shared_classifier: Optional["QuadrantClassifier"] = None
+_shared_classifier_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """Reguła po kompilacji - tagi jako maska bitowa, pozostałe warunki jako zbiory"""
+    quadrant: str
+    tag_mask: int                                       # wymagane tagi (bity z QuadrantClassifier)
+    priorities: Optional[FrozenSet[int]] = None
+    projects: Optional[FrozenSet[str]] = None
+    due_days: Optional[Tuple[Optional[int], Optional[int]]] = None  # (od, do) względem dzisiaj
+    
+    @property
+    def tags_only(self) -> bool:
+        """Czy reguła sprawdza wyłącznie tagi (wynik zależy tylko od maski tagów)"""
+        return self.priorities is None and self.projects is None and self.due_days is None
+    
+    def matches_fields(self, task: Mapping, today: Optional[int]) -> bool:
+        """
+        Sprawdza warunki reguły inne niż tagi
+        
+        Args:
+            task: Słownik z danymi zadania
+            today: Dzisiejszy dzień (date.toordinal()); None = wyliczany w razie potrzeby
+        
+        Returns:
+            True jeśli zadanie spełnia warunki
+        """
+        if self.priorities is not None and task.get("priority", 0) not in self.priorities:
+            return False
+        if self.projects is not None and task.get("projectId") not in self.projects:
+            return False
+        if self.due_days is not None:
+            day = get_task_day(task)
+            if day is None:
+                return False
+            offset = day - (today if today is not None else get_today().toordinal())
+            low, high = self.due_days
+            if (low is not None and offset < low) or (high is not None and offset > high):
+                return False
+        return True
+
+
+class QuadrantClassifier:
+    """
+    Klasyfikator zadań do ćwiartek skompilowany z listy reguł
+    
+    Każdy tag użyty w regułach dostaje bit, a tagi zadania zamieniane są na
+    maskę jednym przejściem (O(liczba tagów zadania)). Dla każdej spotkanej
+    maski zapamiętywana jest tabela decyzyjna: reguły, których wymagane tagi
+    maska zawiera, w kolejności konfiguracji, ucięta na pierwszej regule
+    sprawdzającej tylko tagi. Przy regułach opartych wyłącznie na tagach
+    klasyfikacja to więc wyliczenie maski i jeden odczyt ze słownika,
+    niezależnie od liczby reguł; reguły z priorytetem, projektem lub terminem
+    sprawdzane są tylko wtedy, gdy pasują ich tagi.
+    
+    Ten sam klasyfikator wylicza tagi po przeniesieniu zadania do ćwiartki
+    (move_tags), więc podział na ćwiartki i przenoszenie korzystają z jednej
+    konfiguracji.
+    """
+    
+    def __init__(self, rules: Iterable[Mapping] = QUADRANT_RULES,
+                 tag_mapping: Mapping[str, str] = TAG_MAPPING, default: str = QUADRANT_DEFAULT):
+        """
+        Kompiluje reguły
+        
+        Args:
+            rules: Reguły w kolejności sprawdzania (format jak config.QUADRANT_RULES)
+            tag_mapping: Tag ustawiany przy przeniesieniu do ćwiartki ({tag: ćwiartka})
+            default: Ćwiartka zadań niepasujących do żadnej reguły
+        
+        Raises:
+            ValueError: Gdy reguła wskazuje nieznaną ćwiartkę lub zawiera nieznany warunek
+        """
+        self._validate_quadrant(default)
+        self.default = default
+        self._tag_bits: Dict[str, int] = {}
+        self.rules: List[CompiledRule] = [self._compile(rule) for rule in rules]
+        self._decisions: Dict[int, Tuple[CompiledRule, ...]] = {}
+        
+        # Pierwszy tag wskazujący ćwiartkę jest jej tagiem przy przenoszeniu
+        self._move_tags: Dict[str, str] = {}
+        for tag, quadrant in tag_mapping.items():
+            self._validate_quadrant(quadrant)
+            self._move_tags.setdefault(quadrant, tag)
+        # Przeniesienie usuwa wszystkie tagi, od których zależy ćwiartka
+        self.rule_tags: FrozenSet[str] = frozenset(self._tag_bits) | frozenset(tag_mapping)
+    
+    @property
+    def uses_due_dates(self) -> bool:
+        """Czy wynik klasyfikacji zależy od dzisiejszej daty (reguły z due_days)"""
+        return any(rule.due_days is not None for rule in self.rules)
+    
+    def tag_mask(self, tags: Optional[Iterable[str]]) -> int:
+        """
+        Zamienia tagi zadania na maskę bitową (tagi nieużywane w regułach są pomijane)
+        
+        Args:
+            tags: Tagi zadania (bez #)
+        
+        Returns:
+            Maska tagów
+        """
+        bits = self._tag_bits
+        mask = 0
+        for tag in tags or ():
+            mask |= bits.get(tag, 0)
+        return mask
+    
+    def classify(self, task: Mapping, today: Optional[int] = None) -> str:
+        """
+        Wyznacza ćwiartkę zadania
+        
+        Args:
+            task: Słownik z danymi zadania
+            today: Dzisiejszy dzień (date.toordinal()) - przy klasyfikacji wielu zadań
+                warto przekazać go raz (None = wyliczany, gdy reguła sprawdza termin)
+        
+        Returns:
+            Klucz ćwiartki (Q1, Q2, Q3, Q4)
+        """
+        for rule in self._decision(self.tag_mask(task.get("tags"))):
+            if rule.tags_only or rule.matches_fields(task, today):
+                return rule.quadrant
+        return self.default
+    
+    def move_tags(self, current_tags: Optional[List[str]], target_quadrant: str) -> List[str]:
+        """
+        Wylicza tagi zadania po przeniesieniu do innej ćwiartki
+        
+        Usuwane są tagi używane przez reguły, a dodawany tag ćwiartki docelowej
+        z tag_mapping. Reguły oparte na priorytecie, projekcie lub terminie mogą
+        nadal przypisać zadanie do innej ćwiartki - tagi ich nie zmieniają.
+        
+        Args:
+            current_tags: Aktualne tagi zadania (bez #)
+            target_quadrant: Docelowa ćwiartka (Q1, Q2, Q3, Q4)
+        
+        Returns:
+            Nowa lista tagów
+        """
+        new_tags = [tag for tag in current_tags or [] if tag not in self.rule_tags]
+        target_tag = self._move_tags.get(target_quadrant)
+        if target_tag:
+            new_tags.append(target_tag)
+        return new_tags
+    
+    def _decision(self, mask: int) -> Tuple[CompiledRule, ...]:
+        # Reguły do sprawdzenia dla maski tagów - liczone raz dla każdej spotkanej maski
+        candidates = self._decisions.get(mask)
+        if candidates is None:
+            matching = []
+            for rule in self.rules:
+                if rule.tag_mask & mask == rule.tag_mask:
+                    matching.append(rule)
+                    if rule.tags_only:
+                        break
+            candidates = tuple(matching)
+            self._decisions[mask] = candidates
+        return candidates
+    
+    def _compile(self, rule: Mapping) -> CompiledRule:
+        unknown = set(rule) - RULE_CONDITIONS - {"quadrant"}
+        if unknown:
+            raise ValueError(f"Nieznane warunki reguły ćwiartki: {', '.join(sorted(unknown))}")
+        quadrant = rule.get("quadrant")
+        self._validate_quadrant(quadrant)
+        
+        tag_mask = 0
+        for tag in rule.get("tags") or ():
+            tag_mask |= self._tag_bits.setdefault(tag, 1 << len(self._tag_bits))
+        
+        priorities = rule.get("priority")
+        projects = rule.get("projects")
+        due_days = rule.get("due_days")
+        if due_days is not None:
+            low, high = due_days
+            due_days = (low, high)
+        
+        return CompiledRule(
+            quadrant,
+            tag_mask,
+            frozenset(priorities) if priorities is not None else None,
+            frozenset(projects) if projects is not None else None,
+            due_days
+        )
+    
+    @staticmethod
+    def _validate_quadrant(quadrant: Optional[str]) -> None:
+        if quadrant not in QUADRANTS:
+            raise ValueError(f"Nieznana ćwiartka w regułach: {quadrant!r}")
+
+
+def get_quadrant_classifier() -> QuadrantClassifier:
+    """
+    Zwraca klasyfikator skompilowany z config.QUADRANT_RULES (raz na proces)
+    
+    Returns:
+        Współdzielony QuadrantClassifier
+    """
+    global _shared_classifier
+    if _shared_classifier is None:
+        with _shared_classifier_lock:
+            if _shared_classifier is None:
+                _shared_classifier = QuadrantClassifier()
+    return _shared_classifier
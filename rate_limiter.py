@@ -0,0 +1,263 @@
+"""
+Harmonogram żądań do TickTick API - limit szybkości (token bucket), Retry-After i ponowienia
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+from config import (
+    TICKTICK_BACKOFF_BASE,
+    TICKTICK_BACKOFF_MAX,
+    TICKTICK_MAX_RETRIES,
+    TICKTICK_RATE_LIMIT,
+    TICKTICK_RATE_LIMIT_BURST,
+    TICKTICK_RETRY_AFTER_MAX
+)
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+# Statusy, po których warto ponowić żądanie
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+_shared_scheduler: Optional["RequestScheduler"] = None
+_shared_scheduler_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+    Wiadro żetonów ograniczające liczbę żądań na sekundę
+    
+    Żeton rezerwowany jest od razu, a wywołujący dostaje czas, jaki musi
+    odczekać - dzięki temu to samo wiadro obsługuje wątki (time.sleep)
+    i korutyny (asyncio.sleep). Po odpowiedzi 429 wiadro można wstrzymać
+    do chwili wskazanej w Retry-After - dotyczy to wszystkich wywołujących.
+    """
+    
+    def __init__(self, rate: float, burst: int):
+        """
+        Inicjalizacja wiadra
+        
+        Args:
+            rate: Liczba żetonów odnawianych na sekundę
+            burst: Pojemność wiadra (maksymalna liczba żądań wysłanych od razu)
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        # Chwila, od której liczone jest odnawianie żetonów (w przyszłości w czasie wstrzymania)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """
+        Rezerwuje żeton
+        
+        Kolejne rezerwacje dostają terminy oddalone o 1/rate, także po
+        zakończeniu wstrzymania - oczekujące żądania nie ruszają jednocześnie.
+        
+        Returns:
+            Czas w sekundach, jaki trzeba odczekać przed wysłaniem żądania
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now > self._updated:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return self._updated - now + wait
+    
+    def pause(self, seconds: float) -> None:
+        """
+        Wstrzymuje wydawanie żetonów (np. po odpowiedzi 429 z Retry-After)
+        
+        Po wstrzymaniu wiadro startuje z jednym żetonem, więc pierwsze żądanie
+        rusza od razu po jego końcu, a kolejne co 1/rate.
+        
+        Args:
+            seconds: Czas wstrzymania w sekundach
+        """
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self._updated:
+                self._updated = until
+                self._tokens = 1.0
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parsuje nagłówek Retry-After (liczba sekund lub data HTTP)
+    
+    Args:
+        value: Wartość nagłówka
+    
+    Returns:
+        Liczba sekund do odczekania lub None jeśli nagłówka brak / jest niepoprawny
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RequestScheduler:
+    """
+    Harmonogram żądań współdzielony przez wszystkie sesje w procesie
+    
+    Każde żądanie czeka na żeton z TokenBucket. Odpowiedź 429 wstrzymuje
+    wiadro na czas z Retry-After (albo czas ponowienia), więc kolejne żądania
+    - także z innych sesji - nie pogłębiają ograniczenia. Retry-After jest
+    respektowany w całości; dłuższy niż retry_after_max kończy żądanie
+    odpowiedzią 429 zamiast blokować wywołującego. Żądania idempotentne
+    (GET) są ponawiane po 429, 5xx i błędach sieci z wykładniczym opóźnieniem
+    z losowym rozrzutem; pozostałe tylko po 429, który oznacza, że serwer
+    żądania nie przetworzył.
+    """
+    
+    def __init__(self, rate: float = TICKTICK_RATE_LIMIT, burst: int = TICKTICK_RATE_LIMIT_BURST,
+                 max_retries: int = TICKTICK_MAX_RETRIES, backoff_base: float = TICKTICK_BACKOFF_BASE,
+                 backoff_max: float = TICKTICK_BACKOFF_MAX,
+                 retry_after_max: float = TICKTICK_RETRY_AFTER_MAX):
+        """
+        Inicjalizacja harmonogramu
+        
+        Args:
+            rate: Maksymalna średnia liczba żądań na sekundę
+            burst: Maksymalna liczba żądań wysłanych od razu
+            max_retries: Maksymalna liczba ponowień jednego żądania
+            backoff_base: Podstawa opóźnienia ponowienia w sekundach
+            backoff_max: Maksymalne wyliczane opóźnienie ponowienia w sekundach
+            retry_after_max: Najdłuższy Retry-After (s), na który warto czekać z ponowieniem
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+    
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        Wylicza opóźnienie ponowienia ("full jitter")
+        
+        Args:
+            attempt: Numer ponowienia (od 0)
+        
+        Returns:
+            Losowe opóźnienie z przedziału [0, min(backoff_max, backoff_base * 2^attempt)]
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+    
+    def _retry_delay(self, status: Optional[int], retry_after: Optional[str], attempt: int,
+                     idempotent: bool) -> Optional[float]:
+        # Zwraca opóźnienie ponowienia albo None, jeśli żądania nie należy ponawiać
+        if status == 429:
+            delay = parse_retry_after(retry_after)
+            if delay is None:
+                delay = self.backoff_delay(attempt)
+            self.bucket.pause(delay)
+            if attempt >= self.max_retries or delay > self.retry_after_max:
+                return None
+            return delay
+        if attempt >= self.max_retries:
+            return None
+        if idempotent and (status is None or status in RETRYABLE_STATUSES):
+            return self.backoff_delay(attempt)
+        return None
+    
+    def call(self, send: Callable[[], R], idempotent: bool,
+             transient_errors: Tuple[Type[BaseException], ...] = ()) -> Tuple[R, int]:
+        """
+        Wysyła żądanie z limitem szybkości i ponowieniami
+        
+        Args:
+            send: Funkcja wysyłająca żądanie i zwracająca odpowiedź (z polem status_code)
+            idempotent: Czy żądanie można bezpiecznie powtórzyć po błędzie serwera lub sieci
+            transient_errors: Wyjątki oznaczające przejściowy błąd sieci
+        
+        Returns:
+            Krotka (ostatnia odpowiedź, liczba ponowień)
+        
+        Raises:
+            Wyjątki z transient_errors, gdy ponowienia się wyczerpały
+        """
+        attempt = 0
+        while True:
+            time.sleep(self.bucket.reserve())
+            try:
+                response = send()
+            except transient_errors as e:
+                delay = self._retry_delay(None, None, attempt, idempotent)
+                if delay is None:
+                    raise
+                logger.warning("Błąd sieci (%s), ponowienie za %.2f s", e, delay)
+            else:
+                delay = self._retry_delay(response.status_code, response.headers.get("Retry-After"),
+                                          attempt, idempotent)
+                if delay is None:
+                    return response, attempt
+                logger.warning("Odpowiedź %s, ponowienie za %.2f s", response.status_code, delay)
+            attempt += 1
+            time.sleep(delay)
+    
+    async def call_async(self, send: Callable[[], Awaitable[R]], idempotent: bool,
+                         transient_errors: Tuple[Type[BaseException], ...] = ()) -> Tuple[R, int]:
+        """
+        Asynchroniczny odpowiednik call (czekanie przez asyncio.sleep)
+        
+        Args:
+            send: Korutyna wysyłająca żądanie i zwracająca odpowiedź (z polem status_code)
+            idempotent: Czy żądanie można bezpiecznie powtórzyć po błędzie serwera lub sieci
+            transient_errors: Wyjątki oznaczające przejściowy błąd sieci
+        
+        Returns:
+            Krotka (ostatnia odpowiedź, liczba ponowień)
+        """
+        attempt = 0
+        while True:
+            await asyncio.sleep(self.bucket.reserve())
+            try:
+                response = await send()
+            except transient_errors as e:
+                delay = self._retry_delay(None, None, attempt, idempotent)
+                if delay is None:
+                    raise
+                logger.warning("Błąd sieci (%s), ponowienie za %.2f s", e, delay)
+            else:
+                delay = self._retry_delay(response.status_code, response.headers.get("Retry-After"),
+                                          attempt, idempotent)
+                if delay is None:
+                    return response, attempt
+                logger.warning("Odpowiedź %s, ponowienie za %.2f s", response.status_code, delay)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+
+def get_request_scheduler() -> RequestScheduler:
+    """
+    Zwraca harmonogram żądań współdzielony w całym procesie (tworzony przy pierwszym użyciu)
+    
+    Returns:
+        Współdzielony RequestScheduler
+    """
+    global _shared_scheduler
+    if _shared_scheduler is None:
+        with _shared_scheduler_lock:
+            if _shared_scheduler is None:
+                _shared_scheduler = RequestScheduler()
+    return _shared_scheduler
@@ -0,0 +1,287 @@
+"""
+Trwały, lokalny snapshot zadań (SQLite) - natychmiastowy start dashboardu
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Dict, Optional
+
+from config import TASK_SNAPSHOT_ACCOUNT, TASK_SNAPSHOT_PATH
+from task_cache import get_task_cache
+from task_store import TaskStore
+
+logger = logging.getLogger(__name__)
+
+_shared_store: Optional["TaskSnapshotStore"] = None
+_shared_store_lock = threading.Lock()
+
+# Wątki odświeżające snapshot w tle (wspólne dla wszystkich sesji Streamlit)
+_revalidation_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="snapshot-revalidate")
+
+
+@dataclass
+class TaskSnapshot:
+    """Ostatni znany zestaw zadań konta"""
+    tasks: List[Dict]
+    saved_at: float
+    account_check: Optional[str] = None  # odcisk listy projektów konta (patrz account_check_for_sync)
+
+
+def account_key_for_token(access_token: str) -> str:
+    """
+    Wylicza klucz konta na podstawie tokena (sam token nigdy nie trafia na dysk)
+    
+    Args:
+        access_token: Token dostępu TickTick
+    
+    Returns:
+        Skrót SHA-256 tokena
+    """
+    return hashlib.sha256((access_token or "").encode()).hexdigest()
+
+
+def shared_account_key() -> Optional[str]:
+    """
+    Zwraca klucz konta wspólny dla aplikacji i prewarm.py (z TASK_SNAPSHOT_ACCOUNT)
+    
+    Returns:
+        Skrót SHA-256 nazwy konta lub None, gdy TASK_SNAPSHOT_ACCOUNT nie jest ustawione
+    """
+    if not TASK_SNAPSHOT_ACCOUNT:
+        return None
+    return hashlib.sha256(f"account:{TASK_SNAPSHOT_ACCOUNT}".encode()).hexdigest()
+
+
+def account_check(project_ids: Iterable[str]) -> str:
+    """
+    Wylicza odcisk konta z ID jego projektów
+    
+    ID projektów są losowe i widoczne tylko dla właściciela tokena, więc zgodny
+    odcisk potwierdza, że token należy do konta, którego zadania są w snapshocie.
+    
+    Args:
+        project_ids: ID projektów z listy /project
+    
+    Returns:
+        Skrót SHA-256 posortowanych ID projektów
+    """
+    return hashlib.sha256("\n".join(sorted(project_ids)).encode()).hexdigest()
+
+
+def account_check_for_sync(result) -> str:
+    """
+    Wylicza odcisk konta z wyniku synchronizacji (wszystkie projekty z listy /project)
+    
+    Args:
+        result: ticktick_api.SyncResult
+    
+    Returns:
+        Odcisk konta (patrz account_check)
+    """
+    return account_check(set(result.sync_state) | set(result.failed_project_ids))
+
+
+def resolve_account_key(api) -> str:
+    """
+    Wybiera klucz konta sesji (snapshot i wspólny cache zadań)
+    
+    Klucz wspólny z TASK_SNAPSHOT_ACCOUNT dostaje tylko token, którego lista
+    projektów (jedno żądanie /project) zgadza się z odciskiem zapisanym
+    w snapshocie tego klucza - inaczej dowolny token (np. wklejony ręcznie)
+    dostałby zadania konta bez żadnego żądania. Pozostałe tokeny używają
+    własnego klucza (account_key_for_token).
+    
+    Args:
+        api: Instancja TickTickAPI
+    
+    Returns:
+        Klucz konta
+    """
+    private_key = account_key_for_token(api.tokens.account_token)
+    shared_key = shared_account_key()
+    if shared_key is None:
+        return private_key
+    
+    expected = get_snapshot_store().account_check(shared_key)
+    if expected is None:
+        return private_key
+    projects = api.get_projects()
+    if projects and account_check(project["id"] for project in projects if project.get("id")) == expected:
+        return shared_key
+    logger.info("Token nie pasuje do konta %s - snapshot wspólny pominięty", TASK_SNAPSHOT_ACCOUNT)
+    return private_key
+
+
+class TaskSnapshotStore:
+    """Klasa przechowująca snapshoty zadań w bazie SQLite (jeden wiersz na konto)"""
+    
+    def __init__(self, path: str = TASK_SNAPSHOT_PATH):
+        """
+        Inicjalizacja magazynu snapshotów
+        
+        Args:
+            path: Ścieżka do pliku bazy SQLite
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS task_snapshots ("
+                "account_key TEXT PRIMARY KEY, "
+                "saved_at REAL NOT NULL, "
+                "payload TEXT NOT NULL)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(task_snapshots)")}
+            if "account_check" not in columns:
+                # Baza zapisana przez starszą wersję
+                conn.execute("ALTER TABLE task_snapshots ADD COLUMN account_check TEXT")
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Osobne połączenie na operację - sqlite3 nie współdzieli połączeń między wątkami.
+        # "with conn" tylko zatwierdza lub wycofuje transakcję, więc połączenie zamykane jest osobno
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def load(self, account_key: str) -> Optional[TaskSnapshot]:
+        """
+        Wczytuje ostatni snapshot konta
+        
+        Args:
+            account_key: Klucz konta (patrz account_key_for_token)
+        
+        Returns:
+            TaskSnapshot lub None jeśli brak snapshotu albo jest nieczytelny
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT payload, saved_at, account_check FROM task_snapshots WHERE account_key = ?",
+                    (account_key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error("Błąd odczytu snapshotu zadań: %s", e)
+            return None
+        
+        if not row:
+            return None
+        
+        try:
+            return TaskSnapshot(tasks=json.loads(row[0]), saved_at=row[1], account_check=row[2])
+        except ValueError as e:
+            logger.error("Uszkodzony snapshot zadań: %s", e)
+            return None
+    
+    def account_check(self, account_key: str) -> Optional[str]:
+        """
+        Wczytuje sam odcisk konta zapisany ze snapshotem (bez zadań)
+        
+        Args:
+            account_key: Klucz konta
+        
+        Returns:
+            Odcisk konta lub None, jeśli brak snapshotu lub odcisku
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT account_check FROM task_snapshots WHERE account_key = ?",
+                    (account_key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error("Błąd odczytu snapshotu zadań: %s", e)
+            return None
+        return row[0] if row else None
+    
+    def save(self, account_key: str, tasks: Iterable[Dict], account_check: Optional[str] = None) -> bool:
+        """
+        Zapisuje (nadpisuje) snapshot konta
+        
+        Args:
+            account_key: Klucz konta
+            tasks: Zadania do zapisania (lista lub TaskStore)
+            account_check: Odcisk konta (patrz account_check_for_sync) - bez niego
+                snapshot pod kluczem wspólnym nie jest udostępniany innym tokenom
+        
+        Returns:
+            True jeśli sukces, False w przeciwnym razie
+        """
+        try:
+            payload = json.dumps(list(tasks), ensure_ascii=False)
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO task_snapshots (account_key, saved_at, payload, account_check) "
+                    "VALUES (?, ?, ?, ?)",
+                    (account_key, time.time(), payload, account_check)
+                )
+            return True
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.error("Błąd zapisu snapshotu zadań: %s", e)
+            return False
+    
+    def delete(self, account_key: str) -> None:
+        """Usuwa snapshot konta (np. przy wylogowaniu)"""
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM task_snapshots WHERE account_key = ?", (account_key,))
+        except sqlite3.Error as e:
+            logger.error("Błąd usuwania snapshotu zadań: %s", e)
+
+
+def get_snapshot_store() -> TaskSnapshotStore:
+    """
+    Zwraca magazyn snapshotów współdzielony w całym procesie
+    
+    Returns:
+        Instancja TaskSnapshotStore
+    """
+    global _shared_store
+    if _shared_store is None:
+        with _shared_store_lock:
+            if _shared_store is None:
+                _shared_store = TaskSnapshotStore()
+    return _shared_store
+
+
+def revalidate_in_background(api, account_key: str) -> Future:
+    """
+    Pobiera świeże zadania w tle i zapisuje je jako nowy snapshot
+    
+    Pobieranie odbywa się przez wspólny cache zadań - jeśli inna sesja tego
+    konta właśnie pobiera zadania, wątek czeka na jej wynik zamiast pobierać
+    je drugi raz. Wątek nie dotyka st.session_state - wynik odbiera aplikacja z Future.
+    
+    Args:
+        api: Instancja TickTickAPI
+        account_key: Klucz konta
+    
+    Returns:
+        Future z wpisem cache (task_cache.CachedTasks)
+    """
+    requested_at = time.time()
+    
+    def _sync(current):
+        result = api.sync_tasks(TaskStore(), {})
+        # Pusta odpowiedź (np. błąd sieci) nie nadpisuje dobrego snapshotu
+        if result.tasks:
+            get_snapshot_store().save(account_key, result.tasks.to_list(), account_check_for_sync(result))
+        return result
+    
+    def _revalidate():
+        return get_task_cache().load(account_key, _sync, newer_than=requested_at)
+    
+    return _revalidation_executor.submit(_revalidate)
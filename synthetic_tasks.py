@@ -0,0 +1,158 @@
+"""
+Generator syntetycznych zadań w formacie TickTick (benchmarki i serwer testowy)
+"""
+
+import random
+import string
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional
+
+# Zestawy tagów z wagami - odwzorowują typowe konto (większość zadań bez tagów ćwiartek)
+TAG_MIX = [
+    ([], 0.35),
+    (["fast"], 0.12),
+    (["important"], 0.12),
+    (["think"], 0.08),
+    (["praca"], 0.10),
+    (["dom"], 0.07),
+    (["fast", "praca"], 0.05),
+    (["important", "think"], 0.04),
+    (["think", "dom", "zakupy"], 0.04),
+    (["important", "fast"], 0.03),
+]
+
+# Priorytety TickTick z wagami
+PRIORITY_MIX = [(0, 0.55), (1, 0.15), (3, 0.18), (5, 0.12)]
+
+_WORDS = [
+    "raport", "spotkanie", "faktura", "zakupy", "telefon", "projekt", "mail",
+    "przegląd", "plan", "prezentacja", "naprawa", "umowa", "trening", "lekarz",
+    "rachunek", "notatki", "kod", "testy", "wdrożenie", "budżet"
+]
+
+
+def _weighted_choice(rng: random.Random, mix):
+    values, weights = zip(*mix)
+    return rng.choices(values, weights=weights, k=1)[0]
+
+
+def _object_id(rng: random.Random) -> str:
+    # TickTick używa 24-znakowych identyfikatorów hex (jak ObjectId MongoDB)
+    return "%024x" % rng.getrandbits(96)
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _format_date(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+
+
+def generate_projects(count: int, seed: int = 0) -> List[Dict]:
+    """
+    Generuje listę projektów w formacie odpowiedzi /project
+    
+    Args:
+        count: Liczba projektów
+        seed: Ziarno generatora (ten sam seed = te same dane)
+    
+    Returns:
+        Lista projektów
+    """
+    rng = random.Random(f"projects-{seed}")
+    return [
+        {
+            "id": _object_id(rng),
+            "name": f"{rng.choice(_WORDS).capitalize()} {i + 1}",
+            "color": "#%06x" % rng.getrandbits(24),
+            "sortOrder": i * 1024,
+            "closed": False,
+            "groupId": None,
+            "viewMode": rng.choice(["list", "kanban"]),
+            "permission": "write",
+            "kind": "TASK"
+        }
+        for i in range(count)
+    ]
+
+
+def generate_tasks(count: int, seed: int = 0, projects: Optional[List[Dict]] = None,
+                   now: Optional[datetime] = None, completed_ratio: float = 0.15,
+                   no_due_ratio: float = 0.25, overdue_ratio: float = 0.2,
+                   content_ratio: float = 0.3, max_content_words: int = 200) -> List[Dict]:
+    """
+    Generuje zadania o kształcie odpowiedzi TickTick Open API
+    
+    Rozkłady (tagi, priorytety, daty, treść) są stałe dla danego seeda, więc
+    kolejne uruchomienia benchmarku mierzą dokładnie te same dane.
+    
+    Args:
+        count: Liczba zadań
+        seed: Ziarno generatora
+        projects: Projekty, do których przypisywane są zadania (domyślnie 20 projektów)
+        now: Punkt odniesienia dla dat (domyślnie bieżąca chwila)
+        completed_ratio: Odsetek zadań wykonanych (status 2)
+        no_due_ratio: Odsetek zadań bez daty
+        overdue_ratio: Odsetek zadań z datą w przeszłości
+        content_ratio: Odsetek zadań z opisem
+        max_content_words: Maksymalna długość opisu w słowach
+    
+    Returns:
+        Lista zadań
+    """
+    rng = random.Random(f"tasks-{seed}")
+    projects = projects if projects is not None else generate_projects(20, seed)
+    now = now or datetime.now(timezone.utc)
+    tasks = []
+    
+    for _ in range(count):
+        project = rng.choice(projects)
+        task = {
+            "id": _object_id(rng),
+            "projectId": project["id"],
+            "title": _sentence(rng, rng.randint(1, 6)).capitalize(),
+            "content": "",
+            "priority": _weighted_choice(rng, PRIORITY_MIX),
+            "status": 2 if rng.random() < completed_ratio else 0,
+            "sortOrder": -rng.getrandbits(40),
+            "timeZone": "Europe/Warsaw",
+            "isAllDay": rng.random() < 0.6,
+            "tags": list(_weighted_choice(rng, TAG_MIX)),
+        }
+        
+        if rng.random() < content_ratio:
+            # Rozkład długości opisów: większość krótkich, nieliczne bardzo długie
+            words = min(max_content_words, int(rng.expovariate(1 / 25)) + 1)
+            task["content"] = _sentence(rng, words)
+        
+        roll = rng.random()
+        if roll >= no_due_ratio:
+            if roll < no_due_ratio + overdue_ratio:
+                offset = -rng.uniform(1, 90)
+            else:
+                offset = rng.gauss(3, 10)
+            due = now + timedelta(days=offset)
+            task["dueDate"] = _format_date(due)
+            task["startDate"] = task["dueDate"]
+        
+        if rng.random() < 0.15:
+            task["items"] = [
+                {
+                    "id": _object_id(rng),
+                    "title": _sentence(rng, rng.randint(1, 4)),
+                    "status": rng.choice([0, 1]),
+                    "sortOrder": i
+                }
+                for i in range(rng.randint(1, 8))
+            ]
+        
+        if "dueDate" in task and rng.random() < 0.3:
+            task["reminders"] = ["TRIGGER:PT0S"]
+        
+        if rng.random() < 0.05:
+            task["desc"] = "".join(rng.choices(string.ascii_letters + " ", k=rng.randint(10, 200)))
+        
+        tasks.append(task)
+    
+    return tasks
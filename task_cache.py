@@ -0,0 +1,268 @@
+"""
+Wspólny cache zadań w pamięci procesu - jedna kopia danych i jedno odświeżenie na konto
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import TASK_CACHE_MAX_BYTES, TASK_CACHE_TTL
+from task_model import Task
+from task_store import TaskStore
+from ticktick_api import SyncResult
+
+logger = logging.getLogger(__name__)
+
+_shared_cache: Optional["SharedTaskCache"] = None
+_shared_cache_lock = threading.Lock()
+
+
+@dataclass
+class CachedTasks:
+    """Zadania konta zapamiętane w cache (magazyn współdzielony przez sesje)"""
+    tasks: TaskStore
+    sync_state: Dict[str, Tuple[str, float]]
+    failed_project_ids: List[str] = field(default_factory=list)
+    refreshed_at: float = field(default_factory=time.time)  # czas pobrania z TickTick
+    size_bytes: int = 0                                       # szacowany rozmiar w pamięci
+
+
+def estimate_size(tasks: TaskStore) -> int:
+    """
+    Szacuje rozmiar zadań w pamięci (suma task_model.Task.memory_size)
+    
+    Args:
+        tasks: Magazyn zadań
+    
+    Returns:
+        Liczba bajtów
+    """
+    return sum(task.memory_size() for task in tasks)
+
+
+class SharedTaskCache:
+    """
+    Cache zadań współdzielony przez wszystkie sesje Streamlit w procesie
+    
+    Kluczem jest skrót tokena konta (snapshot_store.account_key_for_token), więc
+    kilka kart tego samego użytkownika albo ponowne połączenie po zerwaniu
+    websocketu korzysta z tej samej kopii zadań. Wpis jest świeży przez ttl
+    sekund. Łączny szacowany rozmiar wpisów nie przekracza max_bytes - po
+    przekroczeniu usuwane są najdawniej używane konta (LRU).
+    
+    Odświeżenie (load) wykonywane jest raz dla konta - sesje, które poproszą
+    o dane w trakcie pobierania, czekają na jego wynik. Odświeżenie tworzy nowy
+    magazyn zamiast zmieniać współdzielony, dlatego sesje mogą czytać zadania
+    bez blokad. Zmiany pojedynczych zadań (upsert_task) również trafiają do
+    kopii magazynu, która zastępuje współdzielony we wpisie konta.
+    """
+    
+    def __init__(self, ttl: float = TASK_CACHE_TTL, max_bytes: int = TASK_CACHE_MAX_BYTES):
+        """
+        Inicjalizacja cache
+        
+        Args:
+            ttl: Czas w sekundach, przez który wpis uznawany jest za świeży
+            max_bytes: Budżet pamięci (suma szacowanych rozmiarów wpisów)
+        """
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedTasks]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._load_waiters: Dict[str, int] = {}   # wywołania load trzymające blokadę konta
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+    
+    def total_bytes(self) -> int:
+        """Zwraca łączny szacowany rozmiar wpisów w bajtach"""
+        with self._lock:
+            return sum(entry.size_bytes for entry in self._entries.values())
+    
+    def peek(self, account_key: str) -> Optional[CachedTasks]:
+        """
+        Zwraca wpis konta także po upływie ttl (np. do natychmiastowego wyświetlenia)
+        
+        Args:
+            account_key: Klucz konta
+        
+        Returns:
+            Wpis lub None
+        """
+        with self._lock:
+            entry = self._entries.get(account_key)
+            if entry is not None:
+                self._entries.move_to_end(account_key)
+            return entry
+    
+    def get(self, account_key: str) -> Optional[CachedTasks]:
+        """
+        Zwraca świeży wpis konta
+        
+        Args:
+            account_key: Klucz konta
+        
+        Returns:
+            Wpis młodszy niż ttl lub None
+        """
+        entry = self.peek(account_key)
+        if entry is None or time.time() - entry.refreshed_at > self.ttl:
+            return None
+        return entry
+    
+    def put(self, account_key: str, entry: CachedTasks) -> CachedTasks:
+        """
+        Zapisuje wpis konta i usuwa najdawniej używane wpisy ponad budżet pamięci
+        
+        Args:
+            account_key: Klucz konta
+            entry: Wpis do zapisania
+        
+        Returns:
+            Zapisany wpis
+        """
+        if not entry.size_bytes:
+            entry.size_bytes = estimate_size(entry.tasks)
+        with self._lock:
+            self._entries[account_key] = entry
+            self._entries.move_to_end(account_key)
+            total = sum(cached.size_bytes for cached in self._entries.values())
+            # Najnowszy wpis zostaje nawet wtedy, gdy sam przekracza budżet
+            while total > self.max_bytes and len(self._entries) > 1:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                total -= evicted.size_bytes
+                logger.info("Cache zadań: usunięto konto %s… (%d B)", evicted_key[:8], evicted.size_bytes)
+        return entry
+    
+    def load(self, account_key: str, loader: Callable[[Optional[CachedTasks]], SyncResult],
+             newer_than: Optional[float] = None) -> CachedTasks:
+        """
+        Zwraca wpis konta, pobierając zadania tylko wtedy, gdy wpis jest za stary
+        
+        Dla jednego konta pobieranie odbywa się raz naraz - wywołania równoległe
+        czekają na jego zakończenie i dostają ten sam wpis.
+        
+        Args:
+            account_key: Klucz konta
+            loader: Funkcja pobierająca zadania; dostaje dotychczasowy wpis (lub None)
+                i zwraca SyncResult z nowym magazynem (współdzielonego nie wolno zmieniać)
+            newer_than: Wpis pobrany od tej chwili (time.time()) jest wystarczający
+                (None = wpis młodszy niż ttl)
+        
+        Returns:
+            Aktualny wpis konta
+        """
+        if newer_than is None:
+            newer_than = time.time() - self.ttl
+        
+        with self._lock:
+            load_lock = self._load_locks.setdefault(account_key, threading.Lock())
+            self._load_waiters[account_key] = self._load_waiters.get(account_key, 0) + 1
+        
+        try:
+            with load_lock:
+                current = self.peek(account_key)
+                if current is not None and current.refreshed_at >= newer_than:
+                    return current
+                
+                result = loader(current)
+                if not result.tasks and current is not None:
+                    # Pusta odpowiedź (np. błąd sieci) nie nadpisuje dobrych danych
+                    return current
+                return self.put(account_key, CachedTasks(
+                    result.tasks,
+                    result.sync_state,
+                    result.failed_project_ids
+                ))
+        finally:
+            self._release_load_lock(account_key)
+    
+    def _release_load_lock(self, account_key: str) -> None:
+        # Blokada konta istnieje tylko w trakcie pobierania - bez tego słownik rósłby z każdym kontem
+        with self._lock:
+            waiters = self._load_waiters[account_key] - 1
+            if waiters:
+                self._load_waiters[account_key] = waiters
+            else:
+                del self._load_waiters[account_key]
+                del self._load_locks[account_key]
+    
+    def upsert_task(self, account_key: str, store: TaskStore, task: Dict) -> Tuple[TaskStore, Optional[Task]]:
+        """
+        Zapisuje zmienione zadanie w kopii magazynu sesji (copy-on-write)
+        
+        Magazyn sesji mogą w tym czasie czytać bez blokad inne sesje konta, więc
+        nie jest zmieniany. Jeśli sesja korzysta z magazynu z cache, kopia ze
+        zmianą zastępuje go we wpisie konta i pozostałe sesje przełączają się na
+        nią. Jeśli nie (np. wpis został w międzyczasie odświeżony), wpis konta
+        jest unieważniany, żeby kolejna sesja nie pokazała danych sprzed zmiany.
+        
+        Args:
+            account_key: Klucz konta
+            store: Magazyn zadań sesji
+            task: Zadanie po zmianie
+        
+        Returns:
+            Krotka (nowy magazyn sesji, zadanie zapisane w nim - patrz TaskStore.upsert)
+        """
+        updated, stored = self.upsert_tasks(account_key, store, [task])
+        return updated, stored[0]
+    
+    def upsert_tasks(self, account_key: str, store: TaskStore,
+                     tasks: List[Dict]) -> Tuple[TaskStore, List[Optional[Task]]]:
+        """
+        Zapisuje kilka zmienionych zadań w jednej kopii magazynu sesji (jak upsert_task)
+        
+        Args:
+            account_key: Klucz konta
+            store: Magazyn zadań sesji
+            tasks: Zadania po zmianie
+        
+        Returns:
+            Krotka (nowy magazyn sesji, zadania zapisane w nim w kolejności tasks)
+        """
+        updated = store.copy()
+        stored = [updated.upsert(task) for task in tasks]
+        with self._lock:
+            entry = self._entries.get(account_key)
+            if entry is not None:
+                if entry.tasks is store:
+                    self._entries[account_key] = replace(entry, tasks=updated)
+                else:
+                    del self._entries[account_key]
+        return updated, stored
+    
+    def invalidate(self, account_key: str) -> None:
+        """
+        Usuwa wpis konta (kolejne load pobierze zadania ponownie)
+        
+        Args:
+            account_key: Klucz konta
+        """
+        with self._lock:
+            self._entries.pop(account_key, None)
+    
+    def clear(self) -> None:
+        """Usuwa wszystkie wpisy"""
+        with self._lock:
+            self._entries.clear()
+
+
+def get_task_cache() -> SharedTaskCache:
+    """
+    Zwraca cache zadań współdzielony w całym procesie
+    
+    Returns:
+        Instancja SharedTaskCache
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = SharedTaskCache()
+    return _shared_cache
@@ -0,0 +1,143 @@
+"""
+Kolumnowa (NumPy) reprezentacja zadań - wektorowe filtrowanie i kategoryzacja
+"""
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from config import CONTEXTS, context_day_range, get_task_day, get_task_due_ts, get_today
+from quadrant_rules import get_quadrant_classifier
+
+# Kody ćwiartek w kolumnie quadrant (indeks = kod)
+QUADRANT_KEYS = ["Q1", "Q2", "Q3", "Q4"]
+
+# Wartość kolumny due_day dla zadań bez daty
+NO_DUE_DAY = -1
+
+# Status TickTick oznaczający zadanie wykonane
+STATUS_COMPLETED = 2
+
+
+class TaskColumns:
+    """
+    Zbiór zadań przechowywany jako kolumny NumPy
+    
+    Kolumny budowane są raz (np. dla danej wersji TaskStore), a filtrowanie po
+    kontekście, podział na ćwiartki i statystyki to operacje na maskach.
+    Wyniki są identyczne z filter_tasks_by_context, categorize_tasks_to_quadrants
+    i get_quadrant_stats z eisenhower_matrix.py.
+    """
+    
+    def __init__(self, tasks: Iterable[Dict]):
+        """
+        Buduje kolumny z listy zadań
+        
+        Args:
+            tasks: Zadania (lista lub TaskStore)
+        """
+        task_list = list(tasks)
+        count = len(task_list)
+        
+        self.tasks = np.empty(count, dtype=object)
+        self.tasks[:] = task_list
+        self.due_ts = np.full(count, np.nan, dtype=np.float64)
+        self.due_day = np.full(count, NO_DUE_DAY, dtype=np.int32)
+        self.status = np.zeros(count, dtype=np.int8)
+        self.priority = np.zeros(count, dtype=np.int8)
+        self.quadrant = np.zeros(count, dtype=np.int8)
+        
+        # Ćwiartki wyznaczane tymi samymi regułami co w categorize_tasks_to_quadrants
+        classifier = get_quadrant_classifier()
+        today = get_today().toordinal()
+        quadrant_codes = {key: code for code, key in enumerate(QUADRANT_KEYS)}
+        
+        for i, task in enumerate(task_list):
+            due_day = get_task_day(task)
+            if due_day is not None:
+                self.due_day[i] = due_day
+                self.due_ts[i] = get_task_due_ts(task)
+            self.status[i] = task.get("status") or 0
+            self.priority[i] = task.get("priority") or 0
+            self.quadrant[i] = quadrant_codes[classifier.classify(task, today)]
+    
+    def __len__(self) -> int:
+        return len(self.tasks)
+    
+    def context_mask(self, context_key: str) -> np.ndarray:
+        """
+        Zwraca maskę zadań pasujących do kontekstu (odpowiednik date_filter_function)
+        
+        Args:
+            context_key: Klucz kontekstu z config.CONTEXTS
+        
+        Returns:
+            Tablica bool o długości liczby zadań
+        """
+        day_range = context_day_range(context_key)
+        if day_range is None:
+            # "Wszystkie" oraz nieznane konteksty - bez filtrowania
+            return np.ones(len(self.tasks), dtype=bool)
+        
+        first_day, last_day = day_range
+        mask = self.due_day != NO_DUE_DAY
+        if first_day is not None:
+            mask &= self.due_day >= first_day
+        if last_day is not None:
+            mask &= self.due_day <= last_day
+        return mask
+    
+    def filter(self, context_key: str) -> List[Dict]:
+        """
+        Filtruje zadania według kontekstu (odpowiednik filter_tasks_by_context)
+        
+        Args:
+            context_key: Klucz kontekstu z config.CONTEXTS
+        
+        Returns:
+            Przefiltrowana lista zadań
+        """
+        return self.tasks[self.context_mask(context_key)].tolist()
+    
+    def categorize(self, context_key: str) -> Dict[str, List[Dict]]:
+        """
+        Filtruje zadania według kontekstu i dzieli je na ćwiartki w jednym kroku
+        
+        Odpowiednik categorize_tasks_to_quadrants(filter_tasks_by_context(...)).
+        
+        Args:
+            context_key: Klucz kontekstu z config.CONTEXTS
+        
+        Returns:
+            Słownik z kluczami Q1, Q2, Q3, Q4 zawierającymi listy zadań
+        """
+        mask = self.context_mask(context_key) & (self.status != STATUS_COMPLETED)
+        return {
+            key: self.tasks[mask & (self.quadrant == code)].tolist()
+            for code, key in enumerate(QUADRANT_KEYS)
+        }
+    
+    def quadrant_stats(self, context_key: str) -> Dict[str, int]:
+        """
+        Liczy zadania w ćwiartkach bez budowania list (odpowiednik get_quadrant_stats)
+        
+        Args:
+            context_key: Klucz kontekstu z config.CONTEXTS
+        
+        Returns:
+            Słownik z liczbą zadań w każdej ćwiartce
+        """
+        mask = self.context_mask(context_key) & (self.status != STATUS_COMPLETED)
+        counts = np.bincount(self.quadrant[mask], minlength=len(QUADRANT_KEYS))
+        return {key: int(counts[code]) for code, key in enumerate(QUADRANT_KEYS)}
+    
+    def bucket_by_context(self) -> Dict[str, Dict[str, List[Dict]]]:
+        """
+        Dzieli zadania na ćwiartki dla wszystkich kontekstów naraz
+        
+        Odpowiednik bucket_tasks_by_context z eisenhower_matrix.py.
+        
+        Returns:
+            Słownik {kontekst: {Q1..Q4: lista zadań}}
+        """
+        return {context_key: self.categorize(context_key) for context_key in CONTEXTS}
@@ -0,0 +1,249 @@
+"""
+Zwarty model zadania - pola czytane przez dashboard w slotach, reszta odpowiedzi API jako skompresowany JSON
+"""
+
+import json
+import sys
+import zlib
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+from config import TASK_RAW_COMPRESS_MIN_BYTES
+
+# Pola czytane przez macierz (eisenhower_matrix.py, task_columns.py), karty zadań
+# i funkcje aktualizacji - oraz wyniki config.normalize_task
+TASK_FIELDS = (
+    "id",
+    "projectId",
+    "title",
+    "content",
+    "dueDate",
+    "startDate",
+    "priority",
+    "status",
+    "tags",
+    "_due_ts",
+    "_due_day"
+)
+
+_FIELD_SET = frozenset(TASK_FIELDS)
+
+# Pola wyliczane z dueDate przez config.normalize_task - nie są częścią danych API
+DERIVED_FIELDS = ("_due_ts", "_due_day")
+
+# Pola, których wartości powtarzają się w wielu zadaniach (jedna kopia napisu w procesie)
+_INTERNED_FIELDS = frozenset(("projectId",))
+
+
+class _Missing:
+    # Znacznik pola nieobecnego w odpowiedzi API (None jest poprawną wartością pola)
+    __slots__ = ()
+    
+    def __repr__(self) -> str:
+        return "<brak>"
+
+
+_MISSING = _Missing()
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _compact(key: str, value: Any) -> Any:
+    # Tagi powtarzają się w tysiącach zadań - krotka internowanych napisów zamiast listy
+    if key == "tags" and isinstance(value, (list, tuple)):
+        return tuple(_intern(tag) for tag in value)
+    if key in _INTERNED_FIELDS:
+        return _intern(value)
+    return value
+
+
+def _pack(extra: Dict) -> Optional[bytes]:
+    # JSON pozostałych pól; dłuższy kompresowany (zlib zaczyna się od 0x78, JSON od "{")
+    if not extra:
+        return None
+    encoded = json.dumps(extra, ensure_ascii=False, separators=(",", ":")).encode()
+    if len(encoded) >= TASK_RAW_COMPRESS_MIN_BYTES:
+        return zlib.compress(encoded)
+    return encoded
+
+
+def _unpack(raw: Optional[bytes]) -> Dict:
+    if raw is None:
+        return {}
+    if raw[:1] != b"{":
+        raw = zlib.decompress(raw)
+    return json.loads(raw)
+
+
+class Task(MutableMapping):
+    """
+    Zadanie TickTick w zwartej postaci
+    
+    Pola z TASK_FIELDS przechowywane są w slotach (bez słownika na obiekt),
+    tagi jako krotka internowanych napisów. Pozostałe pola odpowiedzi API
+    (np. items, reminders, sortOrder) nie są potrzebne do wyświetlania - trzymane
+    są jako JSON (skompresowany, jeśli jest długi) i rozpakowywane dopiero przy
+    odczycie, np. przy budowaniu treści aktualizacji (build_task_update_payload).
+    
+    Obiekt zachowuje się jak słownik zadania (get, [], in, ==, dict(task), {**task}),
+    więc filtry, sortowanie i funkcje API działają bez zmian. Pełną odpowiedź
+    API (do zapisu w snapshocie) zwraca to_dict.
+    
+    Pola z DERIVED_FIELDS zawsze odpowiadają bieżącemu dueDate: konstruktor
+    pomija je w danych wejściowych (mogą pochodzić z kopii sprzed zmiany daty),
+    a zmiana dueDate je usuwa - TaskStore wylicza je ponownie.
+    """
+    
+    __slots__ = TASK_FIELDS + ("_raw",)
+    
+    def __init__(self, data: Mapping = ()):
+        """
+        Tworzy zadanie z danych API
+        
+        Args:
+            data: Słownik z danymi zadania (np. odpowiedź TickTick API lub wpis snapshotu)
+        """
+        for key in TASK_FIELDS:
+            setattr(self, key, _MISSING)
+        extra = {}
+        for key, value in dict(data).items():
+            if key in DERIVED_FIELDS:
+                continue
+            if key in _FIELD_SET:
+                setattr(self, key, _compact(key, value))
+            else:
+                extra[key] = value
+        self._raw = _pack(extra)
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            if value is _MISSING:
+                raise KeyError(key)
+            return value
+        return _unpack(self._raw)[key]
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            return default if value is _MISSING else value
+        return _unpack(self._raw).get(key, default)
+    
+    def __contains__(self, key: object) -> bool:
+        if key in _FIELD_SET:
+            return getattr(self, key) is not _MISSING
+        return key in _unpack(self._raw)
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _FIELD_SET:
+            setattr(self, key, _compact(key, value))
+            if key == "dueDate":
+                self._forget_due()
+            return
+        extra = _unpack(self._raw)
+        extra[key] = value
+        self._raw = _pack(extra)
+    
+    def __delitem__(self, key: str) -> None:
+        if key in _FIELD_SET:
+            if getattr(self, key) is _MISSING:
+                raise KeyError(key)
+            setattr(self, key, _MISSING)
+            if key == "dueDate":
+                self._forget_due()
+            return
+        extra = _unpack(self._raw)
+        del extra[key]
+        self._raw = _pack(extra)
+    
+    def __iter__(self) -> Iterator[str]:
+        for key in TASK_FIELDS:
+            if getattr(self, key) is not _MISSING:
+                yield key
+        yield from _unpack(self._raw)
+    
+    def __len__(self) -> int:
+        present = sum(1 for key in TASK_FIELDS if getattr(self, key) is not _MISSING)
+        return present + len(_unpack(self._raw))
+    
+    def __repr__(self) -> str:
+        return f"Task(id={self.get('id')!r}, title={self.get('title')!r})"
+    
+    def __eq__(self, other: object) -> bool:
+        # Porównanie jak słowników - tagi w postaci listy, więc Task(d) == d
+        if isinstance(other, Task):
+            other = other.to_dict()
+        elif isinstance(other, Mapping):
+            other = {key: list(value) if key == "tags" and isinstance(value, tuple) else value
+                     for key, value in other.items()}
+        else:
+            return NotImplemented
+        return self.to_dict() == other
+    
+    __hash__ = None  # zmienny, jak dict
+    
+    def __reduce__(self):
+        return Task, (self.to_dict(),)
+    
+    def _forget_due(self) -> None:
+        # Wartości z normalize_task dotyczą poprzedniej daty
+        for key in DERIVED_FIELDS:
+            setattr(self, key, _MISSING)
+    
+    def copy(self) -> "Task":
+        """Zwraca kopię zadania (pola dodatkowe pozostają spakowane, bez ponownego kodowania)"""
+        task = Task.__new__(Task)
+        for key in self.__slots__:
+            setattr(task, key, getattr(self, key))
+        return task
+    
+    def to_dict(self) -> Dict:
+        """
+        Zwraca pełne dane zadania jako słownik (np. do zapisu w snapshocie)
+        
+        Returns:
+            Słownik z polami odpowiedzi API (tagi jako lista)
+        """
+        data = {}
+        for key in TASK_FIELDS:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                data[key] = list(value) if key == "tags" and isinstance(value, tuple) else value
+        data.update(_unpack(self._raw))
+        return data
+    
+    def memory_size(self) -> int:
+        """
+        Szacuje pamięć zajmowaną przez zadanie (obiekt, napisy pól i spakowane pola dodatkowe)
+        
+        Napisy internowane (tagi, ID projektu) są współdzielone przez zadania, więc nie są liczone.
+        
+        Returns:
+            Liczba bajtów
+        """
+        size = sys.getsizeof(self)
+        for key in ("id", "title", "content", "dueDate", "startDate"):
+            value = getattr(self, key)
+            if isinstance(value, str):
+                size += sys.getsizeof(value)
+        tags = self.tags
+        if isinstance(tags, tuple):
+            size += sys.getsizeof(tags)
+        if self._raw is not None:
+            size += sys.getsizeof(self._raw)
+        return size
+
+
+def as_task(task: Mapping) -> Task:
+    """
+    Zwraca zadanie w zwartej postaci (Task bez zmian, słownik - po konwersji)
+    
+    Args:
+        task: Słownik z danymi zadania lub Task
+    
+    Returns:
+        Obiekt Task
+    """
+    return task if isinstance(task, Task) else Task(task)
@@ -0,0 +1,230 @@
+"""
+Magazyn zadań indeksowany po ID zadania i ID projektu
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from config import context_day_range, normalize_task
+from due_index import DueDateIndex
+from task_model import DERIVED_FIELDS, Task
+
+
+class TaskStore:
+    """
+    Kolekcja zadań z dostępem O(1) po ID zadania i po ID projektu
+    
+    Jedyne miejsce, w którym dashboard, filtry i funkcje pomocnicze API
+    odczytują i zapisują zadania. Kolejność iteracji odpowiada kolejności
+    dodawania zadań (podmiana zadania nie zmienia jego pozycji).
+    Licznik version rośnie przy każdej zmianie, co pozwala unieważniać
+    wyniki wyliczone na podstawie magazynu. Każde dodawane zadanie jest
+    normalizowane (config.normalize_task), więc data terminu parsowana jest
+    tylko raz, i przechowywane w zwartej postaci (task_model.Task) - pola,
+    których dashboard nie czyta, nie zajmują pamięci sesji jako słowniki.
+    Zadania przechowywane w magazynie nie są zmieniane, więc ten sam obiekt
+    może należeć do kilku magazynów (np. kopii po synchronizacji).
+    Indeks terminów (due_index) budowany jest przy pierwszym użyciu i dalej
+    aktualizowany przy każdej zmianie.
+    """
+    
+    def __init__(self, tasks: Iterable[Dict] = ()):
+        """
+        Inicjalizacja magazynu
+        
+        Args:
+            tasks: Początkowa lista zadań
+        """
+        self._tasks: Dict[str, Task] = {}
+        # Zbiór ID zadań dla projektu (dict jako uporządkowany zbiór)
+        self._by_project: Dict[str, Dict[str, None]] = {}
+        self._due_index: Optional[DueDateIndex] = None
+        # Numer kolejny dodania zadania (kolejność iteracji) - do porządkowania wyników indeksu
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        self.version = 0
+        for task in tasks:
+            self.upsert(task)
+    
+    def __len__(self) -> int:
+        return len(self._tasks)
+    
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._tasks.values())
+    
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._tasks
+    
+    def copy(self) -> "TaskStore":
+        """
+        Zwraca kopię magazynu (te same obiekty zadań, osobne indeksy)
+        
+        Kopię można zmieniać, gdy oryginał czytają inne sesje (copy-on-write
+        w SharedTaskCache.upsert_task). Licznik version jest zachowany.
+        
+        Returns:
+            Nowy TaskStore
+        """
+        store = TaskStore()
+        store._tasks = dict(self._tasks)
+        store._by_project = {project_id: dict(task_ids) for project_id, task_ids in self._by_project.items()}
+        if self._due_index is not None:
+            store._due_index = self._due_index.copy()
+        store._order = dict(self._order)
+        store._next_order = self._next_order
+        store.version = self.version
+        return store
+    
+    @property
+    def due_index(self) -> DueDateIndex:
+        """Indeks zadań według terminu (patrz due_index.DueDateIndex)"""
+        if self._due_index is None:
+            self._due_index = DueDateIndex(self._tasks.values())
+        return self._due_index
+    
+    def context(self, context_key: str) -> List[Task]:
+        """
+        Zwraca zadania pasujące do kontekstu daty (zapytanie do indeksu terminów)
+        
+        Wynik jest w kolejności magazynu - tej samej, co przy filtrowaniu listy
+        zadań (eisenhower_matrix.filter_tasks_by_context).
+        
+        Args:
+            context_key: Klucz kontekstu z config.CONTEXTS
+        
+        Returns:
+            Lista zadań
+        """
+        if context_day_range(context_key) is None:
+            return list(self._tasks.values())
+        order = self._order
+        return sorted(self.due_index.context(context_key), key=lambda task: order[task["id"]])
+    
+    def get(self, task_id: str) -> Optional[Task]:
+        """
+        Zwraca zadanie o podanym ID
+        
+        Args:
+            task_id: ID zadania
+        
+        Returns:
+            Zadanie lub None
+        """
+        return self._tasks.get(task_id)
+    
+    def upsert(self, task: Dict) -> Optional[Task]:
+        """
+        Dodaje nowe zadanie lub podmienia istniejące o tym samym ID
+        
+        Słownik zamieniany jest na Task i normalizowany (config.normalize_task).
+        Task z wyliczonym terminem (np. z innego magazynu) zapisywany jest bez
+        zmian, a Task bez niego - jako znormalizowana kopia (przekazany obiekt
+        nie jest zmieniany).
+        
+        Args:
+            task: Słownik z danymi zadania lub Task (musi mieć pole "id")
+        
+        Returns:
+            Zapisane zadanie (obiekt przechowywany w magazynie) lub None bez ID
+        """
+        task_id = task.get("id")
+        if not task_id:
+            return None
+        
+        if not isinstance(task, Task):
+            task = normalize_task(Task(task))
+        elif "_due_ts" not in task:
+            task = normalize_task(task.copy())
+        previous = self._tasks.get(task_id)
+        if previous is not None and previous.get("projectId") != task.get("projectId"):
+            self._unindex(task_id, previous.get("projectId"))
+        
+        if previous is None:
+            self._order[task_id] = self._next_order
+            self._next_order += 1
+        self._tasks[task_id] = task
+        self._by_project.setdefault(task.get("projectId"), {})[task_id] = None
+        if self._due_index is not None:
+            self._due_index.add(task)
+        self.version += 1
+        return task
+    
+    def delete(self, task_id: str) -> Optional[Task]:
+        """
+        Usuwa zadanie
+        
+        Args:
+            task_id: ID zadania
+        
+        Returns:
+            Usunięte zadanie lub None jeśli nie istniało
+        """
+        task = self._tasks.pop(task_id, None)
+        if task is not None:
+            del self._order[task_id]
+            self._unindex(task_id, task.get("projectId"))
+            if self._due_index is not None:
+                self._due_index.remove(task_id)
+            self.version += 1
+        return task
+    
+    def project_tasks(self, project_id: str) -> List[Task]:
+        """
+        Zwraca zadania projektu
+        
+        Args:
+            project_id: ID projektu
+        
+        Returns:
+            Lista zadań projektu
+        """
+        return [self._tasks[task_id] for task_id in self._by_project.get(project_id, ())]
+    
+    def project_ids(self) -> List[str]:
+        """Zwraca ID projektów, dla których magazyn trzyma zadania"""
+        return list(self._by_project)
+    
+    def replace_project(self, project_id: str, tasks: Iterable[Dict]) -> None:
+        """
+        Podmienia wszystkie zadania projektu
+        
+        Args:
+            project_id: ID projektu
+            tasks: Nowa lista zadań projektu
+        """
+        self.delete_project(project_id)
+        for task in tasks:
+            self.upsert(task)
+    
+    def delete_project(self, project_id: str) -> None:
+        """
+        Usuwa wszystkie zadania projektu
+        
+        Args:
+            project_id: ID projektu
+        """
+        task_ids = self._by_project.pop(project_id, {})
+        for task_id in task_ids:
+            self._tasks.pop(task_id, None)
+            self._order.pop(task_id, None)
+            if self._due_index is not None:
+                self._due_index.remove(task_id)
+        if task_ids:
+            self.version += 1
+    
+    def to_list(self) -> List[Dict]:
+        """Zwraca dane zadań z API jako listę słowników (np. do zapisu w snapshocie, bez pól wyliczanych)"""
+        tasks = []
+        for task in self._tasks.values():
+            data = task.to_dict()
+            for key in DERIVED_FIELDS:
+                data.pop(key, None)
+            tasks.append(data)
+        return tasks
+    
+    def _unindex(self, task_id: str, project_id: Optional[str]) -> None:
+        project_index = self._by_project.get(project_id)
+        if project_index is None:
+            return
+        project_index.pop(task_id, None)
+        if not project_index:
+            del self._by_project[project_id]
@@ -0,0 +1,39 @@
+"""
+Testy filtrowania i podziału zadań (eisenhower_matrix.py)
+"""
+
+import random
+from datetime import timedelta
+
+import pytest
+
+from config import CONTEXTS, get_today
+from eisenhower_matrix import filter_tasks_by_context
+from task_store import TaskStore
+
+
+def make_tasks(count=200, seed=7):
+    rng = random.Random(seed)
+    today = get_today()
+    tasks = []
+    for i in range(count):
+        task = {"id": f"t{i}", "projectId": f"p{i % 5}", "title": f"Zadanie {i}"}
+        if rng.random() < 0.8:
+            day = today + timedelta(days=rng.randint(-10, 10))
+            task["dueDate"] = f"{day.isoformat()}T{rng.randint(0, 23):02d}:00:00.000+0000"
+        tasks.append(task)
+    return tasks
+
+
+@pytest.mark.parametrize("context_key", list(CONTEXTS))
+def test_store_and_list_give_same_order(context_key):
+    tasks = make_tasks()
+    store = TaskStore(tasks)
+    # Podmiana zachowuje pozycję, usunięcie i ponowne dodanie przenosi na koniec
+    store.upsert({**tasks[3], "title": "zmienione"})
+    store.delete("t4")
+    store.upsert(tasks[4])
+    
+    expected = [task["id"] for task in filter_tasks_by_context(list(store), context_key)]
+    assert [task["id"] for task in filter_tasks_by_context(store, context_key)] == expected
+    assert [task["id"] for task in filter_tasks_by_context(store.copy(), context_key)] == expected
@@ -0,0 +1,159 @@
+"""
+Testy klienta API, kolejki zapisów, cache i snapshotów na lokalnym serwerze TickTick (fake_ticktick_server.py)
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import fake_ticktick_server
+import snapshot_store
+from diagnostics import get_request_metrics
+from fake_ticktick_server import EndpointProfile, FakeServerConfig, FakeTickTickServer
+from rate_limiter import RequestScheduler
+from task_cache import SharedTaskCache
+from task_store import TaskStore
+from ticktick_api import TickTickAPI
+from token_manager import TokenManager
+from write_queue import WriteBehindQueue, date_write, tags_write
+
+
+class ScriptedRandom:
+    """Zastępuje moduł random serwera - kolejne losowania błędów z listy (potem brak błędu)"""
+    
+    def __init__(self, rolls):
+        self.rolls = list(rolls)
+    
+    def random(self):
+        return self.rolls.pop(0) if self.rolls else 1.0
+    
+    def uniform(self, low, high):
+        return 0.0
+    
+    def choice(self, values):
+        return values[0]
+
+
+@pytest.fixture
+def server():
+    with FakeTickTickServer(FakeServerConfig(projects=4, tasks=40)) as fake_server:
+        yield fake_server
+
+
+def make_api(server, **kwargs):
+    # Osobny harmonogram - pauza po 429 nie przechodzi na kolejne testy
+    api = TickTickAPI("tok", scheduler=RequestScheduler(rate=100, burst=10), **kwargs)
+    api.base_url = server.base_url
+    return api
+
+
+def script_errors(monkeypatch, server, endpoint, profile, rolls):
+    server.httpd.config.profiles[endpoint] = profile
+    monkeypatch.setattr(fake_ticktick_server, "random", ScriptedRandom(rolls))
+
+
+def test_429_waits_for_retry_after_and_retries(server, monkeypatch):
+    script_errors(monkeypatch, server, "projects", EndpointProfile(rate_429=0.5, retry_after_s=0.3), [0.0])
+    api = make_api(server)
+    
+    start = time.monotonic()
+    projects = api.get_projects()
+    
+    assert len(projects) == 4
+    assert time.monotonic() - start >= 0.3
+    assert get_request_metrics().records()[-1].retries == 1
+
+
+def test_429_over_retry_after_max_fails_but_pauses_later_requests(server, monkeypatch):
+    script_errors(monkeypatch, server, "projects", EndpointProfile(rate_429=0.5, retry_after_s=5), [0.0])
+    api = make_api(server)
+    api.scheduler.retry_after_max = 1.0
+    
+    start = time.monotonic()
+    assert api.get_projects() == []
+    assert time.monotonic() - start < 1.0
+    assert api.scheduler.bucket.reserve() == pytest.approx(5.0, abs=0.2)
+
+
+def test_concurrent_401s_refresh_token_once(server):
+    server.httpd.config.require_token = "nowy"
+    calls = []
+    
+    def refresh(refresh_token):
+        calls.append(refresh_token)
+        time.sleep(0.1)
+        return {"access_token": "nowy", "expires_in": 3600}
+    
+    tokens = TokenManager("stary", refresh_token="r", refresh=refresh)
+    api = make_api(server, token_manager=tokens)
+    project_ids = [project["id"] for project in server.dataset.projects] * 2
+    try:
+        with ThreadPoolExecutor(max_workers=len(project_ids)) as pool:
+            results = list(pool.map(api.fetch_project_tasks, project_ids))
+    finally:
+        tokens.close()
+    
+    assert calls == ["r"]
+    assert sum(len(tasks) for tasks in results) == 2 * len(server.dataset.tasks)
+
+
+def test_write_queue_coalesces_changes_of_one_task(server):
+    task = dict(next(iter(server.dataset.tasks.values())))
+    write_queue = WriteBehindQueue(make_api(server), coalesce_window=0.3)
+    
+    write_queue.submit(tags_write(task, "Q1"))
+    write_queue.submit(date_write(task, "2030-01-02T10:00:00.000+0000"))
+    assert write_queue.wait(timeout=10)
+    
+    outcomes = write_queue.drain_outcomes()
+    assert len(outcomes) == 1 and outcomes[0].ok
+    assert outcomes[0].write.description == "Przeniesienie do Q1, Zmiana daty"
+    stored = server.dataset.tasks[task["id"]]
+    assert stored["dueDate"] == "2030-01-02T10:00:00.000+0000"
+    assert stored["tags"] == outcomes[0].write.changes["tags"]
+
+
+def test_write_queue_retries_transient_server_error(server, monkeypatch):
+    script_errors(monkeypatch, server, "task_update", EndpointProfile(rate_5xx=0.5), [0.0])
+    task = dict(next(iter(server.dataset.tasks.values())))
+    write_queue = WriteBehindQueue(make_api(server), retry_backoff=0.01, coalesce_window=0)
+    
+    write_queue.submit(tags_write(task, "Q2"))
+    assert write_queue.wait(timeout=10)
+    
+    [outcome] = write_queue.drain_outcomes()
+    assert outcome.ok and outcome.write.attempts == 2
+    assert server.dataset.tasks[task["id"]]["tags"] == outcome.write.changes["tags"]
+
+
+def test_cache_loads_account_once_for_concurrent_sessions(server):
+    api = make_api(server)
+    cache = SharedTaskCache()
+    calls = []
+    
+    def loader(current):
+        calls.append(current)
+        return api.sync_tasks(TaskStore(), {})
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        entries = list(pool.map(lambda _: cache.load("konto", loader), range(8)))
+    
+    assert calls == [None]
+    assert all(entry is entries[0] for entry in entries)
+    assert len(entries[0].tasks) == len(server.dataset.tasks)
+
+
+@pytest.mark.parametrize("matching", [True, False])
+def test_shared_snapshot_key_requires_matching_projects(server, monkeypatch, tmp_path, matching):
+    monkeypatch.setattr(snapshot_store, "TASK_SNAPSHOT_ACCOUNT", "konto")
+    store = snapshot_store.TaskSnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+    monkeypatch.setattr(snapshot_store, "get_snapshot_store", lambda: store)
+    project_ids = [project["id"] for project in server.dataset.projects]
+    if not matching:
+        project_ids = project_ids[1:]
+    store.save(snapshot_store.shared_account_key(), [], snapshot_store.account_check(project_ids))
+    api = make_api(server)
+    
+    expected = snapshot_store.shared_account_key() if matching else snapshot_store.account_key_for_token("tok")
+    assert snapshot_store.resolve_account_key(api) == expected
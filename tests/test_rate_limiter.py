@@ -0,0 +1,42 @@
+"""
+Testy harmonogramu żądań (rate_limiter.py)
+"""
+
+import pytest
+
+from rate_limiter import RequestScheduler, TokenBucket
+
+
+def test_reserve_spaces_requests_after_pause():
+    bucket = TokenBucket(rate=10, burst=20)
+    bucket.pause(5.0)
+    waits = [bucket.reserve() for _ in range(40)]
+    assert waits[0] == pytest.approx(5.0, abs=0.05)
+    gaps = [b - a for a, b in zip(waits, waits[1:])]
+    assert gaps == pytest.approx([0.1] * 39, abs=0.01)
+
+
+def test_shorter_pause_does_not_shorten_longer_one():
+    bucket = TokenBucket(rate=10, burst=20)
+    bucket.pause(5.0)
+    bucket.pause(1.0)
+    assert bucket.reserve() == pytest.approx(5.0, abs=0.05)
+
+
+def test_burst_is_sent_without_waiting():
+    bucket = TokenBucket(rate=10, burst=20)
+    waits = [bucket.reserve() for _ in range(21)]
+    assert all(wait == 0.0 for wait in waits[:20])
+    assert waits[20] == pytest.approx(0.1, abs=0.01)
+
+
+def test_retry_after_is_honored_beyond_backoff_max():
+    scheduler = RequestScheduler(backoff_max=30.0, retry_after_max=120.0)
+    assert scheduler._retry_delay(429, "60", 0, idempotent=False) == 60.0
+    assert scheduler.bucket.reserve() == pytest.approx(60.0, abs=0.05)
+
+
+def test_retry_after_over_limit_fails_request_but_pauses_bucket():
+    scheduler = RequestScheduler(retry_after_max=120.0)
+    assert scheduler._retry_delay(429, "600", 0, idempotent=True) is None
+    assert scheduler.bucket.reserve() == pytest.approx(600.0, abs=0.05)
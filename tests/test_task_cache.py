@@ -0,0 +1,38 @@
+"""
+Testy wspólnego cache zadań (task_cache.py)
+"""
+
+from task_cache import CachedTasks, SharedTaskCache
+from task_store import TaskStore
+
+
+def make_store():
+    return TaskStore([
+        {"id": "a", "projectId": "p", "title": "A", "dueDate": "2026-10-20T10:00:00.000+0000"},
+        {"id": "b", "projectId": "p", "title": "B"},
+    ])
+
+
+def test_upsert_task_copies_shared_store():
+    cache = SharedTaskCache()
+    store = make_store()
+    store.due_index  # indeks zbudowany - kopia musi go skopiować, a nie zmieniać
+    cache.put("konto", CachedTasks(store, {}))
+    
+    updated, stored = cache.upsert_task("konto", store, {"id": "a", "projectId": "p", "title": "A2"})
+    
+    assert store.get("a")["title"] == "A"
+    assert [task["id"] for task in store.due_index.between_ts(float("-inf"), float("inf"))] == ["a"]
+    assert updated.get("a") is stored and stored["title"] == "A2"
+    assert updated.due_index.between_ts(float("-inf"), float("inf")) == []
+    assert cache.peek("konto").tasks is updated
+
+
+def test_upsert_task_from_stale_store_invalidates_entry():
+    cache = SharedTaskCache()
+    cache.put("konto", CachedTasks(make_store(), {}))
+    
+    updated, _ = cache.upsert_task("konto", make_store(), {"id": "b", "projectId": "p", "title": "B2"})
+    
+    assert updated.get("b")["title"] == "B2"
+    assert cache.peek("konto") is None
@@ -0,0 +1,23 @@
+"""
+Testy kolumnowej reprezentacji zadań (task_columns.py)
+"""
+
+from config import CONTEXTS
+from eisenhower_matrix import categorize_tasks_to_quadrants, filter_tasks_by_context, get_quadrant_stats
+from task_columns import TaskColumns
+
+
+def test_null_status_and_priority_are_treated_as_zero():
+    # API potrafi zwrócić jawne null zamiast pominąć pole
+    tasks = [
+        {"id": "a", "projectId": "p", "status": None, "priority": None},
+        {"id": "b", "projectId": "p", "status": 0, "priority": 5},
+    ]
+    columns = TaskColumns(tasks)
+    
+    assert columns.status.tolist() == [0, 0]
+    assert columns.priority.tolist() == [0, 5]
+    for context_key in CONTEXTS:
+        assert columns.quadrant_stats(context_key) == get_quadrant_stats(
+            categorize_tasks_to_quadrants(filter_tasks_by_context(tasks, context_key))
+        )
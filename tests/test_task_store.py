@@ -0,0 +1,63 @@
+"""
+Testy magazynu zadań (task_store.py) i wyliczania terminu (config.normalize_task)
+"""
+
+from config import get_task_day
+from eisenhower_matrix import sort_tasks_by_deadline
+from task_model import Task
+from task_store import TaskStore
+
+DUE = "2026-10-20T22:30:00.000+0000"
+
+
+def test_copying_store_reuses_normalized_tasks():
+    store = TaskStore([{"id": "a", "projectId": "p", "dueDate": DUE}])
+    task = store.get("a")
+    
+    copy = TaskStore(store)
+    
+    assert copy.get("a") is task
+    assert task["_due_day"] == get_task_day({"dueDate": DUE})
+
+
+def test_upsert_does_not_mutate_passed_task():
+    task = Task({"id": "a", "projectId": "p", "dueDate": DUE})
+    
+    stored = TaskStore().upsert(task)
+    
+    assert "_due_ts" not in task
+    assert stored is not task and stored["_due_ts"] is not None
+
+
+def test_changed_due_date_is_normalized_again():
+    store = TaskStore([{"id": "a", "projectId": "p", "dueDate": DUE}])
+    stale = {**store.get("a").to_dict(), "dueDate": "2026-10-25T10:00:00.000+0000"}
+    
+    stored = store.upsert(stale)
+    
+    assert stored["_due_day"] == get_task_day({"dueDate": "2026-10-25T10:00:00.000+0000"})
+    assert stored["_due_day"] != get_task_day({"dueDate": DUE})
+
+
+def test_setting_due_date_drops_derived_fields():
+    task = TaskStore([{"id": "a", "projectId": "p", "dueDate": DUE}]).get("a").copy()
+    
+    task["dueDate"] = "2026-10-25T10:00:00.000+0000"
+    
+    assert "_due_ts" not in task and "_due_day" not in task
+
+
+def test_helpers_do_not_write_into_raw_tasks():
+    tasks = [{"id": "a", "dueDate": DUE}, {"id": "b", "dueDate": "2026-10-19T10:00:00.000+0000"}]
+    
+    get_task_day(tasks[0])
+    sorted_tasks = sort_tasks_by_deadline(tasks)
+    
+    assert [task["id"] for task in sorted_tasks] == ["b", "a"]
+    assert all("_due_ts" not in task and "_due_day" not in task for task in tasks)
+
+
+def test_to_list_omits_derived_fields():
+    store = TaskStore([{"id": "a", "projectId": "p", "dueDate": DUE}])
+    
+    assert store.to_list() == [{"id": "a", "projectId": "p", "dueDate": DUE}]
@@ -3,68 +3,467 @@ Moduł komunikacji z TickTick Open API
 """
 
 import requests
-from typing import List, Dict, Optional
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+from typing import Callable, Iterator, List, Dict, Optional, Tuple, TypeVar
 import os
 from dotenv import load_dotenv
-from config import TICKTICK_API_BASE_URL
+from task_store import TaskStore
+from task_model import Task
+from diagnostics import RequestRecord, get_request_metrics
+from rate_limiter import RequestScheduler, get_request_scheduler
+from quadrant_rules import get_quadrant_classifier
+from token_manager import TokenManager
+from config import (
+    TICKTICK_API_BASE_URL,
+    TICKTICK_FETCH_WORKERS,
+    TICKTICK_POOL_CONNECTIONS,
+    TICKTICK_POOL_SIZE,
+    TICKTICK_SYNC_MAX_AGE,
+    TICKTICK_WRITE_WORKERS
+)
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
+
+def create_http_session(pool_connections: int = TICKTICK_POOL_CONNECTIONS,
+                        pool_size: int = TICKTICK_POOL_SIZE) -> requests.Session:
+    """
+    Tworzy sesję HTTP z pulą połączeń keep-alive
+    
+    Sesja nie przechowuje ciasteczek ani nagłówków autoryzacji, dzięki czemu
+    może być bezpiecznie współdzielona przez klientów różnych użytkowników.
+    
+    Args:
+        pool_connections: Liczba pul połączeń (hostów) trzymanych w pamięci
+        pool_size: Maksymalna liczba połączeń do jednego hosta
+        
+    Returns:
+        Skonfigurowana sesja requests
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_shared_session() -> requests.Session:
+    """
+    Zwraca sesję HTTP współdzieloną w całym procesie (tworzoną przy pierwszym użyciu)
+    
+    Dzięki temu kolejne odświeżenia, reruny Streamlit i sesje różnych przeglądarek
+    korzystają z tych samych, już zestawionych połączeń TLS.
+    
+    Returns:
+        Współdzielona sesja requests
+    """
+    global _shared_session
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                _shared_session = create_http_session()
+    return _shared_session
+
+
+@dataclass
+class SyncResult:
+    """Wynik synchronizacji przyrostowej (TickTickAPI.sync_tasks)"""
+    tasks: TaskStore                          # zaktualizowany magazyn zadań
+    sync_state: Dict[str, Tuple[str, float]]  # {project_id: (odcisk, czas pobrania)}
+    changed_project_ids: List[str]            # projekty pobrane ponownie
+    failed_project_ids: List[str]             # projekty, których nie udało się pobrać
+
+
+@dataclass
+class TaskFetchResult:
+    """Wynik pobrania wszystkich zadań (TickTickAPI.get_tasks_with_failures)"""
+    tasks: List[Dict]                # zadania projektów pobranych poprawnie
+    failed_project_ids: List[str]    # projekty, których nie udało się pobrać
+
+
+@dataclass
+class BulkMoveResult:
+    """Wynik przenoszenia wielu zadań (move_tasks_to_quadrant)"""
+    target_quadrant: str
+    moved: List[Dict]                # zaktualizowane zadania (odpowiedzi API)
+    failed: List[Tuple[Dict, str]]   # (oryginalne zadanie, opis błędu)
+
+
+def project_fingerprint(project: Dict) -> str:
+    """
+    Wylicza odcisk projektu z listy /project
+    
+    Jeśli API zwraca znacznik modyfikacji (modifiedTime / etag), używany jest on
+    bezpośrednio. W przeciwnym razie odciskiem jest skrót treści wpisu projektu.
+    
+    Args:
+        project: Słownik z danymi projektu
+        
+    Returns:
+        Odcisk projektu jako string
+    """
+    for key in ("modifiedTime", "etag"):
+        if project.get(key):
+            return f"{key}:{project[key]}"
+    content = json.dumps(project, sort_keys=True, ensure_ascii=False)
+    return "sha1:" + hashlib.sha1(content.encode()).hexdigest()
+
+
+def auth_headers(access_token: Optional[str]) -> Dict[str, str]:
+    """
+    Zwraca nagłówki żądania do TickTick API z podanym tokenem
+    
+    Args:
+        access_token: Token dostępu
+    
+    Returns:
+        Słownik nagłówków HTTP
+    """
+    return {
+        "Authorization": f"Bearer {access_token}",
+        "Content-Type": "application/json"
+    }
+
 
 class TickTickAPI:
     """Klasa obsługująca połączenie z TickTick API"""
     
-    def __init__(self, access_token: Optional[str] = None):
+    def __init__(self, access_token: Optional[str] = None, max_workers: int = TICKTICK_FETCH_WORKERS,
+                 session: Optional[requests.Session] = None,
+                 scheduler: Optional[RequestScheduler] = None,
+                 token_manager: Optional[TokenManager] = None):
         """
         Inicjalizacja klienta API
         
         Args:
             access_token: Token dostępu (jeśli None, pobiera z .env)
+            max_workers: Domyślna liczba wątków przy pobieraniu zadań z projektów
+            session: Sesja HTTP (jeśli None, używa współdzielonej puli połączeń)
+            scheduler: Harmonogram żądań (jeśli None, używa współdzielonego w procesie)
+            token_manager: Menedżer tokenu odświeżający go w tle (jeśli None,
+                token z access_token jest używany bez odświeżania)
         """
-        self.access_token = access_token or os.getenv("TICKTICK_ACCESS_TOKEN")
+        self.tokens = token_manager or TokenManager(access_token or os.getenv("TICKTICK_ACCESS_TOKEN"))
         self.base_url = TICKTICK_API_BASE_URL
-        self.headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        self.max_workers = max_workers
+        self.session = session or get_shared_session()
+        self.scheduler = scheduler or get_request_scheduler()
+    
+    @property
+    def access_token(self) -> Optional[str]:
+        """Aktualny token dostępu (po odświeżeniu - nowy)"""
+        return self.tokens.access_token
+    
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Nagłówki żądań z aktualnym tokenem dostępu"""
+        return auth_headers(self.tokens.access_token)
     
     def is_configured(self) -> bool:
         """Sprawdza czy API jest poprawnie skonfigurowane"""
         return bool(self.access_token and self.access_token != "your_access_token_here")
     
-    def get_tasks(self) -> List[Dict]:
+    def _request(self, method: str, endpoint: str, path_params: Optional[Dict[str, str]] = None,
+                 idempotent: Optional[bool] = None, **kwargs) -> requests.Response:
+        """
+        Wysyła żądanie do API, mierząc je (endpoint, status, czas, rozmiar odpowiedzi)
+        
+        Wszystkie metody klienta wysyłają żądania przez tę funkcję, więc pomiary
+        trafiają do diagnostics.get_request_metrics() i do logów (poziom DEBUG).
+        Żądania przechodzą przez harmonogram (limit szybkości, Retry-After,
+        ponowienia - patrz rate_limiter.RequestScheduler). Po odpowiedzi 401
+        token jest odświeżany (TokenManager) i żądanie ponawiane raz.
+        
+        Args:
+            method: Metoda HTTP (GET, POST)
+            endpoint: Szablon ścieżki, np. "/project/{project_id}/data"
+            path_params: Wartości wstawiane do szablonu ścieżki
+            idempotent: Czy żądanie można ponowić po 5xx / błędzie sieci (None = tylko GET)
+            **kwargs: Dodatkowe argumenty requests (np. json, timeout)
+            
+        Returns:
+            Odpowiedź z poprawnym statusem
+            
+        Raises:
+            requests.exceptions.RequestException: W przypadku błędu sieci lub statusu HTTP
+        """
+        url = self.base_url + endpoint.format(**(path_params or {}))
+        kwargs.setdefault("timeout", 10)
+        if idempotent is None:
+            idempotent = method == "GET"
+        # Odświeżanie w tle nie zdążyło (np. uśpiony komputer) - odśwież przed wysłaniem
+        self.tokens.refresh_if_expired()
+        response = None
+        retries = 0
+        start = time.perf_counter()
+        try:
+            for attempt in range(2):
+                token = self.tokens.access_token
+                response, sent_retries = self.scheduler.call(
+                    lambda: self.session.request(method, url, headers=auth_headers(token), **kwargs),
+                    idempotent,
+                    (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+                )
+                retries += sent_retries
+                if response.status_code != 401 or attempt or not self.tokens.handle_unauthorized(token):
+                    break
+                retries += 1
+            response.raise_for_status()
+            return response
+        finally:
+            record = RequestRecord(
+                method,
+                endpoint,
+                response.status_code if response is not None else None,
+                time.perf_counter() - start,
+                len(response.content) if response is not None else 0,
+                retries
+            )
+            get_request_metrics().record(record)
+            logger.log(
+                logging.DEBUG if record.ok else logging.WARNING,
+                "%s %s -> %s (%.1f ms, %d B, ponowienia: %d)",
+                method, endpoint, record.status or "brak odpowiedzi", record.latency_s * 1000,
+                record.size_bytes, record.retries
+            )
+    
+    def get_tasks(self, max_workers: Optional[int] = None) -> List[Dict]:
         """
         Pobiera wszystkie zadania z TickTick (ze wszystkich projektów)
         
+        Projekty są pobierane równolegle w puli wątków. Kolejność zadań w wyniku
+        jest zawsze zgodna z kolejnością projektów zwróconą przez API. Projekty,
+        których nie udało się pobrać, są pomijane - listę takich projektów
+        zwraca get_tasks_with_failures.
+        
+        Args:
+            max_workers: Liczba równoległych wątków (None = TICKTICK_FETCH_WORKERS,
+                1 = pobieranie sekwencyjne)
+        
+        Returns:
+            Lista zadań
+        """
+        return self.get_tasks_with_failures(max_workers).tasks
+    
+    def get_tasks_with_failures(self, max_workers: Optional[int] = None) -> TaskFetchResult:
+        """
+        Pobiera wszystkie zadania i listę projektów, których nie udało się pobrać
+        
+        Działa jak get_tasks, ale błąd jednego projektu nie jest tylko pomijany -
+        jego ID trafia do failed_project_ids, żeby wywołujący wiedział, że lista
+        jest niepełna.
+        
+        Args:
+            max_workers: Liczba równoległych wątków (None = TICKTICK_FETCH_WORKERS,
+                1 = pobieranie sekwencyjne)
+        
         Returns:
-            Lista zadań w formacie JSON
+            TaskFetchResult z zadaniami i listą projektów, których nie udało się pobrać
         """
         all_tasks = []
+        failed = []
         
         try:
             # Najpierw pobierz listę projektów
             projects = self.get_projects()
             
             if not projects:
-                print("Brak projektów do pobrania")
-                return []
+                logger.info("Brak projektów do pobrania")
+                return TaskFetchResult([], [])
+            
+            projects = [project for project in projects if project.get("id")]
             
             # Następnie pobierz zadania z każdego projektu
-            for project in projects:
-                project_id = project.get("id")
-                if project_id:
-                    try:
-                        project_tasks = self.get_project_tasks(project_id)
-                        all_tasks.extend(project_tasks)
-                    except Exception as e:
-                        print(f"Błąd pobierania zadań z projektu {project.get('name', project_id)}: {e}")
-                        continue
+            results = self._map_concurrent(self._get_project_tasks_isolated, projects, max_workers)
+            
+            for project, project_tasks in zip(projects, results):
+                if project_tasks is None:
+                    failed.append(project["id"])
+                else:
+                    all_tasks.extend(project_tasks)
             
-            return all_tasks
+            return TaskFetchResult(all_tasks, failed)
             
         except requests.exceptions.RequestException as e:
-            print(f"Błąd pobierania zadań: {e}")
-            return []
+            logger.error("Błąd pobierania zadań: %s", e)
+            return TaskFetchResult([], [])
+    
+    def iter_tasks(self, max_workers: Optional[int] = None) -> Iterator[Tuple[Dict, List[Dict]]]:
+        """
+        Pobiera zadania strumieniowo - zadania projektu zwracane są, gdy tylko nadejdą
+        
+        W odróżnieniu od get_tasks nie czeka na najwolniejszy projekt, więc
+        pierwsze zadania są dostępne po czasie jednego pobrania projektu.
+        
+        Args:
+            max_workers: Liczba równoległych wątków (None = TICKTICK_FETCH_WORKERS,
+                1 = pobieranie sekwencyjne)
+        
+        Yields:
+            Krotki (projekt, lista zadań projektu) w kolejności nadejścia odpowiedzi
+            (projekt, którego nie udało się pobrać, ma None zamiast listy)
+        """
+        projects = [project for project in self.get_projects() if project.get("id")]
+        yield from self._iter_concurrent(self._get_project_tasks_isolated, projects, max_workers)
+    
+    def sync_tasks(self, store: TaskStore, sync_state: Dict[str, Tuple[str, float]],
+                   max_workers: Optional[int] = None,
+                   on_project: Optional[Callable[[Dict, List[Dict]], None]] = None) -> "SyncResult":
+        """
+        Synchronizacja przyrostowa - pobiera ponownie tylko projekty, które się zmieniły
+        
+        Dla każdego projektu z listy /project wyliczany jest odcisk (patrz
+        project_fingerprint). Projekt jest pobierany, gdy odcisk różni się od
+        zapamiętanego albo gdy ostatnie pobranie jest starsze niż
+        TICKTICK_SYNC_MAX_AGE. Zmiany są scalane bezpośrednio w magazynie zadań.
+        Projekty, których nie udało się pobrać, zachowują dotychczasowe zadania.
+        
+        Args:
+            store: Magazyn zadań do zaktualizowania (pusty = pełne pobranie)
+            sync_state: Stan synchronizacji {project_id: (odcisk, czas pobrania)}
+                z poprzedniego wywołania (pusty słownik = pełne pobranie)
+            max_workers: Liczba równoległych wątków (None = TICKTICK_FETCH_WORKERS)
+            on_project: Funkcja wywoływana (w wątku wywołującym) z zadaniami każdego
+                pobranego projektu, gdy tylko nadejdą - np. do stopniowego wyświetlania.
+                Magazyn jest aktualizowany dopiero po pobraniu wszystkich projektów.
+            
+        Returns:
+            SyncResult z zaktualizowanym magazynem i nowym stanem synchronizacji
+        """
+        projects = [project for project in self.get_projects() if project.get("id")]
+        if not projects:
+            # Brak listy projektów (np. błąd sieci) - nie ruszaj cache
+            return SyncResult(store, dict(sync_state), [], [])
+        
+        now = time.time()
+        fingerprints = {project["id"]: project_fingerprint(project) for project in projects}
+        changed = []
+        for project in projects:
+            project_id = project["id"]
+            previous = sync_state.get(project_id)
+            if (previous is None
+                    or previous[0] != fingerprints[project_id]
+                    or now - previous[1] > TICKTICK_SYNC_MAX_AGE):
+                changed.append(project)
+        
+        fetched = {}
+        for project, project_tasks in self._iter_concurrent(self._get_project_tasks_isolated, changed, max_workers):
+            fetched[project["id"]] = project_tasks
+            if on_project is not None and project_tasks is not None:
+                on_project(project, project_tasks)
+        # Scalanie w kolejności projektów - kolejność zadań nie zależy od czasu odpowiedzi
+        results = [fetched[project["id"]] for project in changed]
+        
+        # Zadania projektów, których nie ma już na liście, są usuwane
+        for project_id in set(store.project_ids()) - set(fingerprints):
+            store.delete_project(project_id)
+        
+        new_state = {
+            project_id: state for project_id, state in sync_state.items()
+            if project_id in fingerprints
+        }
+        changed_ids = []
+        failed = []
+        for project, project_tasks in zip(changed, results):
+            project_id = project["id"]
+            if project_tasks is None:
+                # Błąd pobierania - zostaw zadania z cache, brak stanu wymusi ponowne pobranie
+                failed.append(project_id)
+                new_state.pop(project_id, None)
+                continue
+            store.replace_project(project_id, project_tasks)
+            new_state[project_id] = (fingerprints[project_id], now)
+            changed_ids.append(project_id)
+        
+        return SyncResult(store, new_state, changed_ids, failed)
+    
+    def _map_concurrent(self, func: Callable[[Dict], T], items: List[Dict],
+                        max_workers: Optional[int] = None) -> List[T]:
+        """
+        Wywołuje func dla każdego elementu (projektu, zadania) w puli wątków, zachowując kolejność
+        
+        Args:
+            func: Funkcja wywoływana dla pojedynczego elementu
+            items: Lista elementów
+            max_workers: Liczba równoległych wątków (None = self.max_workers, 1 = sekwencyjnie)
+            
+        Returns:
+            Lista wyników w kolejności elementów
+        """
+        workers = max_workers or self.max_workers
+        workers = max(1, min(workers, len(items) or 1))
+        
+        if workers == 1:
+            return [func(item) for item in items]
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # executor.map zachowuje kolejność elementów
+            return list(executor.map(func, items))
+    
+    def _iter_concurrent(self, func: Callable[[Dict], T], items: List[Dict],
+                         max_workers: Optional[int] = None) -> Iterator[Tuple[Dict, T]]:
+        """
+        Wywołuje func dla każdego elementu w puli wątków, zwracając wyniki w kolejności ukończenia
+        
+        Args:
+            func: Funkcja wywoływana dla pojedynczego elementu
+            items: Lista elementów
+            max_workers: Liczba równoległych wątków (None = self.max_workers, 1 = sekwencyjnie)
+            
+        Yields:
+            Krotki (element, wynik), gdy tylko wynik jest gotowy
+        """
+        workers = max_workers or self.max_workers
+        workers = max(1, min(workers, len(items) or 1))
+        
+        if workers == 1:
+            for item in items:
+                yield item, func(item)
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = {executor.submit(func, item): item for item in items}
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # Przerwana iteracja nie czeka na pobrania, które jeszcze się nie zaczęły
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    def _get_project_tasks_isolated(self, project: Dict) -> Optional[List[Dict]]:
+        """
+        Pobiera zadania projektu tak, aby błąd jednego projektu nie przerywał pozostałych
+        
+        Args:
+            project: Słownik z danymi projektu
+            
+        Returns:
+            Lista zadań projektu lub None w przypadku błędu (odróżnia błąd od pustego projektu)
+        """
+        project_id = project.get("id")
+        try:
+            return self.fetch_project_tasks(project_id)
+        except Exception as e:
+            logger.error("Błąd pobierania zadań z projektu %s: %s", project.get("name", project_id), e)
+            return None
     
     def get_project_tasks(self, project_id: str) -> List[Dict]:
         """
@@ -76,14 +475,30 @@ class TickTickAPI:
         Returns:
             Lista zadań z danego projektu
         """
+        try:
+            return self.fetch_project_tasks(project_id)
+        except requests.exceptions.RequestException as e:
+            logger.error("Błąd pobierania zadań projektu: %s", e)
+            return []
+    
+    def fetch_project_tasks(self, project_id: str) -> List[Dict]:
+        """
+        Pobiera zadania z konkretnego projektu, zgłaszając błąd zamiast zwracać pustą listę
+        
+        Pozwala odróżnić projekt bez zadań od projektu, którego nie udało się pobrać.
+        
+        Args:
+            project_id: ID projektu w TickTick
+            
+        Returns:
+            Lista zadań z danego projektu
+            
+        Raises:
+            requests.exceptions.RequestException: Gdy oba endpointy zwróciły błąd
+        """
         try:
             # Pobierz szczegóły projektu, które zawierają zadania
-            response = requests.get(
-                f"{self.base_url}/project/{project_id}/data",
-                headers=self.headers,
-                timeout=10
-            )
-            response.raise_for_status()
+            response = self._request("GET", "/project/{project_id}/data", {"project_id": project_id})
             project_data = response.json()
             
             # Wyciągnij zadania z danych projektu
@@ -93,18 +508,12 @@ class TickTickAPI:
         except requests.exceptions.RequestException as e:
             # Spróbuj alternatywnego endpointa
             try:
-                response = requests.get(
-                    f"{self.base_url}/project/{project_id}",
-                    headers=self.headers,
-                    timeout=10
-                )
-                response.raise_for_status()
+                response = self._request("GET", "/project/{project_id}", {"project_id": project_id})
                 project_data = response.json()
                 tasks = project_data.get("tasks", [])
                 return tasks
-            except:
-                print(f"Błąd pobierania zadań projektu: {e}")
-                return []
+            except requests.exceptions.RequestException:
+                raise e
     
     def complete_task(self, task_id: str, project_id: str) -> bool:
         """
@@ -118,15 +527,14 @@ class TickTickAPI:
             True jeśli sukces, False w przeciwnym razie
         """
         try:
-            response = requests.post(
-                f"{self.base_url}/project/{project_id}/task/{task_id}/complete",
-                headers=self.headers,
-                timeout=10
+            self._request(
+                "POST",
+                "/project/{project_id}/task/{task_id}/complete",
+                {"project_id": project_id, "task_id": task_id}
             )
-            response.raise_for_status()
             return True
         except requests.exceptions.RequestException as e:
-            print(f"Błąd oznaczania zadania jako wykonane: {e}")
+            logger.error("Błąd oznaczania zadania jako wykonane: %s", e)
             return False
     
     def get_projects(self) -> List[Dict]:
@@ -137,77 +545,72 @@ class TickTickAPI:
             Lista projektów
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/project",
-                headers=self.headers,
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._request("GET", "/project").json()
         except requests.exceptions.RequestException as e:
-            print(f"Błąd pobierania projektów: {e}")
+            logger.error("Błąd pobierania projektów: %s", e)
             return []
     
-    def update_task_tags(self, task_id: str, project_id: str, new_tags: List[str], original_task: Dict = None) -> Optional[Dict]:
+    def send_task_update(self, task_id: str, data: Dict) -> Dict:
         """
-        Aktualizuje tagi zadania
+        Wysyła gotową treść aktualizacji zadania, zgłaszając błąd zamiast zwracać None
+        
+        Pozwala wywołującemu (np. kolejce zapisów w tle) odróżnić błędy
+        przejściowe, które warto ponowić, od odrzuconych zmian.
+        
+        Args:
+            task_id: ID zadania
+            data: Treść żądania (np. z build_tags_update_payload)
+            
+        Returns:
+            Zaktualizowane dane zadania
+            
+        Raises:
+            requests.exceptions.RequestException: Gdy żądanie się nie powiodło
+        """
+        return self._request("POST", "/task/{task_id}", {"task_id": task_id}, json=data).json()
+    
+    def update_task(self, task_id: str, project_id: str, changes: Dict,
+                    original_task: Dict = None) -> Optional[Dict]:
+        """
+        Aktualizuje wybrane pola zadania jednym żądaniem
+        
+        Pozostałe pola są przepisywane z oryginalnego zadania według
+        PRESERVED_TASK_FIELDS (patrz build_task_update_payload).
         
         Args:
             task_id: ID zadania
             project_id: ID projektu
-            new_tags: Lista nowych tagów (bez #)
+            changes: Zmieniane pola (np. {"tags": [...], "dueDate": ...})
             original_task: Oryginalne dane zadania (aby zachować inne pola)
-            
+        
         Returns:
             Zaktualizowane dane zadania jeśli sukces, None w przeciwnym razie
         """
         try:
-            # Dane do aktualizacji - zachowaj ważne pola z oryginalnego zadania
-            data = {
-                "id": task_id,
-                "projectId": project_id,
-                "tags": new_tags
-            }
-            
-            # Jeśli mamy oryginalne zadanie, zachowaj ważne pola
-            if original_task:
-                # Zachowaj datę bez zmiany czasu
-                if "startDate" in original_task:
-                    data["startDate"] = original_task["startDate"]
-                if "dueDate" in original_task:
-                    data["dueDate"] = original_task["dueDate"]
-                # Zachowaj flagę "isAllDay" jeśli istnieje
-                if "isAllDay" in original_task:
-                    data["isAllDay"] = original_task["isAllDay"]
-                # Zachowaj tytuł i inne podstawowe pola
-                if "title" in original_task:
-                    data["title"] = original_task["title"]
-                if "content" in original_task:
-                    data["content"] = original_task["content"]
-            
-            print(f"DEBUG: Aktualizacja tagów zadania {task_id}")
-            print(f"DEBUG: Nowe tagi: {new_tags}")
-            print(f"DEBUG: isAllDay: {data.get('isAllDay', 'brak')}")
-            print(f"DEBUG: URL: {self.base_url}/task/{task_id}")
-            
-            response = requests.post(
-                f"{self.base_url}/task/{task_id}",
-                headers=self.headers,
-                json=data,
-                timeout=10
-            )
-            
-            print(f"DEBUG: Status odpowiedzi: {response.status_code}")
-            print(f"DEBUG: Treść odpowiedzi: {response.text[:200]}")
-            
-            response.raise_for_status()
-            return response.json()  # Zwracamy zaktualizowane dane zadania
+            data = build_task_update_payload(task_id, project_id, changes, original_task)
+            return self.send_task_update(task_id, data)
         except requests.exceptions.RequestException as e:
-            print(f"Błąd aktualizacji tagów zadania: {e}")
+            logger.error("Błąd aktualizacji zadania %s: %s", task_id, e)
             if hasattr(e, 'response') and e.response is not None:
-                print(f"DEBUG: Treść błędu: {e.response.text}")
+                logger.debug("Treść błędu: %s", e.response.text)
             return None
     
+    def update_task_tags(self, task_id: str, project_id: str, new_tags: List[str], original_task: Dict = None) -> Optional[Dict]:
+        """
+        Aktualizuje tagi zadania
+        
+        Args:
+            task_id: ID zadania
+            project_id: ID projektu
+            new_tags: Lista nowych tagów (bez #)
+            original_task: Oryginalne dane zadania (aby zachować inne pola)
+            
+        Returns:
+            Zaktualizowane dane zadania jeśli sukces, None w przeciwnym razie
+        """
+        logger.debug("Aktualizacja tagów zadania %s: %s", task_id, new_tags)
+        return self.update_task(task_id, project_id, {"tags": new_tags}, original_task)
+    
     def update_task_date(self, task_id: str, project_id: str, new_date: str, original_task: Dict = None) -> Optional[Dict]:
         """
         Aktualizuje datę zadania (startDate i dueDate)
@@ -221,64 +624,102 @@ class TickTickAPI:
         Returns:
             Zaktualizowane dane zadania jeśli sukces, None w przeciwnym razie
         """
-        try:
-            # Dane do aktualizacji - zachowaj wszystkie ważne pola
-            data = {
-                "id": task_id,
-                "projectId": project_id,
-                "startDate": new_date,
-                "dueDate": new_date
-            }
-            
-            # Jeśli mamy oryginalne zadanie, zachowaj wszystkie pozostałe pola
-            if original_task:
-                # Zachowaj podstawowe pola
-                if "title" in original_task:
-                    data["title"] = original_task["title"]
-                if "content" in original_task:
-                    data["content"] = original_task["content"]
-                if "desc" in original_task:
-                    data["desc"] = original_task["desc"]
-                
-                # Zachowaj ustawienia czasu
-                if "timeZone" in original_task:
-                    data["timeZone"] = original_task["timeZone"]
-                if "isAllDay" in original_task:
-                    data["isAllDay"] = original_task["isAllDay"]
-                
-                # Zachowaj priorytet i status
-                if "priority" in original_task:
-                    data["priority"] = original_task["priority"]
-                if "status" in original_task:
-                    data["status"] = original_task["status"]
-                
-                # Zachowaj tagi
-                if "tags" in original_task:
-                    data["tags"] = original_task["tags"]
-                
-                # Zachowaj przypomnienia
-                if "reminders" in original_task:
-                    data["reminders"] = original_task["reminders"]
-            
-            print(f"DEBUG: Aktualizacja daty zadania {task_id}")
-            print(f"DEBUG: Nowa data: {new_date}")
-            
-            response = requests.post(
-                f"{self.base_url}/task/{task_id}",
-                headers=self.headers,
-                json=data,
-                timeout=10
-            )
-            
-            print(f"DEBUG: Status odpowiedzi: {response.status_code}")
-            
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Błąd aktualizacji daty zadania: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"DEBUG: Treść błędu: {e.response.text}")
-            return None
+        logger.debug("Aktualizacja daty zadania %s: %s", task_id, new_date)
+        return self.update_task(
+            task_id,
+            project_id,
+            {"startDate": new_date, "dueDate": new_date},
+            original_task
+        )
+
+
+# Pola zadania przepisywane z oryginału przy każdej aktualizacji POST /task/{id}
+# (API nadpisuje całe zadanie, więc pominięte pole zostałoby wyczyszczone)
+PRESERVED_TASK_FIELDS = (
+    "title",
+    "content",
+    "desc",
+    "startDate",
+    "dueDate",
+    "timeZone",
+    "isAllDay",
+    "priority",
+    "status",
+    "tags",
+    "reminders",
+    "items"
+)
+
+
+def build_task_update_payload(task_id: str, project_id: str, changes: Dict,
+                              original_task: Dict = None) -> Dict:
+    """
+    Buduje treść żądania aktualizacji zadania według wspólnej polityki zachowywania pól
+    
+    Args:
+        task_id: ID zadania
+        project_id: ID projektu
+        changes: Zmieniane pola (np. {"tags": [...]} lub {"dueDate": ...})
+        original_task: Oryginalne dane zadania (aby zachować pola z PRESERVED_TASK_FIELDS)
+    
+    Returns:
+        Słownik gotowy do wysłania jako JSON
+    """
+    data = {
+        "id": task_id,
+        "projectId": project_id
+    }
+    
+    # Zachowaj ważne pola z oryginalnego zadania
+    if original_task:
+        # Task rozpakowuje pola dodatkowe przy każdym odczycie - jedna konwersja na całą pętlę
+        if isinstance(original_task, Task):
+            original_task = original_task.to_dict()
+        for field_name in PRESERVED_TASK_FIELDS:
+            if field_name in original_task:
+                data[field_name] = original_task[field_name]
+    
+    data.update(changes)
+    return data
+
+
+def build_tags_update_payload(task_id: str, project_id: str, new_tags: List[str],
+                              original_task: Dict = None) -> Dict:
+    """
+    Buduje treść żądania aktualizacji tagów zadania
+    
+    Args:
+        task_id: ID zadania
+        project_id: ID projektu
+        new_tags: Lista nowych tagów (bez #)
+        original_task: Oryginalne dane zadania (aby zachować inne pola)
+        
+    Returns:
+        Słownik gotowy do wysłania jako JSON
+    """
+    return build_task_update_payload(task_id, project_id, {"tags": new_tags}, original_task)
+
+
+def build_date_update_payload(task_id: str, project_id: str, new_date: str,
+                              original_task: Dict = None) -> Dict:
+    """
+    Buduje treść żądania aktualizacji daty zadania (startDate i dueDate)
+    
+    Args:
+        task_id: ID zadania
+        project_id: ID projektu
+        new_date: Nowa data w formacie ISO (YYYY-MM-DDTHH:MM:SS.000+0000)
+        original_task: Oryginalne dane zadania (aby zachować inne pola)
+        
+    Returns:
+        Słownik gotowy do wysłania jako JSON
+    """
+    return build_task_update_payload(
+        task_id,
+        project_id,
+        {"startDate": new_date, "dueDate": new_date},
+        original_task
+    )
 
 
 def parse_task_tags(task: Dict) -> List[str]:
@@ -321,6 +762,20 @@ def is_task_completed(task: Dict) -> bool:
     return task.get("status", 0) == 2  # Status 2 = completed
 
 
+def get_quadrant_move_tags(current_tags: List[str], target_quadrant: str) -> List[str]:
+    """
+    Wylicza tagi zadania po przeniesieniu do innej ćwiartki
+    
+    Args:
+        current_tags: Aktualne tagi zadania (bez #)
+        target_quadrant: Docelowa ćwiartka (Q1, Q2, Q3, Q4)
+        
+    Returns:
+        Nowa lista tagów
+    """
+    return get_quadrant_classifier().move_tags(current_tags, target_quadrant)
+
+
 def move_task_to_quadrant(api: 'TickTickAPI', task: Dict, target_quadrant: str) -> Optional[Dict]:
     """
     Przenosi zadanie do innej ćwiartki poprzez aktualizację tagów
@@ -333,44 +788,56 @@ def move_task_to_quadrant(api: 'TickTickAPI', task: Dict, target_quadrant: str)
     Returns:
         Zaktualizowane dane zadania jeśli sukces, None w przeciwnym razie
     """
-    # Mapowanie ćwiartek na tagi
-    quadrant_tags = {
-        "Q1": "fast",
-        "Q2": "important",
-        "Q3": "think",
-        "Q4": None  # Brak tagu specjalnego
-    }
-    
     task_id = task.get("id")
     project_id = task.get("projectId")
     task_title = task.get("title", "")
     
-    print(f"\n=== PRZENOSZENIE ZADANIA ===")
-    print(f"Zadanie: {task_title}")
-    print(f"Task ID: {task_id}")
-    print(f"Project ID: {project_id}")
-    print(f"Docelowa ćwiartka: {target_quadrant}")
+    logger.debug("Przenoszenie zadania %r (%s, projekt %s) do %s", task_title, task_id, project_id, target_quadrant)
     
     if not task_id or not project_id:
-        print("BŁĄD: Brak task_id lub project_id")
+        logger.error("Brak task_id lub project_id zadania %r", task_title)
         return None
     
     # Pobierz aktualne tagi (bez #)
     current_tags = task.get("tags", [])
-    print(f"Aktualne tagi: {current_tags}")
-    
-    # Usuń stare tagi ćwiartek
-    special_tags = {"fast", "important", "think"}
-    new_tags = [tag for tag in current_tags if tag not in special_tags]
     
-    # Dodaj nowy tag (jeśli nie jest Q4)
-    target_tag = quadrant_tags.get(target_quadrant)
-    if target_tag:
-        new_tags.append(target_tag)
+    new_tags = get_quadrant_move_tags(current_tags, target_quadrant)
     
-    print(f"Nowe tagi: {new_tags}")
+    logger.debug("Tagi: %s -> %s", current_tags, new_tags)
     
     # Aktualizuj w TickTick - przekaż oryginalne zadanie aby zachować wszystkie pola
     updated_task = api.update_task_tags(task_id, project_id, new_tags, original_task=task)
-    print(f"Wynik aktualizacji: {updated_task is not None}")
     return updated_task
+
+
+def move_tasks_to_quadrant(api: 'TickTickAPI', tasks: List[Dict], target_quadrant: str,
+                           max_workers: int = TICKTICK_WRITE_WORKERS) -> BulkMoveResult:
+    """
+    Przenosi wiele zadań do jednej ćwiartki, wysyłając aktualizacje równolegle
+    
+    Liczba jednoczesnych żądań jest ograniczona przez max_workers, a błąd
+    jednego zadania nie przerywa pozostałych.
+    
+    Args:
+        api: Instancja TickTickAPI
+        tasks: Lista zadań do przeniesienia
+        target_quadrant: Docelowa ćwiartka (Q1, Q2, Q3, Q4)
+        max_workers: Maksymalna liczba równoległych żądań
+        
+    Returns:
+        BulkMoveResult z listą przeniesionych zadań i listą błędów (w kolejności zadań)
+    """
+    def _move(task: Dict) -> Tuple[Optional[Dict], str]:
+        try:
+            updated_task = move_task_to_quadrant(api, task, target_quadrant)
+        except Exception as e:
+            return None, str(e)
+        return updated_task, "" if updated_task else "Błąd aktualizacji tagów"
+    
+    result = BulkMoveResult(target_quadrant, [], [])
+    for task, (updated_task, error) in zip(tasks, api._map_concurrent(_move, tasks, max_workers)):
+        if updated_task:
+            result.moved.append(updated_task)
+        else:
+            result.failed.append((task, error))
+    return result
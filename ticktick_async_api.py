@@ -0,0 +1,337 @@
+"""
+Asynchroniczny klient TickTick Open API (asyncio + HTTP/2)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import List, Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+from config import (
+    TICKTICK_API_BASE_URL,
+    TICKTICK_ASYNC_MAX_CONCURRENCY,
+    TICKTICK_ASYNC_MAX_CONNECTIONS
+)
+from diagnostics import RequestRecord, get_request_metrics
+from rate_limiter import RequestScheduler, get_request_scheduler
+from ticktick_api import TaskFetchResult, auth_headers, build_task_update_payload
+from token_manager import TokenManager
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTickTickAPI:
+    """
+    Asynchroniczny odpowiednik TickTickAPI
+    
+    Wszystkie żądania przechodzą przez jednego klienta httpx z HTTP/2, więc setki
+    pobrań projektów i zapisów zadań są multipleksowane na kilku połączeniach.
+    Liczba jednoczesnych żądań jest ograniczona semaforem.
+    
+    Przykład:
+        async with AsyncTickTickAPI(token) as api:
+            tasks = await api.get_tasks()
+    """
+    
+    def __init__(self, access_token: Optional[str] = None,
+                 max_concurrency: int = TICKTICK_ASYNC_MAX_CONCURRENCY,
+                 base_url: Optional[str] = None,
+                 http2: bool = True,
+                 transport: Optional[httpx.AsyncBaseTransport] = None,
+                 scheduler: Optional[RequestScheduler] = None,
+                 token_manager: Optional[TokenManager] = None):
+        """
+        Inicjalizacja klienta API
+        
+        Args:
+            access_token: Token dostępu (jeśli None, pobiera z .env)
+            max_concurrency: Maksymalna liczba jednoczesnych żądań
+            base_url: Adres API (jeśli None, TICKTICK_API_BASE_URL) - np. lokalny serwer testowy
+            http2: Czy negocjować HTTP/2 (wymaga pakietu h2)
+            transport: Własny transport httpx (np. httpx.MockTransport w testach)
+            scheduler: Harmonogram żądań (jeśli None, używa współdzielonego w procesie)
+            token_manager: Menedżer tokenu odświeżający go w tle (jeśli None,
+                token z access_token jest używany bez odświeżania)
+        """
+        self.tokens = token_manager or TokenManager(access_token or os.getenv("TICKTICK_ACCESS_TOKEN"))
+        self.base_url = base_url or TICKTICK_API_BASE_URL
+        self.max_concurrency = max_concurrency
+        self.scheduler = scheduler or get_request_scheduler()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            transport=transport,
+            timeout=10,
+            limits=httpx.Limits(
+                max_connections=TICKTICK_ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=TICKTICK_ASYNC_MAX_CONNECTIONS
+            )
+        )
+    
+    @property
+    def access_token(self) -> Optional[str]:
+        """Aktualny token dostępu (po odświeżeniu - nowy)"""
+        return self.tokens.access_token
+    
+    async def __aenter__(self) -> "AsyncTickTickAPI":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Zamyka połączenia klienta HTTP"""
+        await self._client.aclose()
+    
+    def is_configured(self) -> bool:
+        """Sprawdza czy API jest poprawnie skonfigurowane"""
+        return bool(self.access_token and self.access_token != "your_access_token_here")
+    
+    async def _request(self, method: str, endpoint: str, path_params: Optional[Dict[str, str]] = None,
+                       idempotent: Optional[bool] = None, **kwargs) -> httpx.Response:
+        """
+        Wysyła żądanie z zachowaniem limitu jednoczesnych połączeń i mierzy je
+        (tak jak TickTickAPI._request, przez ten sam harmonogram żądań). Po
+        odpowiedzi 401 token jest odświeżany (TokenManager) i żądanie ponawiane raz.
+        
+        Args:
+            method: Metoda HTTP (GET, POST)
+            endpoint: Szablon ścieżki, np. "/project/{project_id}/data"
+            path_params: Wartości wstawiane do szablonu ścieżki
+            idempotent: Czy żądanie można ponowić po 5xx / błędzie sieci (None = tylko GET)
+            **kwargs: Dodatkowe argumenty httpx (np. json)
+        
+        Raises:
+            httpx.HTTPError: W przypadku błędu sieci lub statusu HTTP
+        """
+        url = self.base_url + endpoint.format(**(path_params or {}))
+        if idempotent is None:
+            idempotent = method == "GET"
+        if self.tokens.expired:
+            await asyncio.get_running_loop().run_in_executor(None, self.tokens.refresh_if_expired)
+        response = None
+        retries = 0
+        async with self._semaphore:
+            # Czas mierzony od zajęcia miejsca w semaforze (bez oczekiwania w kolejce)
+            start = time.perf_counter()
+            try:
+                for attempt in range(2):
+                    token = self.tokens.access_token
+                    response, sent_retries = await self.scheduler.call_async(
+                        lambda: self._client.request(method, url, headers=auth_headers(token), **kwargs),
+                        idempotent,
+                        (httpx.TransportError,)
+                    )
+                    retries += sent_retries
+                    if (response.status_code != 401 or attempt
+                            or not await asyncio.get_running_loop().run_in_executor(
+                                None, self.tokens.handle_unauthorized, token)):
+                        break
+                    retries += 1
+            finally:
+                record = RequestRecord(
+                    method,
+                    endpoint,
+                    response.status_code if response is not None else None,
+                    time.perf_counter() - start,
+                    len(response.content) if response is not None else 0,
+                    retries
+                )
+                get_request_metrics().record(record)
+                logger.log(
+                    logging.DEBUG if record.ok else logging.WARNING,
+                    "%s %s -> %s (%.1f ms, %d B, ponowienia: %d)",
+                    method, endpoint, record.status or "brak odpowiedzi", record.latency_s * 1000,
+                    record.size_bytes, record.retries
+                )
+        response.raise_for_status()
+        return response
+    
+    async def get_tasks(self) -> List[Dict]:
+        """
+        Pobiera wszystkie zadania z TickTick (ze wszystkich projektów)
+        
+        Projekty są pobierane współbieżnie, a wynik zachowuje kolejność projektów.
+        Projekty, których nie udało się pobrać, są pomijane.
+        
+        Returns:
+            Lista zadań
+        """
+        return (await self.get_tasks_with_failures()).tasks
+    
+    async def get_tasks_with_failures(self) -> TaskFetchResult:
+        """
+        Pobiera wszystkie zadania i listę projektów, których nie udało się pobrać
+        
+        Returns:
+            TaskFetchResult z zadaniami i listą projektów, których nie udało się pobrać
+        """
+        projects = await self.get_projects()
+        
+        if not projects:
+            logger.info("Brak projektów do pobrania")
+            return TaskFetchResult([], [])
+        
+        projects = [project for project in projects if project.get("id")]
+        results = await asyncio.gather(
+            *(self._get_project_tasks_isolated(project) for project in projects)
+        )
+        
+        all_tasks = []
+        failed = []
+        for project, project_tasks in zip(projects, results):
+            if project_tasks is None:
+                failed.append(project["id"])
+            else:
+                all_tasks.extend(project_tasks)
+        return TaskFetchResult(all_tasks, failed)
+    
+    async def _get_project_tasks_isolated(self, project: Dict) -> Optional[List[Dict]]:
+        """Pobiera zadania projektu tak, aby błąd jednego projektu nie przerywał pozostałych (None = błąd)"""
+        project_id = project.get("id")
+        try:
+            return await self.fetch_project_tasks(project_id)
+        except Exception as e:
+            logger.error("Błąd pobierania zadań z projektu %s: %s", project.get("name", project_id), e)
+            return None
+    
+    async def get_project_tasks(self, project_id: str) -> List[Dict]:
+        """
+        Pobiera zadania z konkretnego projektu
+        
+        Args:
+            project_id: ID projektu w TickTick
+        
+        Returns:
+            Lista zadań z danego projektu
+        """
+        try:
+            return await self.fetch_project_tasks(project_id)
+        except httpx.HTTPError as e:
+            logger.error("Błąd pobierania zadań projektu: %s", e)
+            return []
+    
+    async def fetch_project_tasks(self, project_id: str) -> List[Dict]:
+        """
+        Pobiera zadania z konkretnego projektu, zgłaszając błąd zamiast zwracać pustą listę
+        
+        Args:
+            project_id: ID projektu w TickTick
+        
+        Returns:
+            Lista zadań z danego projektu
+        
+        Raises:
+            httpx.HTTPError: Gdy oba endpointy zwróciły błąd (błąd /data, jak w kliencie synchronicznym)
+        """
+        try:
+            response = await self._request("GET", "/project/{project_id}/data", {"project_id": project_id})
+            return response.json().get("tasks", [])
+        except httpx.HTTPError as first_error:
+            # Spróbuj alternatywnego endpointa
+            try:
+                response = await self._request("GET", "/project/{project_id}", {"project_id": project_id})
+                return response.json().get("tasks", [])
+            except httpx.HTTPError as second_error:
+                raise first_error from second_error
+    
+    async def get_projects(self) -> List[Dict]:
+        """
+        Pobiera listę wszystkich projektów użytkownika
+        
+        Returns:
+            Lista projektów
+        """
+        try:
+            response = await self._request("GET", "/project")
+            return response.json()
+        except httpx.HTTPError as e:
+            logger.error("Błąd pobierania projektów: %s", e)
+            return []
+    
+    async def complete_task(self, task_id: str, project_id: str) -> bool:
+        """
+        Oznacza zadanie jako wykonane
+        
+        Args:
+            task_id: ID zadania
+            project_id: ID projektu
+        
+        Returns:
+            True jeśli sukces, False w przeciwnym razie
+        """
+        try:
+            await self._request(
+                "POST",
+                "/project/{project_id}/task/{task_id}/complete",
+                {"project_id": project_id, "task_id": task_id}
+            )
+            return True
+        except httpx.HTTPError as e:
+            logger.error("Błąd oznaczania zadania jako wykonane: %s", e)
+            return False
+    
+    async def update_task(self, task_id: str, project_id: str, changes: Dict,
+                          original_task: Dict = None) -> Optional[Dict]:
+        """
+        Aktualizuje wybrane pola zadania jednym żądaniem (patrz TickTickAPI.update_task)
+        
+        Args:
+            task_id: ID zadania
+            project_id: ID projektu
+            changes: Zmieniane pola (np. {"tags": [...], "dueDate": ...})
+            original_task: Oryginalne dane zadania (aby zachować inne pola)
+        
+        Returns:
+            Zaktualizowane dane zadania jeśli sukces, None w przeciwnym razie
+        """
+        data = build_task_update_payload(task_id, project_id, changes, original_task)
+        try:
+            response = await self._request("POST", "/task/{task_id}", {"task_id": task_id}, json=data)
+            return response.json()
+        except httpx.HTTPError as e:
+            logger.error("Błąd aktualizacji zadania %s: %s", task_id, e)
+            return None
+    
+    async def update_task_tags(self, task_id: str, project_id: str, new_tags: List[str],
+                               original_task: Dict = None) -> Optional[Dict]:
+        """
+        Aktualizuje tagi zadania
+        
+        Args:
+            task_id: ID zadania
+            project_id: ID projektu
+            new_tags: Lista nowych tagów (bez #)
+            original_task: Oryginalne dane zadania (aby zachować inne pola)
+        
+        Returns:
+            Zaktualizowane dane zadania jeśli sukces, None w przeciwnym razie
+        """
+        return await self.update_task(task_id, project_id, {"tags": new_tags}, original_task)
+    
+    async def update_task_date(self, task_id: str, project_id: str, new_date: str,
+                               original_task: Dict = None) -> Optional[Dict]:
+        """
+        Aktualizuje datę zadania (startDate i dueDate)
+        
+        Args:
+            task_id: ID zadania
+            project_id: ID projektu
+            new_date: Nowa data w formacie ISO (YYYY-MM-DDTHH:MM:SS.000+0000)
+            original_task: Oryginalne dane zadania (aby zachować inne pola)
+        
+        Returns:
+            Zaktualizowane dane zadania jeśli sukces, None w przeciwnym razie
+        """
+        return await self.update_task(
+            task_id,
+            project_id,
+            {"startDate": new_date, "dueDate": new_date},
+            original_task
+        )
@@ -0,0 +1,181 @@
+"""
+Zarządzanie tokenem dostępu - odświeżanie w tle przed wygaśnięciem i po odpowiedzi 401
+"""
+
+import logging
+import threading
+import time
+import weakref
+from typing import Callable, Dict, Optional
+
+from config import TICKTICK_TOKEN_REFRESH_MARGIN, TICKTICK_TOKEN_REFRESH_RETRY
+
+logger = logging.getLogger(__name__)
+
+
+class TokenManager:
+    """
+    Przechowuje aktualny token dostępu i odświeża go, zanim wygaśnie
+    
+    Czas ważności (expires_in z auth.TickTickAuth.exchange_code_for_token) jest
+    zapamiętywany, a wątek w tle (threading.Timer) odświeża token refresh_margin
+    sekund przed wygaśnięciem. Wywołujący odczytują access_token bez czekania -
+    w chwili wysłania żądania token jest już ważny. Jeśli mimo to serwer
+    odpowie 401, klient API wywołuje handle_unauthorized i ponawia żądanie raz.
+    
+    Po nieudanym odświeżeniu kolejna próba (z wątku w tle, przed żądaniem lub po
+    401) odbywa się dopiero po retry_delay sekundach. Wątek w tle trzyma menedżer
+    słabą referencją - gdy sesja zniknie bez wywołania close(), odświeżanie
+    zostaje anulowane razem z menedżerem.
+    
+    Bez refresh_token albo funkcji odświeżającej (np. token wklejony ręcznie)
+    menedżer tylko przechowuje token.
+    """
+    
+    def __init__(self, access_token: Optional[str], refresh_token: Optional[str] = None,
+                 expires_in: Optional[float] = None,
+                 refresh: Optional[Callable[[str], Dict]] = None,
+                 refresh_margin: float = TICKTICK_TOKEN_REFRESH_MARGIN,
+                 retry_delay: float = TICKTICK_TOKEN_REFRESH_RETRY):
+        """
+        Inicjalizacja menedżera tokenu
+        
+        Args:
+            access_token: Token dostępu
+            refresh_token: Refresh token (jeśli None, token nie jest odświeżany)
+            expires_in: Czas ważności tokenu w sekundach (None = nieznany)
+            refresh: Funkcja wymieniająca refresh token na nowe tokeny
+                (np. TickTickAuth.refresh_access_token)
+            refresh_margin: Ile sekund przed wygaśnięciem odświeżyć token
+            retry_delay: Ile sekund odczekać po nieudanym odświeżeniu
+        """
+        self.access_token = access_token
+        # Pierwszy token identyfikuje konto (klucz cache i snapshotu) także po odświeżeniu
+        self.account_token = access_token
+        self.refresh_token = refresh_token
+        self.refresh_margin = refresh_margin
+        self.retry_delay = retry_delay
+        self.expires_at: Optional[float] = None
+        self._refresh = refresh
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._timer_finalizer: Optional[weakref.finalize] = None
+        self._retry_at = 0.0  # przed tą chwilą nie ponawiać nieudanego odświeżenia
+        self._set_expiry(expires_in)
+    
+    @property
+    def can_refresh(self) -> bool:
+        """Czy token można odświeżyć (jest refresh token i funkcja odświeżająca)"""
+        return bool(self.refresh_token and self._refresh)
+    
+    @property
+    def expired(self) -> bool:
+        """Czy znany czas ważności tokenu już minął"""
+        return self.expires_at is not None and time.time() >= self.expires_at
+    
+    def refresh(self, stale_token: Optional[str] = None) -> bool:
+        """
+        Odświeża token (wywoływane przez wątek w tle lub po odpowiedzi 401)
+        
+        Args:
+            stale_token: Token, który okazał się nieważny - jeśli w międzyczasie
+                został już podmieniony (np. przez inny wątek), nie jest odświeżany ponownie
+        
+        Returns:
+            True jeśli aktualny token jest inny niż stale_token (warto ponowić żądanie)
+        """
+        with self._lock:
+            if stale_token is not None and self.access_token != stale_token:
+                return True
+            return self._refresh_locked()
+    
+    def refresh_if_expired(self) -> None:
+        """Odświeża token przed wysłaniem żądania, jeśli jego czas ważności minął"""
+        if not self.expired:
+            return
+        with self._lock:
+            # Wątki czekające na blokadę nie odświeżają tokenu drugi raz
+            if self.expired:
+                self._refresh_locked()
+    
+    def handle_unauthorized(self, used_token: Optional[str]) -> bool:
+        """
+        Reaguje na odpowiedź 401 - odświeża token, jeśli to możliwe
+        
+        Args:
+            used_token: Token wysłany w odrzuconym żądaniu
+        
+        Returns:
+            True jeśli żądanie warto ponowić z nowym tokenem
+        """
+        return self.refresh(stale_token=used_token)
+    
+    def close(self) -> None:
+        """Zatrzymuje odświeżanie w tle (np. po wylogowaniu)"""
+        with self._lock:
+            self._cancel_timer()
+            self._refresh = None
+    
+    def _refresh_locked(self) -> bool:
+        # Wywoływane pod blokadą - wymienia refresh token na nowe tokeny
+        if not self.can_refresh or time.time() < self._retry_at:
+            return False
+        try:
+            token_data = self._refresh(self.refresh_token)
+        except Exception as e:
+            logger.error("Błąd odświeżania tokenu dostępu: %s", e)
+            return self._refresh_failed()
+        access_token = token_data.get("access_token")
+        if not access_token:
+            logger.error("Odpowiedź odświeżania tokenu nie zawiera access_token")
+            return self._refresh_failed()
+        self.access_token = access_token
+        self.refresh_token = token_data.get("refresh_token") or self.refresh_token
+        self._retry_at = 0.0
+        self._set_expiry(token_data.get("expires_in"))
+        logger.info("Odświeżono token dostępu")
+        return True
+    
+    def _refresh_failed(self) -> bool:
+        # Kolejna próba dopiero po retry_delay - wątek w tle ponawia ją sam
+        self._retry_at = time.time() + self.retry_delay
+        self._schedule(self.retry_delay)
+        return False
+    
+    def _set_expiry(self, expires_in: Optional[float]) -> None:
+        # Wywoływane pod blokadą (albo w __init__) - planuje kolejne odświeżenie w tle
+        self._cancel_timer()
+        if not expires_in:
+            self.expires_at = None
+            return
+        expires_in = float(expires_in)
+        self.expires_at = time.time() + expires_in
+        # Przy krótkim czasie ważności odśwież w połowie, a nie tuż przed końcem
+        self._schedule(max(expires_in - self.refresh_margin, expires_in / 2))
+    
+    def _schedule(self, delay: float) -> None:
+        # Planuje odświeżenie w tle; wątek nie przedłuża życia menedżera (porzucona sesja)
+        self._cancel_timer()
+        if not self.can_refresh:
+            return
+        manager_ref = weakref.ref(self)
+        
+        def refresh_in_background():
+            manager = manager_ref()
+            if manager is not None:
+                manager.refresh()
+        
+        timer = threading.Timer(delay, refresh_in_background)
+        timer.daemon = True
+        timer.name = "ticktick-token-refresh"
+        timer.start()
+        self._timer = timer
+        self._timer_finalizer = weakref.finalize(self, timer.cancel)
+    
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._timer_finalizer is not None:
+            self._timer_finalizer.detach()
+            self._timer_finalizer = None
@@ -0,0 +1,297 @@
+"""
+Kolejka zapisów w tle - zmiany zadań pokazywane są od razu, a wysyłane do TickTick asynchronicznie
+"""
+
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import requests
+
+from config import (
+    TICKTICK_WRITE_COALESCE_WINDOW,
+    TICKTICK_WRITE_MAX_RETRIES,
+    TICKTICK_WRITE_RETRY_BACKOFF,
+    TICKTICK_WRITE_WORKER_IDLE,
+    TICKTICK_WRITE_WORKERS
+)
+from task_model import DERIVED_FIELDS, Task
+from ticktick_api import TickTickAPI, build_task_update_payload, get_quadrant_move_tags
+
+logger = logging.getLogger(__name__)
+
+_write_ids = itertools.count(1)
+
+
+@dataclass
+class TaskWrite:
+    """Zmiana zadania oczekująca na wysłanie (kilka zmian tego samego zadania może zostać scalonych)"""
+    description: str        # opis do komunikatów (np. "Przeniesienie do Q1")
+    task_id: str
+    project_id: str
+    changes: Dict           # zmieniane pola (np. {"tags": [...]})
+    original_task: Dict     # stan zadania sprzed zmiany (do wycofania)
+    attempts: int = 0
+    write_id: int = field(default_factory=lambda: next(_write_ids))
+    created_at: float = field(default_factory=time.monotonic)
+    
+    def payload(self) -> Dict:
+        """Zwraca treść żądania POST /task/{id} (wspólna polityka zachowywania pól)"""
+        return build_task_update_payload(self.task_id, self.project_id, self.changes, self.original_task)
+    
+    def optimistic_task(self) -> Dict:
+        """Zwraca zadanie w stanie po zmianie (przed odpowiedzią serwera)"""
+        return {**self.original_task, **self.changes}
+    
+    def merge(self, later: "TaskWrite") -> None:
+        """
+        Dołącza późniejszą zmianę tego samego zadania
+        
+        Stan do wycofania pozostaje stanem sprzed pierwszej zmiany.
+        
+        Args:
+            later: Zmiana dodana później
+        """
+        self.changes.update(later.changes)
+        self.description = f"{self.description}, {later.description}"
+
+
+@dataclass
+class WriteOutcome:
+    """Wynik wysłania zmiany (przekazywany z wątku roboczego do aplikacji)"""
+    write: TaskWrite
+    server_task: Optional[Dict]  # odpowiedź API (None = zmiana odrzucona)
+    error: str = ""
+    
+    @property
+    def ok(self) -> bool:
+        return self.server_task is not None
+
+
+def tags_write(task: Dict, target_quadrant: str) -> Optional[TaskWrite]:
+    """
+    Tworzy zmianę przenoszącą zadanie do innej ćwiartki
+    
+    Args:
+        task: Słownik z danymi zadania
+        target_quadrant: Docelowa ćwiartka (Q1, Q2, Q3, Q4)
+    
+    Returns:
+        TaskWrite do wysłania przez WriteBehindQueue lub None, gdy zadanie nie ma ID lub projektu
+    """
+    new_tags = get_quadrant_move_tags(task.get("tags", []), target_quadrant)
+    return _task_write(f"Przeniesienie do {target_quadrant}", task, {"tags": new_tags})
+
+
+def date_write(task: Dict, new_date: str) -> Optional[TaskWrite]:
+    """
+    Tworzy zmianę daty zadania
+    
+    Args:
+        task: Słownik z danymi zadania
+        new_date: Nowa data w formacie ISO (YYYY-MM-DDTHH:MM:SS.000+0000)
+    
+    Returns:
+        TaskWrite do wysłania przez WriteBehindQueue lub None, gdy zadanie nie ma ID lub projektu
+    """
+    return _task_write("Zmiana daty", task, {"startDate": new_date, "dueDate": new_date})
+
+
+def _task_write(description: str, task: Dict, changes: Dict) -> Optional[TaskWrite]:
+    # POST /task/{id} wymaga ID zadania i projektu - bez nich zmiany nie da się wysłać
+    task_id = task.get("id")
+    project_id = task.get("projectId")
+    if not task_id or not project_id:
+        logger.error("Brak task_id lub project_id zadania %r", task.get("title", "Bez tytułu"))
+        return None
+    # dict(task) na Task rozpakowywałby pola dodatkowe osobno dla każdego klucza
+    original_task = task.to_dict() if isinstance(task, Task) else dict(task)
+    for key in DERIVED_FIELDS:
+        # Wyliczony termin byłby nieaktualny po zmianie daty (optimistic_task)
+        original_task.pop(key, None)
+    return TaskWrite(description, task_id, project_id, changes, original_task)
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Sprawdza czy błąd zapisu jest przejściowy (warto ponowić żądanie)
+    
+    Args:
+        error: Wyjątek zgłoszony przy wysyłaniu
+    
+    Returns:
+        True dla błędów sieci, przekroczenia czasu i 5xx (429 ponawia już harmonogram żądań
+        rate_limiter.RequestScheduler - kolejka nie mnoży jego ponowień)
+    """
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code >= 500
+
+
+class WriteBehindQueue:
+    """
+    Kolejka zmian zadań wysyłanych do TickTick przez wątek w tle
+    
+    Zmiany różnych zadań wysyłane są równolegle (najwyżej max_workers żądań
+    naraz, np. przy przenoszeniu wielu zadań), a kolejna zmiana tego samego
+    zadania czeka na zakończenie poprzedniej, więc dociera do serwera we
+    właściwej kolejności. Zmiana czeka w kolejce co najmniej coalesce_window
+    sekund - kolejne zmiany tego samego zadania dodane w tym czasie (albo zanim
+    zwolni się miejsce na wysłanie) są z nią scalane i wysyłane jednym
+    żądaniem. Błędy przejściowe są ponawiane z rosnącym opóźnieniem. Wątki
+    robocze nie dotykają stanu sesji Streamlit - wyniki odbierane są przez
+    drain_outcomes() przy kolejnym przebiegu skryptu.
+    """
+    
+    def __init__(self, api: TickTickAPI, max_retries: int = TICKTICK_WRITE_MAX_RETRIES,
+                 retry_backoff: float = TICKTICK_WRITE_RETRY_BACKOFF,
+                 coalesce_window: float = TICKTICK_WRITE_COALESCE_WINDOW,
+                 max_workers: int = TICKTICK_WRITE_WORKERS):
+        """
+        Inicjalizacja kolejki
+        
+        Args:
+            api: Klient API używany do wysyłania zmian
+            max_retries: Liczba ponowień błędu przejściowego
+            retry_backoff: Opóźnienie pierwszego ponowienia w sekundach (podwajane)
+            coalesce_window: Czas w sekundach, przez który zmiana czeka na scalenie
+                z kolejnymi zmianami tego samego zadania (0 = bez scalania)
+            max_workers: Maksymalna liczba zmian wysyłanych jednocześnie
+        """
+        self.api = api
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.coalesce_window = coalesce_window
+        self.max_workers = max_workers
+        self._slots = threading.Semaphore(max_workers)
+        self._queue: "queue.Queue[Optional[TaskWrite]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._outcomes: List[WriteOutcome] = []
+        self._pending: Dict[str, int] = {}  # {task_id: liczba niewysłanych zmian}
+        self._queued: Dict[str, TaskWrite] = {}  # zmiany czekające w kolejce (do scalenia)
+        self._thread: Optional[threading.Thread] = None
+    
+    def submit(self, write: TaskWrite) -> None:
+        """
+        Dodaje zmianę do kolejki (lub scala ją z czekającą zmianą tego samego zadania)
+        
+        Args:
+            write: Zmiana do wysłania
+        """
+        with self._lock:
+            queued = self._queued.get(write.task_id)
+            if queued is not None:
+                queued.merge(write)
+                return
+            self._queued[write.task_id] = write
+            self._pending[write.task_id] = self._pending.get(write.task_id, 0) + 1
+            # Pod blokadą - wątek kończący się po bezczynności nie przeoczy tej zmiany
+            self._queue.put(write)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ticktick-write-behind", daemon=True)
+                self._thread.start()
+    
+    def pending_count(self) -> int:
+        """Zwraca liczbę zmian, które nie zostały jeszcze wysłane"""
+        with self._lock:
+            return sum(self._pending.values())
+    
+    def has_pending(self, task_id: str) -> bool:
+        """Sprawdza czy zadanie ma niewysłane zmiany"""
+        with self._lock:
+            return task_id in self._pending
+    
+    def drain_outcomes(self) -> List[WriteOutcome]:
+        """
+        Odbiera wyniki wysłanych zmian (każdy wynik zwracany jest tylko raz)
+        
+        Returns:
+            Lista wyników w kolejności wysyłania
+        """
+        with self._lock:
+            outcomes, self._outcomes = self._outcomes, []
+        return outcomes
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Czeka, aż wszystkie zmiany zostaną wysłane
+        
+        Args:
+            timeout: Maksymalny czas oczekiwania w sekundach (None = bez limitu)
+        
+        Returns:
+            True jeśli kolejka jest pusta
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
+    
+    def close(self) -> None:
+        """Zatrzymuje wątek roboczy po wysłaniu zmian z kolejki"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+    
+    def _run(self) -> None:
+        # Wątek rozdzielający zmiany do puli wysyłającej (pula kończy się razem z nim,
+        # po wysłaniu zmian będących w toku)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ticktick-write") as pool:
+            in_flight: Dict[str, Future] = {}
+            while True:
+                try:
+                    write = self._queue.get(timeout=TICKTICK_WRITE_WORKER_IDLE)
+                except queue.Empty:
+                    with self._lock:
+                        if self._queue.empty() and not self._pending and self._thread is threading.current_thread():
+                            self._thread = None  # kolejny submit uruchomi nowy wątek
+                            return
+                    continue
+                if write is None:
+                    return
+                # Daj szansę na scalenie z kolejnymi zmianami tego zadania
+                delay = write.created_at + self.coalesce_window - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                # Poprzednia zmiana zadania musi dotrzeć do serwera pierwsza
+                previous = in_flight.pop(write.task_id, None)
+                if previous is not None:
+                    wait([previous])
+                self._slots.acquire()
+                with self._lock:
+                    if self._queued.get(write.task_id) is write:
+                        del self._queued[write.task_id]
+                in_flight = {task_id: future for task_id, future in in_flight.items() if not future.done()}
+                in_flight[write.task_id] = pool.submit(self._deliver, write)
+    
+    def _deliver(self, write: TaskWrite) -> None:
+        # Wysyła zmianę w wątku puli i zapisuje jej wynik
+        try:
+            outcome = self._send(write)
+        finally:
+            self._slots.release()
+        with self._idle:
+            self._outcomes.append(outcome)
+            remaining = self._pending.get(write.task_id, 1) - 1
+            if remaining:
+                self._pending[write.task_id] = remaining
+            else:
+                self._pending.pop(write.task_id, None)
+            self._idle.notify_all()
+    
+    def _send(self, write: TaskWrite) -> WriteOutcome:
+        while True:
+            write.attempts += 1
+            try:
+                return WriteOutcome(write, self.api.send_task_update(write.task_id, write.payload()))
+            except requests.exceptions.RequestException as e:
+                if write.attempts > self.max_retries or not is_retryable_error(e):
+                    logger.error("Błąd zapisu zadania %s (%s): %s", write.task_id, write.description, e)
+                    return WriteOutcome(write, None, str(e))
+                time.sleep(self.retry_backoff * 2 ** (write.attempts - 1))